@@ -0,0 +1,77 @@
+"""AdapterDataset decode throughput with 1/2/4/8 collate processes.
+
+The collate function decodes a little-endian binary packet with a
+pure-Python loop, standing in for a CPU-bound sensor feed decoder.
+Each configuration keeps its pool across iterations and warms it up first,
+so the timed pass over ``NUM_PACKETS`` packets excludes process start-up.
+
+Measured on a single-core sandbox: inline about 740 blocks/s; every
+process count landed between 0.8x and 1.3x of that, which is all one
+core allows. The worker-count comparison needs a multi-core machine.
+"""
+
+from __future__ import annotations
+
+import struct
+from datetime import datetime, timezone
+from itertools import islice
+from time import perf_counter
+
+import numpy as np
+
+from online_dev_environment.base import AdapterDataset, BaseTimeSeries
+
+CHANNELS = 4
+SAMPLES_PER_PACKET = 1024
+NUM_PACKETS = 2000
+_RECORD = struct.Struct(f"<{CHANNELS}h")
+
+
+def decode_packet(packet: object) -> BaseTimeSeries:
+    assert isinstance(packet, bytes)
+    rows = [[value / 32768.0 for value in record] for record in _RECORD.iter_unpack(packet)]
+    return BaseTimeSeries(
+        values=np.asarray(rows, dtype=np.float32),
+        sample_rate=1_000.0,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def make_packets(count: int) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    raw = rng.integers(-32768, 32767, size=(count, SAMPLES_PER_PACKET, CHANNELS), dtype="<i2")
+    return [packet.tobytes() for packet in raw]
+
+
+def blocks_per_second(packets: list[bytes], num_processes: int, chunk_size: int) -> float:
+    dataset = AdapterDataset(
+        packets,
+        collate_fn=decode_packet,
+        num_processes=num_processes,
+        chunk_size=chunk_size,
+    )
+    try:
+        # The pool is kept across iterations: start it (and warm up the
+        # workers' imports) outside the timed pass.
+        for _ in islice(dataset, 2 * max(num_processes, 1) * chunk_size):
+            pass
+        start = perf_counter()
+        count = sum(1 for _ in dataset)
+        return count / (perf_counter() - start)
+    finally:
+        dataset.close()
+
+
+def main() -> None:
+    packets = make_packets(NUM_PACKETS)
+    inline = blocks_per_second(packets, 0, 1)
+    print(f"inline: {inline:.1f} blocks/s")
+    print(f"{'processes':>10} {'chunk':>6} {'blocks_s':>9} {'speedup':>8}")
+    for num_processes in (1, 2, 4, 8):
+        for chunk_size in (4, 16, 64):
+            rate = blocks_per_second(packets, num_processes, chunk_size)
+            print(f"{num_processes:>10} {chunk_size:>6} {rate:>9.1f} {rate / inline:>7.2f}x")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,87 @@
+"""Bytes allocated per block when results are kept versus read as views.
+
+``kept`` holds on to every result dict, so each block needs fresh output
+arrays. ``view`` uses ``run(view=True)`` and drops each block before the
+next, so nodes write into the arrays of the previous block. ``KB/block`` is
+the tracemalloc peak during a block above the memory in use before it.
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+import numpy as np
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    DecisionNode,
+    IterableDataset,
+    MovingAverageNode,
+    NormalizerNode,
+    PipelineBuilder,
+    SpectrogramNode,
+    StreamDataLoader,
+)
+
+SAMPLE_RATE = 1024.0
+NUM_BLOCKS = 400
+
+
+def make_blocks(block_size: int, channels: int) -> list[BaseTimeSeries]:
+    rng = np.random.default_rng(0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        BaseTimeSeries(
+            values=rng.standard_normal((block_size, channels)),
+            sample_rate=SAMPLE_RATE,
+            timestamp=start + timedelta(seconds=index * block_size / SAMPLE_RATE),
+        )
+        for index in range(NUM_BLOCKS)
+    ]
+
+
+def build(blocks: list[BaseTimeSeries]):
+    builder = PipelineBuilder(input_key="raw", output_keys=["smooth", "spec", "decision"])
+    builder.add_node(NormalizerNode("raw", "norm"))
+    builder.add_node(MovingAverageNode("norm", "smooth", window=16, streaming=True))
+    builder.add_node(SpectrogramNode("smooth", "spec", frame_length=256, hop=128))
+    builder.add_node(DecisionNode(["smooth", "spec"]))
+    return builder.build(StreamDataLoader(IterableDataset(blocks)))
+
+
+def measure(blocks: list[BaseTimeSeries], view: bool) -> tuple[float, float]:
+    kept = []
+    start = perf_counter()
+    for outputs in build(blocks).run(view=view):
+        if not view:
+            kept.append(outputs)
+    rate = NUM_BLOCKS / (perf_counter() - start)
+
+    kept.clear()
+    allocated = 0
+    tracemalloc.start()
+    for index, outputs in enumerate(build(blocks).run(view=view)):
+        if not view:
+            kept.append(outputs)
+        current, peak = tracemalloc.get_traced_memory()
+        if index:  # the first block sizes every buffer
+            allocated += peak - before
+        tracemalloc.reset_peak()
+        before = current
+    tracemalloc.stop()
+    return rate, allocated / (NUM_BLOCKS - 1) / 1e3
+
+
+def main() -> None:
+    print(f"{'block':>6} {'ch':>4} {'mode':>6} {'blocks/s':>10} {'KB/block':>9}")
+    for block_size, channels in ((1024, 8), (4096, 32)):
+        blocks = make_blocks(block_size, channels)
+        for mode in ("kept", "view"):
+            rate, kilobytes = measure(blocks, view=mode == "view")
+            print(f"{block_size:>6} {channels:>4} {mode:>6} {rate:>10.1f} {kilobytes:>9.1f}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
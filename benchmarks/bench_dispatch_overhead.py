@@ -0,0 +1,123 @@
+"""Per-block dispatch overhead of PipelineOrchestrator with no-op nodes.
+
+Compares the compiled slot plan against the previous dict/BlockBuffer loop,
+reproduced below as ``legacy_run``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    BlockBuffer,
+    IterableDataset,
+    PipelineBuilder,
+    StreamDataLoader,
+)
+from online_dev_environment.base.nodes import ProcessingNode
+from online_dev_environment.base.plan import resolve_order
+
+
+class PassThroughNode(ProcessingNode):
+    def __init__(self, key_in: str, key_out: str) -> None:
+        super().__init__(name=key_out)
+        self._key_in = key_in
+        self._key_out = key_out
+
+    def requires(self) -> Iterable[str]:
+        return [self._key_in]
+
+    def produces(self) -> Iterable[str]:
+        return [self._key_out]
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        return {self._key_out: inputs[self._key_in]}
+
+
+class SilentNode(PassThroughNode):
+    """Declares an output but never emits it."""
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        return {}
+
+
+class NeverReadyNode(PassThroughNode):
+    """Requires a key that is never produced, exercising the missing-input path."""
+
+    def requires(self) -> Iterable[str]:
+        return [self._key_in, "never"]
+
+
+def legacy_run(
+    blocks: Iterable[BaseTimeSeries],
+    nodes: Sequence[ProcessingNode],
+    input_key: str,
+) -> Iterator[Dict[str, BaseTimeSeries]]:
+    buffer = BlockBuffer()
+    for block in blocks:
+        buffer.clear()
+        buffer.set(input_key, block)
+        produced: Dict[str, BaseTimeSeries] = {input_key: block}
+        for node in nodes:
+            inputs: Dict[str, BaseTimeSeries] = {}
+            missing = []
+            for key in node.requires():
+                try:
+                    inputs[key] = buffer.get(key)
+                except KeyError:
+                    missing.append(key)
+            if missing:
+                continue
+            outputs = node.process(inputs)
+            for key, value in outputs.items():
+                buffer.set(key, value)
+                produced[key] = value
+        yield dict(produced)
+
+
+def make_nodes(num_nodes: int) -> list[ProcessingNode]:
+    nodes: list[ProcessingNode] = [SilentNode("input", "never")]
+    for index in range(num_nodes):
+        key_in = "input" if index == 0 else f"n{index - 1}"
+        nodes.append(PassThroughNode(key_in, f"n{index}"))
+        nodes.append(NeverReadyNode(key_in, f"skip{index}"))
+    return nodes
+
+
+def main() -> None:
+    block = BaseTimeSeries(
+        values=np.zeros((1, 1)),
+        sample_rate=1.0,
+        timestamp=datetime.now(tz=timezone.utc),
+    )
+    blocks = [block] * 5_000
+
+    print(f"{'nodes':>6} {'legacy_us':>10} {'plan_us':>8} {'speedup':>8}")
+    for num_nodes in (10, 50, 200):
+        nodes = make_nodes(num_nodes)
+        builder = PipelineBuilder(input_key="input")
+        for node in nodes:
+            builder.add_node(node)
+
+        order = resolve_order(nodes, available={"input"})
+        start = perf_counter()
+        for _ in legacy_run(blocks, order, "input"):
+            pass
+        legacy_us = (perf_counter() - start) / len(blocks) * 1e6
+
+        pipeline = builder.build(StreamDataLoader(IterableDataset(blocks)))
+        start = perf_counter()
+        for _ in pipeline.run():
+            pass
+        plan_us = (perf_counter() - start) / len(blocks) * 1e6
+
+        print(f"{num_nodes * 2:>6} {legacy_us:>10.1f} {plan_us:>8.1f} {legacy_us / plan_us:>7.2f}x")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,85 @@
+"""Throughput and bytes moved per block with float64 versus float32 pipelines.
+
+Runs the same node chain on float64 blocks and on float32 blocks built with
+``PipelineBuilder(dtype=np.float32)``. ``MB/block`` sums the arrays produced
+per block, which is what the nodes write and their consumers read back.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+import numpy as np
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    DecisionNode,
+    IterableDataset,
+    MovingAverageNode,
+    NormalizerNode,
+    PipelineBuilder,
+    SpectrogramNode,
+    StreamDataLoader,
+)
+
+SAMPLE_RATE = 1024.0
+
+
+def make_blocks(num_blocks: int, block_size: int, channels: int, dtype: type) -> list[BaseTimeSeries]:
+    rng = np.random.default_rng(0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        BaseTimeSeries(
+            values=rng.standard_normal((block_size, channels)).astype(dtype),
+            sample_rate=SAMPLE_RATE,
+            timestamp=start + timedelta(seconds=index * block_size / SAMPLE_RATE),
+        )
+        for index in range(num_blocks)
+    ]
+
+
+def build(dtype: type | None) -> PipelineBuilder:
+    builder = PipelineBuilder(input_key="raw", dtype=dtype)
+    builder.add_node(NormalizerNode("raw", "norm"))
+    builder.add_node(MovingAverageNode("norm", "smooth", window=16, streaming=True))
+    builder.add_node(SpectrogramNode("smooth", "spec", frame_length=256, hop=128))
+    builder.add_node(DecisionNode(["smooth", "spec"]))
+    return builder
+
+
+def measure(blocks: list[BaseTimeSeries], dtype: type | None) -> tuple[float, float, str]:
+    pipeline = build(dtype).build(StreamDataLoader(IterableDataset(blocks)))
+    produced = 0
+    out_dtype = ""
+    start = perf_counter()
+    for outputs in pipeline.run():
+        for key, block in outputs.items():
+            if key != "raw":
+                produced += block.values.nbytes
+        out_dtype = str(outputs["smooth"].values.dtype)
+    seconds = perf_counter() - start
+    return len(blocks) / seconds, produced / len(blocks) / 1e6, out_dtype
+
+
+def main() -> None:
+    print(f"{'block':>6} {'ch':>4} {'dtype':>8} {'blocks/s':>10} {'MB/block':>9} {'speedup':>8}")
+    for block_size, channels in ((1024, 8), (4096, 64)):
+        num_blocks = max(20, 400_000 // (block_size * channels) * 10)
+        baseline = None
+        for label, data_dtype, policy in (
+            ("float64", np.float64, None),
+            ("float32", np.float32, np.float32),
+        ):
+            blocks = make_blocks(num_blocks, block_size, channels, data_dtype)
+            rate, megabytes, out_dtype = measure(blocks, policy)
+            assert out_dtype == label, out_dtype
+            baseline = baseline or rate
+            print(
+                f"{block_size:>6} {channels:>4} {label:>8} {rate:>10.1f} "
+                f"{megabytes:>9.2f} {rate / baseline:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,67 @@
+"""Peak live bytes per block for deep pipelines, keeping every key versus one.
+
+A chain of normalizer and moving-average stages ends in a spectrogram;
+every node runs either way. With ``output_keys=None`` every intermediate
+stays in the slots until the block ends. Requesting only the spectrogram
+lets the plan release each intermediate after its last consumer.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    IterableDataset,
+    MovingAverageNode,
+    NormalizerNode,
+    PipelineBuilder,
+    ProfilingMonitor,
+    SpectrogramNode,
+    StreamDataLoader,
+)
+
+NUM_BLOCKS = 20
+
+
+def make_blocks(block_size: int, channels: int) -> list[BaseTimeSeries]:
+    rng = np.random.default_rng(0)
+    return [
+        BaseTimeSeries(
+            values=rng.standard_normal((block_size, channels)),
+            sample_rate=1024.0,
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        for _ in range(NUM_BLOCKS)
+    ]
+
+
+def measure(blocks: list[BaseTimeSeries], depth: int, keep_all: bool) -> tuple[float, float]:
+    builder = PipelineBuilder(input_key="raw", output_keys=None if keep_all else ["spec"])
+    key = "raw"
+    for stage in range(depth):
+        builder.add_node(NormalizerNode(key, f"norm{stage}"))
+        builder.add_node(MovingAverageNode(f"norm{stage}", f"smooth{stage}", window=8))
+        key = f"smooth{stage}"
+    builder.add_node(SpectrogramNode(key, "spec", frame_length=64, hop=64))
+    monitor = ProfilingMonitor(live_bytes=True)
+    pipeline = builder.build(StreamDataLoader(IterableDataset(blocks)), monitor=monitor)
+    for _ in pipeline.run():
+        pass
+    return monitor.peak_live_bytes / 1e6, monitor.block_stats().p50_seconds * 1e6
+
+
+def main() -> None:
+    blocks = make_blocks(8192, 16)
+    print(f"{'depth':>6} {'keep':>6} {'peak_MB':>8} {'p50_us':>9}")
+    for depth in (2, 8, 32):
+        for keep_all in (True, False):
+            megabytes, p50 = measure(blocks, depth, keep_all)
+            label = "all" if keep_all else "final"
+            print(f"{depth:>6} {label:>6} {megabytes:>8.2f} {p50:>9.1f}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,85 @@
+"""Blocks per second for many sensors: per-sensor dicts versus packed blocks.
+
+``dict`` splits ``metadata["sensors"]`` and runs a normalizer and moving
+average per sensor. ``split`` feeds the same per-sensor graph from packed
+blocks, whose sensor inputs are column views. ``packed`` runs one
+normalizer and one moving average over every sensor at once. Timings
+include merging the sensor streams.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import List
+
+import numpy as np
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    MovingAverageNode,
+    MultiSensorDataset,
+    NormalizerNode,
+    PipelineBuilder,
+    SplitSensorNode,
+    StreamDataLoader,
+)
+
+NUM_BLOCKS = 50
+BLOCK_SIZE = 256
+CHANNELS = 4
+
+
+def make_sensors(count: int) -> dict[str, list[BaseTimeSeries]]:
+    rng = np.random.default_rng(0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    values = rng.standard_normal((NUM_BLOCKS, BLOCK_SIZE, CHANNELS))
+    return {
+        f"sensor{sensor}": [
+            BaseTimeSeries(
+                values=values[index],
+                sample_rate=1024.0,
+                timestamp=start + timedelta(seconds=index * BLOCK_SIZE / 1024.0),
+            )
+            for index in range(NUM_BLOCKS)
+        ]
+        for sensor in range(count)
+    }
+
+
+def per_sensor(sensors: List[str]) -> PipelineBuilder:
+    builder = PipelineBuilder(input_key="multi", output_keys=[f"{s}_ma" for s in sensors])
+    builder.add_node(SplitSensorNode("multi", sensors))
+    for sensor in sensors:
+        builder.add_node(NormalizerNode(f"{sensor}_raw", f"{sensor}_norm"))
+        builder.add_node(MovingAverageNode(f"{sensor}_norm", f"{sensor}_ma", window=8))
+    return builder
+
+
+def packed() -> PipelineBuilder:
+    builder = PipelineBuilder(input_key="multi", output_keys=["ma"])
+    builder.add_node(NormalizerNode("multi", "norm"))
+    builder.add_node(MovingAverageNode("norm", "ma", window=8))
+    return builder
+
+
+def measure(sensors: dict[str, list[BaseTimeSeries]], mode: str) -> float:
+    builder = packed() if mode == "packed" else per_sensor(list(sensors))
+    dataset = MultiSensorDataset(sensors, packed=mode != "dict")
+    pipeline = builder.build(StreamDataLoader(dataset))
+    start = perf_counter()
+    for _ in pipeline.run(view=True):
+        pass
+    return NUM_BLOCKS / (perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{'sensors':>8} {'mode':>7} {'blocks/s':>10}")
+    for count in (16, 64, 256):
+        sensors = make_sensors(count)
+        for mode in ("dict", "split", "packed"):
+            print(f"{count:>8} {mode:>7} {measure(sensors, mode):>10.1f}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
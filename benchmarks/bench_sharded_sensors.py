@@ -0,0 +1,103 @@
+"""Blocks per second for many sensors: one process versus ShardedPipeline.
+
+Every sensor runs a normalizer and a spectrogram; a DecisionNode fans the
+spectrograms back in. Speedup needs as many free cores as workers.
+
+Measured so far only on a 1-CPU machine, where sharding cannot win: the
+single process needs about 10 ms per block, one worker about 21 ms (the
+worker's nodes, the copies through both rings and the fan-in share the
+core) plus about 0.25 s of worker start-up, giving 0.3-0.5x of serial.
+No speed-up has been shown yet.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import List, Sequence
+
+import numpy as np
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    DecisionNode,
+    MultiSensorDataset,
+    NormalizerNode,
+    PipelineBuilder,
+    ShardedPipeline,
+    SpectrogramNode,
+    SplitSensorNode,
+    StreamDataLoader,
+)
+from online_dev_environment.base.nodes import ProcessingNode
+
+NUM_SENSORS = 32
+NUM_BLOCKS = 200
+BLOCK_SIZE = 2048
+SENSORS = [f"sensor{index}" for index in range(NUM_SENSORS)]
+
+
+def make_sensors() -> dict[str, list[BaseTimeSeries]]:
+    rng = np.random.default_rng(0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    values = rng.standard_normal((NUM_BLOCKS, BLOCK_SIZE, 4)).astype(np.float32)
+    return {
+        sensor: [
+            BaseTimeSeries(
+                values=values[index],
+                sample_rate=1024.0,
+                timestamp=start + timedelta(seconds=2 * index),
+            )
+            for index in range(NUM_BLOCKS)
+        ]
+        for sensor in SENSORS
+    }
+
+
+def shard_nodes(sensors: List[str]) -> Sequence[ProcessingNode]:
+    nodes: List[ProcessingNode] = [SplitSensorNode("multi", sensors)]
+    for sensor in sensors:
+        nodes.append(NormalizerNode(f"{sensor}_raw", f"{sensor}_norm"))
+        nodes.append(SpectrogramNode(f"{sensor}_norm", f"{sensor}_spec", frame_length=256, hop=64))
+    return nodes
+
+
+def decision() -> DecisionNode:
+    return DecisionNode([f"{sensor}_spec" for sensor in SENSORS])
+
+
+def main() -> None:
+    sensors = make_sensors()
+    print(f"cpus={os.cpu_count()} sensors={NUM_SENSORS} blocks={NUM_BLOCKS}")
+    print(f"{'runner':>12} {'blocks/s':>10} {'speedup':>8}")
+
+    builder = PipelineBuilder(input_key="multi", output_keys=["decision"])
+    for node in [*shard_nodes(SENSORS), decision()]:
+        builder.add_node(node)
+    pipeline = builder.build(StreamDataLoader(MultiSensorDataset(sensors)))
+    start = perf_counter()
+    for _ in pipeline.run():
+        pass
+    baseline = NUM_BLOCKS / (perf_counter() - start)
+    print(f"{'single':>12} {baseline:>10.1f} {1.0:>7.2f}x")
+
+    for workers in (1, 2, 4, 8):
+        sharded = ShardedPipeline(
+            StreamDataLoader(MultiSensorDataset(sensors)),
+            sensors=SENSORS,
+            shard_nodes=shard_nodes,
+            fan_in=[decision()],
+            input_key="multi",
+            output_keys=["decision"],
+            num_workers=workers,
+        )
+        start = perf_counter()
+        for _ in sharded.run():
+            pass
+        rate = NUM_BLOCKS / (perf_counter() - start)
+        print(f"{f'sharded x{workers}':>12} {rate:>10.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,104 @@
+"""Per-block cost of SlidingWindowNode as the window length grows.
+
+Compares the ring-buffer node against the previous concatenate-and-slice
+implementation, reproduced below as ``ConcatenateWindowNode``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Dict, Iterable
+
+import numpy as np
+
+from online_dev_environment.base import BaseTimeSeries, SlidingWindowNode
+from online_dev_environment.base.nodes import ProcessingNode
+
+
+class ConcatenateWindowNode(ProcessingNode):
+    """Reference copy of the list-and-concatenate SlidingWindowNode."""
+
+    def __init__(self, key_in: str, key_out: str, *, window_seconds: float, hop_seconds: float) -> None:
+        super().__init__()
+        self._key_in = key_in
+        self._key_out = key_out
+        self._window_seconds = window_seconds
+        self._hop_seconds = hop_seconds
+        self._buffer: list[np.ndarray] = []
+        self._window_samples: int | None = None
+        self._hop_samples: int | None = None
+
+    def requires(self) -> Iterable[str]:
+        return [self._key_in]
+
+    def produces(self) -> Iterable[str]:
+        return [self._key_out]
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        block = inputs[self._key_in]
+        if self._window_samples is None:
+            self._window_samples = max(int(round(self._window_seconds * block.sample_rate)), 1)
+            self._hop_samples = max(int(round(self._hop_seconds * block.sample_rate)), 1)
+        self._buffer.append(block.values)
+        concatenated = np.concatenate(self._buffer, axis=0)
+        if concatenated.shape[0] < self._window_samples:
+            return {}
+        window_block = block.copy_with(values=concatenated[: self._window_samples])
+        self._buffer = [concatenated[self._hop_samples :]]
+        return {self._key_out: window_block}
+
+
+def make_blocks(
+    num_blocks: int,
+    *,
+    block_size: int,
+    channels: int,
+    sample_rate: float,
+) -> list[BaseTimeSeries]:
+    now = datetime.now(tz=timezone.utc)
+    rng = np.random.default_rng(0)
+    return [
+        BaseTimeSeries(
+            values=rng.standard_normal((block_size, channels)),
+            sample_rate=sample_rate,
+            timestamp=now,
+        )
+        for _ in range(num_blocks)
+    ]
+
+
+def time_per_block(node: ProcessingNode, blocks: list[BaseTimeSeries], *, warmup: int) -> float:
+    node.reset()
+    for block in blocks[:warmup]:
+        node.process({"x": block})
+    start = perf_counter()
+    for block in blocks[warmup:]:
+        node.process({"x": block})
+    return (perf_counter() - start) / max(len(blocks) - warmup, 1)
+
+
+def main() -> None:
+    sample_rate = 8_000.0
+    block_size = 256
+    channels = 8
+    hop_seconds = block_size / sample_rate
+
+    print(f"{'window_s':>9} {'ring_us':>9} {'concat_us':>10} {'speedup':>8}")
+    for window_seconds in (0.5, 1.0, 5.0, 20.0, 60.0):
+        warmup = int(window_seconds * sample_rate / block_size) + 2
+        blocks = make_blocks(
+            warmup + 500,
+            block_size=block_size,
+            channels=channels,
+            sample_rate=sample_rate,
+        )
+        ring = SlidingWindowNode("x", "w", window_seconds=window_seconds, hop_seconds=hop_seconds)
+        concat = ConcatenateWindowNode("x", "w", window_seconds=window_seconds, hop_seconds=hop_seconds)
+        ring_us = time_per_block(ring, blocks, warmup=warmup) * 1e6
+        concat_us = time_per_block(concat, blocks, warmup=warmup) * 1e6
+        print(f"{window_seconds:>9.1f} {ring_us:>9.1f} {concat_us:>10.1f} {concat_us / ring_us:>7.1f}x")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,374 @@
+"""Throughput and latency benchmark suite for the built-in nodes and pipeline.
+
+Runs every node in ``base/nodes.py`` and the quickstart topology over a grid
+of block sizes, channel counts and sensor counts, using synthetic data only.
+Each case runs in a fresh process so its peak RSS is its own.
+
+Usage::
+
+    python benchmarks/suite.py run --output results.json [--quick]
+    python benchmarks/suite.py compare baseline.json results.json [--threshold 0.10]
+
+``compare`` exits with status 1 when any case regresses by more than the
+threshold in blocks/s or p95 latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator
+
+import numpy as np
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    DecisionNode,
+    IterableDataset,
+    MovingAverageNode,
+    MultiSensorDataset,
+    NormalizerNode,
+    PipelineBuilder,
+    PipelineMonitor,
+    SlidingWindowNode,
+    SpectrogramNode,
+    SplitSensorNode,
+    StreamDataLoader,
+)
+from online_dev_environment.base.monitoring import BlockSummary, LatencyHistogram
+from online_dev_environment.base.nodes import ProcessingNode
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class CaseResult:
+    case: str
+    params: Dict[str, int]
+    blocks: int
+    blocks_per_second: float
+    samples_per_second: float
+    latency_us: Dict[str, float]
+    peak_rss_mb: float
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{name}={value}" for name, value in sorted(self.params.items()))
+        return f"{self.case}[{params}]"
+
+
+# Synthetic sources ----------------------------------------------------------
+
+
+def synthetic_blocks(
+    num_blocks: int,
+    *,
+    block_size: int,
+    channels: int,
+    phase: float = 0.0,
+    sensor: str = "sensor",
+) -> list[BaseTimeSeries]:
+    """Noisy sines at one block per second, like the quickstart source."""
+    rng = np.random.default_rng(0)
+    grid = np.linspace(0.0, 2 * np.pi, block_size, endpoint=False)[:, None]
+    offsets = np.arange(channels)[None, :] * 0.1
+    return [
+        BaseTimeSeries(
+            values=np.sin(grid + idx * np.pi / 32 + phase + offsets)
+            + 0.01 * rng.standard_normal((block_size, channels)),
+            sample_rate=float(block_size),
+            timestamp=START + timedelta(seconds=idx),
+            metadata={"sensor": sensor, "block_index": idx},
+        )
+        for idx in range(num_blocks)
+    ]
+
+
+def synthetic_multisensor(
+    num_blocks: int,
+    *,
+    block_size: int,
+    channels: int,
+    sensors: int,
+) -> dict[str, list[BaseTimeSeries]]:
+    return {
+        f"sensor_{sid}": synthetic_blocks(
+            num_blocks,
+            block_size=block_size,
+            channels=channels,
+            phase=sid * np.pi / 4,
+            sensor=f"sensor_{sid}",
+        )
+        for sid in range(sensors)
+    }
+
+
+# Cases ----------------------------------------------------------------------
+
+
+def _time_node(
+    node: ProcessingNode,
+    inputs: list[Dict[str, BaseTimeSeries]],
+) -> tuple[int, float, LatencyHistogram]:
+    warmup = len(inputs) // 10
+    for block_inputs in inputs[:warmup]:
+        node.process(block_inputs)
+    histogram = LatencyHistogram()
+    total_ns = 0
+    for block_inputs in inputs[warmup:]:
+        start = perf_counter_ns()
+        node.process(block_inputs)
+        elapsed = perf_counter_ns() - start
+        histogram.record(elapsed)
+        total_ns += elapsed
+    count = len(inputs) - warmup
+    return count, total_ns / 1e9, histogram
+
+
+def _single_input_case(factory: Callable[[], ProcessingNode]) -> Callable[..., Any]:
+    def run(*, blocks: int, block_size: int, channels: int) -> tuple[int, float, LatencyHistogram]:
+        data = synthetic_blocks(blocks, block_size=block_size, channels=channels)
+        return _time_node(factory(), [{"x": block} for block in data])
+
+    return run
+
+
+def _split_case(*, blocks: int, block_size: int, channels: int, sensors: int):
+    source = synthetic_multisensor(blocks, block_size=block_size, channels=channels, sensors=sensors)
+    merged = list(MultiSensorDataset(source))
+    node = SplitSensorNode("multi", list(source))
+    return _time_node(node, [{"multi": block} for block in merged])
+
+
+def _decision_case(*, blocks: int, block_size: int, channels: int, sensors: int):
+    source = synthetic_multisensor(blocks, block_size=block_size, channels=channels, sensors=sensors)
+    keys = [f"{sensor}_window" for sensor in source]
+    inputs = [
+        {key: source[sensor][index] for key, sensor in zip(keys, source)}
+        for index in range(blocks)
+    ]
+    return _time_node(DecisionNode(keys), inputs)
+
+
+class _BlockLatencyMonitor(PipelineMonitor):
+    def __init__(self) -> None:
+        self.histogram = LatencyHistogram()
+        self.total_seconds = 0.0
+
+    def on_block_start(self, block_index: int) -> None:
+        return
+
+    def on_block_end(self, summary: BlockSummary) -> None:
+        self.histogram.record(int(summary.duration_seconds * 1e9))
+        self.total_seconds += summary.duration_seconds
+
+
+def build_quickstart(
+    loader: StreamDataLoader,
+    sensors: list[str],
+    *,
+    monitor: PipelineMonitor | None = None,
+    **build_options: Any,
+):
+    """The quickstart topology generalised to any number of sensors."""
+    builder = PipelineBuilder(
+        input_key="multi",
+        output_keys=[*(f"{sensor}_window" for sensor in sensors), "decision"],
+    )
+    builder.add_node(SplitSensorNode("multi", sensors))
+    for sensor in sensors:
+        builder.add_node(NormalizerNode(f"{sensor}_raw", f"{sensor}_norm"))
+        builder.add_node(
+            SlidingWindowNode(
+                f"{sensor}_norm",
+                f"{sensor}_window",
+                window_seconds=5.0,
+                hop_seconds=1.0,
+            )
+        )
+    builder.add_node(DecisionNode([f"{sensor}_window" for sensor in sensors]))
+    return builder.build(loader, monitor=monitor, **build_options)
+
+
+def _pipeline_case(*, blocks: int, block_size: int, channels: int, sensors: int):
+    source = synthetic_multisensor(blocks, block_size=block_size, channels=channels, sensors=sensors)
+    loader = StreamDataLoader(IterableDataset(MultiSensorDataset(source)))
+    monitor = _BlockLatencyMonitor()
+    for _ in build_quickstart(loader, list(source), monitor=monitor).run():
+        pass
+    return blocks, monitor.total_seconds, monitor.histogram
+
+
+NODE_CASES: Dict[str, Callable[..., Any]] = {
+    "NormalizerNode": _single_input_case(lambda: NormalizerNode("x", "y")),
+    "MovingAverageNode": _single_input_case(lambda: MovingAverageNode("x", "y", window=8)),
+    "MovingAverageNode.streaming": _single_input_case(
+        lambda: MovingAverageNode("x", "y", window=8, streaming=True)
+    ),
+    "SlidingWindowNode": _single_input_case(
+        lambda: SlidingWindowNode("x", "y", window_seconds=5.0, hop_seconds=1.0)
+    ),
+    "SpectrogramNode": _single_input_case(
+        lambda: SpectrogramNode("x", "y", frame_length=256, hop=64)
+    ),
+}
+SENSOR_CASES: Dict[str, Callable[..., Any]] = {
+    "SplitSensorNode": _split_case,
+    "DecisionNode": _decision_case,
+    "quickstart_pipeline": _pipeline_case,
+}
+
+
+def iter_grid(quick: bool) -> Iterator[tuple[str, Dict[str, int]]]:
+    block_sizes = (64, 1024) if quick else (64, 256, 1024, 4096)
+    channel_counts = (1, 16) if quick else (1, 8, 64)
+    sensor_counts = (2, 8) if quick else (2, 8, 32)
+    for case in NODE_CASES:
+        for block_size, channels in itertools.product(block_sizes, channel_counts):
+            yield case, {"block_size": block_size, "channels": channels}
+    for case in SENSOR_CASES:
+        for block_size, channels, sensors in itertools.product(
+            block_sizes, channel_counts, sensor_counts
+        ):
+            yield case, {"block_size": block_size, "channels": channels, "sensors": sensors}
+
+
+def run_case(case: str, params: Dict[str, int], blocks: int) -> CaseResult:
+    runner = NODE_CASES.get(case) or SENSOR_CASES[case]
+    count, seconds, histogram = runner(blocks=blocks, **params)
+    stats = histogram.stats()
+    samples = params["block_size"] * params.get("sensors", 1)
+    rate = count / seconds if seconds > 0 else float("inf")
+    return CaseResult(
+        case=case,
+        params=params,
+        blocks=count,
+        blocks_per_second=rate,
+        samples_per_second=rate * samples,
+        latency_us={
+            "p50": stats.p50_seconds * 1e6,
+            "p95": stats.p95_seconds * 1e6,
+            "p99": stats.p99_seconds * 1e6,
+            "max": stats.max_seconds * 1e6,
+        },
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / (1024 * 1024 if sys.platform == "darwin" else 1024),
+    )
+
+
+# Commands -------------------------------------------------------------------
+
+
+def command_run(args: argparse.Namespace) -> int:
+    blocks = args.blocks or (100 if args.quick else 500)
+    cases = [
+        (case, params)
+        for case, params in iter_grid(args.quick)
+        if not args.filter or args.filter in case
+    ]
+    results = []
+    if args.in_process:
+        results = [run_case(case, params, blocks) for case, params in cases]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=1,
+            max_tasks_per_child=1,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [pool.submit(run_case, case, params, blocks) for case, params in cases]
+            results = [future.result() for future in futures]
+
+    for result in results:
+        print(
+            f"{result.key:<60} {result.blocks_per_second:>12.1f} blocks/s "
+            f"p95={result.latency_us['p95']:>9.1f}us rss={result.peak_rss_mb:>7.1f}MB"
+        )
+    report = {
+        "meta": {
+            "created": datetime.now(tz=timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "blocks": blocks,
+        },
+        "results": [{**asdict(result), "key": result.key} for result in results],
+    }
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"wrote {len(results)} results to {args.output}")
+    return 0
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    threshold: float,
+) -> list[str]:
+    """Return one message per case that regressed beyond ``threshold``."""
+    base_results = {entry["key"]: entry for entry in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        base = base_results.get(entry["key"])
+        if base is None:
+            continue
+        throughput = entry["blocks_per_second"] / base["blocks_per_second"]
+        latency = entry["latency_us"]["p95"] / max(base["latency_us"]["p95"], 1e-9)
+        if throughput < 1.0 - threshold:
+            regressions.append(f"{entry['key']}: blocks/s x{throughput:.2f}")
+        if latency > 1.0 + threshold:
+            regressions.append(f"{entry['key']}: p95 latency x{latency:.2f}")
+    return regressions
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    with open(args.current, encoding="utf-8") as handle:
+        current = json.load(handle)
+    regressions = compare_reports(baseline, current, threshold=args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print(f"no regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmark grid")
+    run.add_argument("--output", default="bench_results.json")
+    run.add_argument("--quick", action="store_true", help="smaller grid and fewer blocks")
+    run.add_argument("--blocks", type=int, default=None, help="blocks per case")
+    run.add_argument("--filter", default=None, help="only cases whose name contains this")
+    run.add_argument(
+        "--in-process",
+        action="store_true",
+        help="run all cases in this process (faster, but peak RSS is cumulative)",
+    )
+    run.set_defaults(func=command_run)
+
+    compare = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10)
+    compare.set_defaults(func=command_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
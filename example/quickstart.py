@@ -82,7 +82,7 @@ def build_pipeline() -> None:
     pipeline = builder.build(loader, monitor=monitor)
 
     emitted = 0
-    for outputs in pipeline.run():
+    for outputs in pipeline.run(changed_only=True):
         decision = outputs.get("decision")
         if decision is None:
             continue
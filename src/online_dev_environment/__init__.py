@@ -1,41 +1,72 @@
 
 """Fourth-stage pipeline prototype approaching production architecture."""
 
-from .base import BaseTimeSeries, BlockBuffer
+from .base import BaseTimeSeries, BlockBatch, BlockBuffer, ChannelIndex, RingBuffer
 from .base import (
     AdapterDataset,
+    AsyncDataset,
+    AsyncIterableDataset,
     CollateFn,
     IterableDataset,
+    MemmapDataset,
     StreamDataLoader,
-    MultiSensorDataset
+    MultiSensorDataset,
+    RecordingReader,
+    RecordingWriter,
+)
+from .base import (
+    ConsoleMonitor,
+    ErrorPolicy,
+    MemoryMonitor,
+    PipelineMonitor,
+    ProfilingMonitor,
 )
-from .base import ConsoleMonitor, ErrorPolicy, PipelineMonitor
 from .base import (
     DecisionNode,
     MovingAverageNode,
     NormalizerNode,
     SlidingWindowNode,
+    SpectrogramNode,
     SplitSensorNode,
 )
-from .base import PipelineBuilder, PipelineExecutionError, PipelineOrchestrator
+from .base import (
+    PipelineBuilder,
+    PipelineExecutionError,
+    PipelineOrchestrator,
+    ResultsView,
+    ShardedPipeline,
+)
 
 __all__ = [
     "BaseTimeSeries",
+    "BlockBatch",
     "BlockBuffer",
+    "ChannelIndex",
+    "RingBuffer",
     "AdapterDataset",
+    "AsyncDataset",
+    "AsyncIterableDataset",
     "CollateFn",
     "IterableDataset",
+    "MemmapDataset",
     "StreamDataLoader",
-    "MultiSensorDataset"
+    "MultiSensorDataset",
+    "RecordingReader",
+    "RecordingWriter",
     "ConsoleMonitor",
     "ErrorPolicy",
+    "MemoryMonitor",
     "PipelineMonitor",
+    "ProfilingMonitor",
     "DecisionNode",
     "MovingAverageNode",
     "NormalizerNode",
     "SlidingWindowNode",
+    "SpectrogramNode",
     "SplitSensorNode",
     "PipelineBuilder",
     "PipelineExecutionError",
     "PipelineOrchestrator",
+    "ResultsView",
+    "ShardedPipeline",
 ]
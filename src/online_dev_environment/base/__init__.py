@@ -1,41 +1,75 @@
 """Fourth-stage pipeline prototype approaching production architecture."""
 
 from .data.base_data import BaseTimeSeries
+from .data.batch import BlockBatch
 from .data.buffer import BlockBuffer
+from .data.channels import ChannelIndex
+from .data.ring_buffer import RingBuffer
 from .io import (
     AdapterDataset,
+    AsyncDataset,
+    AsyncIterableDataset,
     CollateFn,
     IterableDataset,
+    MemmapDataset,
     StreamDataLoader,
-    MultiSensorDataset
+    MultiSensorDataset,
+    RecordingReader,
+    RecordingWriter,
+)
+from .monitoring import (
+    ConsoleMonitor,
+    ErrorPolicy,
+    MemoryMonitor,
+    PipelineMonitor,
+    ProfilingMonitor,
 )
-from .monitoring import ConsoleMonitor, ErrorPolicy, PipelineMonitor
 from .nodes import (
     DecisionNode,
     MovingAverageNode,
     NormalizerNode,
     SlidingWindowNode,
+    SpectrogramNode,
     SplitSensorNode,
 )
-from .pipeline import PipelineBuilder, PipelineExecutionError, PipelineOrchestrator
+from .pipeline import (
+    PipelineBuilder,
+    PipelineExecutionError,
+    PipelineOrchestrator,
+    ResultsView,
+)
+from .sharding import ShardedPipeline
 
 __all__ = [
     "BaseTimeSeries",
+    "BlockBatch",
     "BlockBuffer",
+    "ChannelIndex",
+    "RingBuffer",
     "AdapterDataset",
+    "AsyncDataset",
+    "AsyncIterableDataset",
     "CollateFn",
     "IterableDataset",
+    "MemmapDataset",
     "StreamDataLoader",
     "MultiSensorDataset",
+    "RecordingReader",
+    "RecordingWriter",
     "ConsoleMonitor",
     "ErrorPolicy",
+    "MemoryMonitor",
     "PipelineMonitor",
+    "ProfilingMonitor",
     "DecisionNode",
     "MovingAverageNode",
     "NormalizerNode",
     "SlidingWindowNode",
+    "SpectrogramNode",
     "SplitSensorNode",
     "PipelineBuilder",
     "PipelineExecutionError",
     "PipelineOrchestrator",
+    "ResultsView",
+    "ShardedPipeline",
 ]
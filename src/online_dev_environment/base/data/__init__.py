@@ -2,6 +2,9 @@
 """Data layer exports for src_4th."""
 
 from .base_data import BaseTimeSeries
+from .batch import BlockBatch
 from .buffer import BlockBuffer
+from .channels import ChannelIndex
+from .ring_buffer import RingBuffer
 
-__all__ = ["BaseTimeSeries", "BlockBuffer"]
+__all__ = ["BaseTimeSeries", "BlockBatch", "BlockBuffer", "ChannelIndex", "RingBuffer"]
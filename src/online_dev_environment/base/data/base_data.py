@@ -17,12 +17,23 @@ def _ensure_array(values: npt.ArrayLike) -> Array:
     array = np.asarray(values)
     if array.ndim == 0:
         raise ValueError("values must be at least 1-D")
+    if array.flags.writeable:
+        # Freeze a view rather than the caller's array so blocks can share
+        # buffers without taking write access away from the producer.
+        if array is values:
+            array = array.view()
+        array.flags.writeable = False
     return array
 
 
 @dataclass(slots=True, frozen=True)
 class BaseTimeSeries:
-    """Immutable block of time-series data with metadata."""
+    """Immutable block of time-series data with metadata.
+
+    ``values`` is always a read-only array. Blocks derived with
+    :meth:`copy_with` share the sample buffer unless new values are given or
+    ``deep=True`` is requested.
+    """
 
     values: Array
     sample_rate: float
@@ -58,12 +69,14 @@ class BaseTimeSeries:
         *,
         values: npt.ArrayLike | None = None,
         metadata: dict[str, Any] | None = None,
+        deep: bool = False,
     ) -> "BaseTimeSeries":
-        new_values = _ensure_array(values) if values is not None else self.values.copy()
-        new_metadata = dict(metadata) if metadata is not None else dict(self.metadata)
+        new_values = self.values if values is None else values
+        if deep:
+            new_values = np.array(new_values, copy=True)
         return BaseTimeSeries(
             values=new_values,
             sample_rate=self.sample_rate,
             timestamp=self.timestamp,
-            metadata=new_metadata,
+            metadata=self.metadata if metadata is None else metadata,
         )
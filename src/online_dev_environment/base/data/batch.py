@@ -0,0 +1,84 @@
+
+"""Stacked batches of same-shaped blocks for src_4th."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .base_data import Array, BaseTimeSeries, _ensure_array
+
+
+@dataclass(slots=True, frozen=True)
+class BlockBatch:
+    """Consecutive blocks stacked along a leading batch axis.
+
+    ``values[i]`` holds the samples of block ``i``; ``timestamps[i]`` and
+    ``metadata[i]`` keep what differs per block. All blocks share one
+    ``sample_rate``.
+    """
+
+    values: Array
+    sample_rate: float
+    timestamps: tuple[datetime, ...]
+    metadata: tuple[dict[str, Any], ...]
+
+    def __post_init__(self) -> None:
+        array = _ensure_array(self.values)
+        if array.ndim < 2:
+            raise ValueError("batch values must have a batch and a sample axis")
+        if not len(self.timestamps) == len(self.metadata) == array.shape[0]:
+            raise ValueError("timestamps and metadata must match the batch size")
+        object.__setattr__(self, "values", array)
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    @classmethod
+    def stack(cls, blocks: Sequence[BaseTimeSeries]) -> "BlockBatch":
+        """Stack blocks; raises ``ValueError`` if they cannot share an array."""
+        if not blocks:
+            raise ValueError("cannot stack an empty sequence of blocks")
+        first = blocks[0]
+        for block in blocks[1:]:
+            if (
+                block.values.shape != first.values.shape
+                or block.values.dtype != first.values.dtype
+                or block.sample_rate != first.sample_rate
+            ):
+                raise ValueError("blocks differ in shape, dtype or sample_rate")
+        return cls(
+            values=np.stack([block.values for block in blocks]),
+            sample_rate=first.sample_rate,
+            timestamps=tuple(block.timestamp for block in blocks),
+            metadata=tuple(block.metadata for block in blocks),
+        )
+
+    def unstack(self) -> list[BaseTimeSeries]:
+        """Split into blocks whose values are views into this batch."""
+        return [
+            BaseTimeSeries(
+                values=self.values[index],
+                sample_rate=self.sample_rate,
+                timestamp=self.timestamps[index],
+                metadata=self.metadata[index],
+            )
+            for index in range(len(self))
+        ]
+
+    def copy_with(
+        self,
+        *,
+        values: npt.ArrayLike | None = None,
+        metadata: Sequence[dict[str, Any]] | None = None,
+    ) -> "BlockBatch":
+        return BlockBatch(
+            values=self.values if values is None else values,
+            sample_rate=self.sample_rate,
+            timestamps=self.timestamps,
+            metadata=self.metadata if metadata is None else tuple(metadata),
+        )
@@ -0,0 +1,82 @@
+"""Column layout of packed multi-sensor blocks for src_4th."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator
+
+import numpy as np
+
+from .base_data import BaseTimeSeries
+
+
+@dataclass(slots=True, frozen=True)
+class ChannelIndex:
+    """Which columns of a packed ``(samples, channels)`` array belong to which sensor.
+
+    Sensors sit side by side in ``sensors`` order; sensor ``i`` owns columns
+    ``offsets[i]:offsets[i + 1]``. Packed blocks carry their index in
+    ``metadata["channels"]``.
+    """
+
+    sensors: tuple[str, ...]
+    offsets: tuple[int, ...]
+    _positions: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if len(self.offsets) != len(self.sensors) + 1 or self.offsets[0] != 0:
+            raise ValueError("offsets must start at 0 and have one entry per sensor plus one")
+        if any(stop <= start for start, stop in zip(self.offsets, self.offsets[1:])):
+            raise ValueError("every sensor needs at least one column")
+        positions = {sensor: position for position, sensor in enumerate(self.sensors)}
+        if len(positions) != len(self.sensors):
+            raise ValueError("sensor names must be unique")
+        object.__setattr__(self, "_positions", positions)
+
+    @classmethod
+    def from_widths(cls, widths: Iterable[tuple[str, int]]) -> "ChannelIndex":
+        """Build an index from ``(sensor, channel count)`` pairs in column order."""
+        sensors = []
+        offsets = [0]
+        for sensor, width in widths:
+            sensors.append(sensor)
+            offsets.append(offsets[-1] + int(width))
+        return cls(tuple(sensors), tuple(offsets))
+
+    def __len__(self) -> int:
+        return len(self.sensors)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sensors)
+
+    def __contains__(self, sensor: object) -> bool:
+        return sensor in self._positions
+
+    @property
+    def width(self) -> int:
+        """Total number of columns."""
+        return self.offsets[-1]
+
+    @property
+    def widths(self) -> np.ndarray:
+        """Channel count per sensor, in ``sensors`` order."""
+        return np.diff(self.offsets)
+
+    def columns(self, sensor: str) -> slice:
+        """Column slice of ``sensor``; raises ``KeyError`` if it is not packed."""
+        position = self._positions[sensor]
+        return slice(self.offsets[position], self.offsets[position + 1])
+
+    def split(
+        self, block: BaseTimeSeries, sensors: Iterable[str] | None = None
+    ) -> Dict[str, BaseTimeSeries]:
+        """Per-sensor blocks whose values are column views of ``block``."""
+        values = block.values
+        if values.ndim != 2 or values.shape[1] != self.width:
+            raise ValueError(f"packed values must have shape (samples, {self.width})")
+        return {
+            sensor: block.copy_with(
+                values=values[:, self.columns(sensor)], metadata={"sensor": sensor}
+            )
+            for sensor in (self.sensors if sensors is None else sensors)
+        }
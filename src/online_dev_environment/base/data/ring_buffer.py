@@ -0,0 +1,98 @@
+
+"""Preallocated sample buffer for streaming nodes."""
+
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+
+class RingBuffer:
+    """FIFO of up to ``capacity`` unread samples stored along axis 0.
+
+    Samples are appended into preallocated storage twice the capacity long.
+    When the end is reached, the unread samples move to fresh storage
+    instead of wrapping around, so any run of unread samples is a contiguous
+    view and rows that a view points into are never written again. Views
+    returned by :meth:`peek` are read-only and stay valid indefinitely; the
+    amortized cost per written sample does not depend on the capacity.
+    Samples are stored as ``dtype`` when given, else as the first write's
+    dtype.
+    """
+
+    def __init__(self, capacity: int, *, dtype: npt.DTypeLike | None = None) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        self._data: np.ndarray | None = None
+        self._start = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the current storage, unread or not."""
+        return 0 if self._data is None else self._data.nbytes
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        self._data = None
+        self._start = 0
+        self._size = 0
+
+    def write(self, values: npt.ArrayLike) -> None:
+        array = np.asarray(values)
+        if array.ndim == 0:
+            raise ValueError("values must be at least 1-D")
+        count = array.shape[0]
+        if self._data is None:
+            dtype = array.dtype if self._dtype is None else self._dtype
+            self._data = np.empty((2 * self._capacity, *array.shape[1:]), dtype=dtype)
+        elif array.shape[1:] != self._data.shape[1:]:
+            raise ValueError(
+                f"sample shape changed from {self._data.shape[1:]} to {array.shape[1:]}"
+            )
+        if self._size + count > self._capacity:
+            self._capacity = max(2 * self._capacity, self._size + count)
+            self._relocate()
+        elif self._start + self._size + count > self._data.shape[0]:
+            self._relocate()
+
+        end = self._start + self._size
+        self._data[end : end + count] = array
+        self._size += count
+
+    def peek(self, length: int | None = None) -> np.ndarray:
+        """Return the oldest ``length`` unread samples as a read-only view."""
+        if length is None:
+            length = self._size
+        if length < 0 or length > self._size:
+            raise ValueError(f"cannot peek {length} samples from buffer of size {self._size}")
+        if self._data is None:
+            raise ValueError("buffer is empty")
+        view = self._data[self._start : self._start + length]
+        view.flags.writeable = False
+        return view
+
+    def consume(self, count: int) -> None:
+        """Drop the oldest ``count`` samples."""
+        if count < 0:
+            raise ValueError("count must be non-negative")
+        count = min(count, self._size)
+        self._start += count
+        self._size -= count
+
+    def _relocate(self) -> None:
+        # Fresh storage rather than an in-place move: earlier views keep
+        # pointing at the old rows, which are never overwritten.
+        assert self._data is not None
+        data = np.empty((2 * self._capacity, *self._data.shape[1:]), dtype=self._data.dtype)
+        data[: self._size] = self._data[self._start : self._start + self._size]
+        self._data = data
+        self._start = 0
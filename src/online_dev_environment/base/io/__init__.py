@@ -1,15 +1,22 @@
 """I/O layer exports for src_4th."""
 
 from .adapters import AdapterDataset
+from .async_dataset import AsyncDataset, AsyncIterableDataset
 from .collate import CollateFn, default_collate
 from .dataloader import StreamDataLoader
-from .dataset import IterableDataset, MultiSensorDataset
+from .dataset import IterableDataset, MemmapDataset, MultiSensorDataset
+from .recording import RecordingReader, RecordingWriter
 
 __all__ = [
     "AdapterDataset",
+    "AsyncDataset",
+    "AsyncIterableDataset",
     "CollateFn",
     "IterableDataset",
+    "MemmapDataset",
     "MultiSensorDataset",
+    "RecordingReader",
+    "RecordingWriter",
     "StreamDataLoader",
     "default_collate",
 ]
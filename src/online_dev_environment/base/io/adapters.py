@@ -2,26 +2,109 @@
 
 from __future__ import annotations
 
+import multiprocessing
+import weakref
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from typing import Callable, Iterable, Iterator
 
 from ..data.base_data import BaseTimeSeries
 from .collate import CollateFn, default_collate
 from .dataset import Dataset
+from .shared_memory import PackedBlocks, discard_packed, pack_blocks, unpack_blocks
 
 
 class AdapterDataset(Dataset):
-    """Wrap a callable or iterable and collate samples into BaseTimeSeries."""
+    """Wrap a callable or iterable and collate samples into BaseTimeSeries.
+
+    With ``num_processes > 0`` the source is read in the calling process and
+    shipped in chunks of ``chunk_size`` samples to a spawn-based process
+    pool, where ``collate_fn`` runs. Decoded values come back through shared
+    memory and the yielded blocks view it directly, in source order.
+    ``collate_fn`` and the samples must then be picklable. The pool starts
+    on the first iteration and is kept for later ones until :meth:`close`
+    (or until the dataset is garbage collected).
+    """
 
     def __init__(
         self,
         source: Callable[[], Iterable[object]] | Iterable[object],
         *,
         collate_fn: CollateFn = default_collate,
+        num_processes: int = 0,
+        chunk_size: int = 16,
     ) -> None:
+        if num_processes < 0:
+            raise ValueError("num_processes must be non-negative")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
         self._source = source
         self._collate_fn = collate_fn
+        self._num_processes = num_processes
+        self._chunk_size = chunk_size
+        self._pool: ProcessPoolExecutor | None = None
+        self._finalizer: weakref.finalize | None = None
 
     def __iter__(self) -> Iterator[BaseTimeSeries]:
-        iterable = self._source() if callable(self._source) else self._source
-        for sample in iterable:
+        if self._num_processes:
+            yield from self._iter_processes()
+            return
+        for sample in self.samples():
             yield self._collate_fn(sample)
+
+    def samples(self) -> Iterator[object]:
+        if self._num_processes:
+            # Samples are already decoded by the process pool.
+            return iter(self)
+        iterable = self._source() if callable(self._source) else self._source
+        return iter(iterable)
+
+    def collate(self, sample: object) -> BaseTimeSeries:
+        if self._num_processes:
+            return sample  # type: ignore[return-value]
+        return self._collate_fn(sample)
+
+    def close(self) -> None:
+        """Shut down the process pool; a later iteration starts a new one."""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._pool = self._finalizer = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self._num_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._finalizer = weakref.finalize(self, self._pool.shutdown, wait=True)
+        return self._pool
+
+    def _iter_processes(self) -> Iterator[BaseTimeSeries]:
+        iterable = self._source() if callable(self._source) else self._source
+        iterator = iter(iterable)
+        pending: deque[Future[PackedBlocks]] = deque()
+        max_pending = 2 * self._num_processes
+        pool = self._executor()
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    chunk = list(islice(iterator, self._chunk_size))
+                    if not chunk:
+                        exhausted = True
+                        break
+                    pending.append(pool.submit(_collate_chunk, self._collate_fn, chunk))
+                if not pending:
+                    return
+                yield from unpack_blocks(pending.popleft().result())
+        finally:
+            # Chunks already being decoded still own shared memory; wait for
+            # them and free it, leaving the pool to the next iteration.
+            for future in pending:
+                if not future.cancel() and future.exception() is None:
+                    discard_packed(future.result())
+
+
+def _collate_chunk(collate_fn: CollateFn, samples: list[object]) -> PackedBlocks:
+    return pack_blocks([collate_fn(sample) for sample in samples])
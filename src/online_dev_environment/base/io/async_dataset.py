@@ -0,0 +1,38 @@
+"""Asynchronous datasets for src_4th."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import AsyncIterable, AsyncIterator, Callable
+
+from ..data.base_data import BaseTimeSeries
+from .collate import CollateFn, default_collate
+
+
+class AsyncDataset(ABC):
+    """Blocks that arrive asynchronously, for example from sockets or queues.
+
+    Consumed by ``PipelineOrchestrator.arun``.
+    """
+
+    @abstractmethod
+    def __aiter__(self) -> AsyncIterator[BaseTimeSeries]:  # pragma: no cover - interface
+        ...
+
+
+class AsyncIterableDataset(AsyncDataset):
+    """Wrap an async iterable, or a callable returning one, and collate its samples."""
+
+    def __init__(
+        self,
+        source: Callable[[], AsyncIterable[object]] | AsyncIterable[object],
+        *,
+        collate_fn: CollateFn = default_collate,
+    ) -> None:
+        self._source = source
+        self._collate_fn = collate_fn
+
+    async def __aiter__(self) -> AsyncIterator[BaseTimeSeries]:
+        iterable = self._source() if callable(self._source) else self._source
+        async for sample in iterable:
+            yield self._collate_fn(sample)
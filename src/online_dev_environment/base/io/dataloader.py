@@ -2,21 +2,116 @@
 
 from __future__ import annotations
 
+import threading
 from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Full, Queue
 
 from ..data.base_data import BaseTimeSeries
 from .dataset import Dataset
 
+_DONE = object()
+_PUT_POLL_SECONDS = 0.05
+# How long closing the iterator waits for the producer thread.
+_STOP_SECONDS = 0.5
+
 
 class StreamDataLoader:
-    def __init__(self, dataset: Dataset, *, max_blocks: int | None = None) -> None:
+    """Iterate blocks from a dataset, optionally producing them ahead of time.
+
+    With ``prefetch=N`` a background thread reads samples from the dataset
+    into a queue holding at most ``N`` blocks. ``num_workers=k`` additionally
+    runs ``Dataset.collate`` on ``k`` threads. Blocks are always yielded in
+    dataset order, worker exceptions are re-raised in the consumer, and the
+    background threads stop when the consumer stops iterating. Closing does
+    not wait for a producer blocked inside the dataset: that daemon thread
+    exits once the dataset yields again.
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        *,
+        max_blocks: int | None = None,
+        prefetch: int = 0,
+        num_workers: int = 1,
+    ) -> None:
+        if prefetch < 0:
+            raise ValueError("prefetch must be non-negative")
+        if num_workers <= 0:
+            raise ValueError("num_workers must be positive")
         self._dataset = dataset
         self._max_blocks = max_blocks
+        self._num_workers = num_workers
+        self._prefetch = max(prefetch, num_workers) if num_workers > 1 else prefetch
 
     def __iter__(self) -> Iterator[BaseTimeSeries]:
+        if self._prefetch == 0:
+            yield from self._iter_inline()
+        else:
+            yield from self._iter_prefetch()
+
+    def _iter_inline(self) -> Iterator[BaseTimeSeries]:
         count = 0
         for block in self._dataset:
             if self._max_blocks is not None and count >= self._max_blocks:
                 return
             yield block
             count += 1
+
+    def _iter_prefetch(self) -> Iterator[BaseTimeSeries]:
+        queue: Queue[object] = Queue(maxsize=self._prefetch)
+        stop = threading.Event()
+        pool = (
+            ThreadPoolExecutor(self._num_workers, thread_name_prefix="StreamDataLoader")
+            if self._num_workers > 1
+            else None
+        )
+
+        def put(item: object) -> bool:
+            while not stop.is_set():
+                try:
+                    queue.put(item, timeout=_PUT_POLL_SECONDS)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            count = 0
+            try:
+                for sample in self._dataset.samples():
+                    if self._max_blocks is not None and count >= self._max_blocks:
+                        break
+                    if pool is not None:
+                        future = pool.submit(self._dataset.collate, sample)
+                    else:
+                        future = Future()
+                        try:
+                            future.set_result(self._dataset.collate(sample))
+                        except Exception as error:
+                            future.set_exception(error)
+                    if not put(future):
+                        return
+                    count += 1
+            except Exception as error:
+                failed: Future[BaseTimeSeries] = Future()
+                failed.set_exception(error)
+                put(failed)
+                return
+            put(_DONE)
+
+        producer = threading.Thread(target=produce, name="StreamDataLoader", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = queue.get()
+                if item is _DONE:
+                    return
+                assert isinstance(item, Future)
+                yield item.result()
+        finally:
+            stop.set()
+            producer.join(_STOP_SECONDS)
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import heapq
+import os
 from abc import ABC, abstractmethod
-from typing import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import numpy.typing as npt
 
 from ..data.base_data import BaseTimeSeries
+from ..data.channels import ChannelIndex
 
 
 class Dataset(ABC):
@@ -16,6 +23,17 @@ class Dataset(ABC):
     def __len__(self) -> int:
         raise TypeError("Dataset length not available")
 
+    def samples(self) -> Iterator[object]:
+        """Yield raw samples; :meth:`collate` turns each one into a block.
+
+        Loaders with background workers read samples on one thread and fan
+        ``collate`` out to the others. The default yields finished blocks.
+        """
+        return iter(self)
+
+    def collate(self, sample: object) -> BaseTimeSeries:
+        return sample  # type: ignore[return-value]
+
 
 class IterableDataset(Dataset):
     def __init__(self, blocks: Iterable[BaseTimeSeries]) -> None:
@@ -29,25 +47,210 @@ class IterableDataset(Dataset):
         return len(self._blocks)
 
 
+class MemmapDataset(Dataset):
+    """Replay a recording from disk as blocks that view a memory map.
+
+    ``path`` is either a ``.npy`` file or, when ``dtype`` is given, a raw
+    binary file of interleaved samples (``channels`` values per sample,
+    starting ``header_bytes`` into the file). Nothing is read until a block's
+    values are touched, and ``__len__`` only uses the file shape. The final
+    block may be shorter than ``block_size`` unless ``drop_last`` is set.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        sample_rate: float,
+        block_size: int,
+        dtype: npt.DTypeLike | None = None,
+        channels: int = 1,
+        header_bytes: int = 0,
+        start_time: datetime | None = None,
+        drop_last: bool = False,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        if sample_rate <= 0:
+            raise ValueError("sample_rate must be positive")
+        self._path = os.fspath(path)
+        if dtype is None:
+            array = np.load(self._path, mmap_mode="r")
+        else:
+            if channels <= 0:
+                raise ValueError("channels must be positive")
+            itemsize = np.dtype(dtype).itemsize * channels
+            samples = (os.path.getsize(self._path) - header_bytes) // itemsize
+            array = np.memmap(
+                self._path,
+                dtype=dtype,
+                mode="r",
+                offset=header_bytes,
+                shape=(samples, channels),
+            )
+        if array.ndim == 0:
+            raise ValueError("recording must be at least 1-D")
+        self._values = array
+        self._sample_rate = float(sample_rate)
+        self._block_size = block_size
+        self._start_time = start_time or datetime.fromtimestamp(0, tz=timezone.utc)
+        self._drop_last = drop_last
+        self._metadata = dict(metadata or {})
+
+    def __len__(self) -> int:
+        samples = self._values.shape[0]
+        if self._drop_last:
+            return samples // self._block_size
+        return -(-samples // self._block_size)
+
+    def __iter__(self) -> Iterator[BaseTimeSeries]:
+        for index in range(len(self)):
+            start = index * self._block_size
+            yield BaseTimeSeries(
+                values=self._values[start : start + self._block_size],
+                sample_rate=self._sample_rate,
+                timestamp=self._start_time + timedelta(seconds=start / self._sample_rate),
+                metadata={**self._metadata, "source": self._path, "sample_offset": start},
+            )
+
+
 class MultiSensorDataset(Dataset):
-    """Dataset that combines multiple sensor iterables into synchronized samples."""
+    """Merge per-sensor block streams into time-aligned multi-sensor blocks.
 
-    def __init__(self, sensors: dict[str, Iterable[BaseTimeSeries]]) -> None:
+    Blocks are merged in start-time order through a heap that holds one
+    pending block per sensor, so the cost is O(log sensors) per block and
+    memory per sensor stays bounded. Each group starts at the earliest
+    pending block, ``t0``:
+
+    * by default a group takes, per sensor, the next block starting within
+      ``tolerance`` seconds of ``t0``;
+    * with ``window`` set, it takes every block starting in
+      ``[t0, t0 + window)``, at most ``lookahead`` per sensor, and
+      concatenates them, so sensors with different rates and block sizes
+      line up.
+
+    Groups missing a sensor are skipped and iteration stops once a sensor is
+    exhausted, unless ``partial=True``. Per-sensor blocks are stored in
+    ``metadata["sensors"]``; the combined block carries the values of the
+    first sensor present and the timestamp ``t0``.
+
+    With ``packed=True`` the combined block instead holds every sensor in one
+    ``(samples, channels)`` array, sensors side by side, and a
+    :class:`ChannelIndex` in ``metadata["channels"]``. All sensors in a group
+    must then have the same number of samples.
+    """
+
+    def __init__(
+        self,
+        sensors: dict[str, Iterable[BaseTimeSeries]],
+        *,
+        tolerance: float = 0.0,
+        window: float | None = None,
+        lookahead: int = 16,
+        partial: bool = False,
+        packed: bool = False,
+    ) -> None:
+        if tolerance < 0:
+            raise ValueError("tolerance must be non-negative")
+        if window is not None and window <= 0:
+            raise ValueError("window must be positive")
+        if lookahead <= 0:
+            raise ValueError("lookahead must be positive")
         self._sensors = sensors
+        self._tolerance = timedelta(seconds=tolerance)
+        self._window = None if window is None else timedelta(seconds=window)
+        self._lookahead = lookahead if window is not None else 1
+        self._partial = partial
+        self._packed = packed
 
     def __iter__(self) -> Iterator[BaseTimeSeries]:
-        iterators = {key: iter(blocks) for key, blocks in self._sensors.items()}
-        while True:
-            sample: dict[str, BaseTimeSeries] = {}
-            for key, iterator in iterators.items():
-                try:
-                    sample[key] = next(iterator)
-                except StopIteration:
-                    return
-            first = next(iter(sample.values()))
-            yield BaseTimeSeries(
-                values=first.values,
-                sample_rate=first.sample_rate,
-                timestamp=first.timestamp,
-                metadata={"sensors": sample},
+        keys = list(self._sensors)
+        iterators = [iter(self._sensors[key]) for key in keys]
+        heap: list[tuple[datetime, int, BaseTimeSeries]] = []
+
+        def advance(order: int) -> bool:
+            block = next(iterators[order], None)
+            if block is None:
+                return False
+            heapq.heappush(heap, (block.timestamp, order, block))
+            return True
+
+        indexes: dict[tuple[tuple[str, int], ...], ChannelIndex] = {}
+        exhausted = not all([advance(order) for order in range(len(keys))])
+        if exhausted and not self._partial:
+            return
+
+        while heap:
+            start = heap[0][0]
+            members: dict[int, list[BaseTimeSeries]] = {}
+            deferred = []
+            while heap and self._in_group(heap[0][0], start):
+                entry = heapq.heappop(heap)
+                blocks = members.setdefault(entry[1], [])
+                if len(blocks) >= self._lookahead:
+                    deferred.append(entry)
+                    continue
+                blocks.append(entry[2])
+                if not advance(entry[1]):
+                    exhausted = True
+            for entry in deferred:
+                heapq.heappush(heap, entry)
+
+            if len(members) == len(keys) or self._partial:
+                sample = {keys[order]: _merge(members[order]) for order in sorted(members)}
+                if self._packed:
+                    yield _pack(sample, start, indexes)
+                else:
+                    first = next(iter(sample.values()))
+                    yield BaseTimeSeries(
+                        values=first.values,
+                        sample_rate=first.sample_rate,
+                        timestamp=start,
+                        metadata={"sensors": sample},
+                    )
+            if exhausted and not self._partial:
+                return
+
+    def _in_group(self, timestamp: datetime, start: datetime) -> bool:
+        if self._window is None:
+            return timestamp <= start + self._tolerance
+        return timestamp < start + self._window
+
+
+def _merge(blocks: list[BaseTimeSeries]) -> BaseTimeSeries:
+    first = blocks[0]
+    if len(blocks) == 1:
+        return first
+    return first.copy_with(
+        values=np.concatenate([block.values for block in blocks], axis=0),
+        metadata={**first.metadata, "merged_blocks": len(blocks)},
+    )
+
+
+def _pack(
+    sample: dict[str, BaseTimeSeries],
+    start: datetime,
+    indexes: dict[tuple[tuple[str, int], ...], ChannelIndex],
+) -> BaseTimeSeries:
+    first = next(iter(sample.values()))
+    samples = first.block_size
+    columns = []
+    for sensor, block in sample.items():
+        if block.block_size != samples:
+            raise ValueError(
+                f"packed blocks need equal sample counts; sensor '{sensor}' has "
+                f"{block.block_size}, expected {samples}"
             )
+        columns.append(block.values.reshape(samples, -1))
+    # Groups usually repeat one layout, so the index is built once and shared.
+    layout = tuple((sensor, column.shape[1]) for sensor, column in zip(sample, columns))
+    index = indexes.get(layout)
+    if index is None:
+        index = indexes[layout] = ChannelIndex.from_widths(layout)
+    return BaseTimeSeries(
+        values=np.concatenate(columns, axis=1),
+        sample_rate=first.sample_rate,
+        timestamp=start,
+        metadata={"channels": index},
+    )
@@ -0,0 +1,228 @@
+"""Chunked binary recordings of BaseTimeSeries streams for src_4th.
+
+File layout (all integers little-endian)::
+
+    b"ODEREC01"
+    record*            one per block, written in chunks
+    index              only after a clean close
+    trailer            index offset + b"ODRECEND"
+
+Each record is a fixed head (magic, header length, payload length, CRC32),
+a JSON header (dtype, shape, sample_rate, timestamp_ns, metadata), padding
+to a 64-byte file offset, and the raw C-ordered sample bytes. Records are
+self-describing, so a file without index, for example after a crash, is
+recovered by scanning until the first truncated or corrupt record.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import numpy as np
+
+from ..data.base_data import BaseTimeSeries
+from .dataset import Dataset
+
+_FILE_MAGIC = b"ODEREC01"
+_RECORD_MAGIC = b"BLK0"
+_INDEX_MAGIC = b"IDX0"
+_END_MAGIC = b"ODRECEND"
+_RECORD_HEAD = struct.Struct("<4sIQI")
+_INDEX_HEAD = struct.Struct("<4sQ")
+_TRAILER = struct.Struct("<Q8s")
+_INDEX_ENTRY = np.dtype([("offset", "<u8"), ("timestamp_ns", "<i8")])
+_ALIGNMENT = 64
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _to_ns(timestamp: datetime) -> int:
+    delta = timestamp - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def _from_ns(timestamp_ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=timestamp_ns // 1_000)
+
+
+class RecordingWriter:
+    """Append blocks to a new recording file.
+
+    Records are buffered in memory and written once ``chunk_bytes`` have
+    accumulated (and on :meth:`flush`/:meth:`close`), optionally followed by
+    ``os.fsync``. A crash therefore loses at most the chunk being buffered.
+    Block metadata must be JSON-serialisable.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        chunk_bytes: int = 1 << 20,
+        fsync: bool = False,
+    ) -> None:
+        if chunk_bytes <= 0:
+            raise ValueError("chunk_bytes must be positive")
+        self._file = open(path, "xb")
+        self._file.write(_FILE_MAGIC)
+        self._chunk_bytes = chunk_bytes
+        self._fsync = fsync
+        self._pending = bytearray()
+        self._offset = len(_FILE_MAGIC)
+        self._index: list[tuple[int, int]] = []
+        # Without the magic on disk a crash would leave an unreadable file.
+        self.flush()
+
+    def __enter__(self) -> "RecordingWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def append(self, block: BaseTimeSeries) -> None:
+        values = np.ascontiguousarray(block.values)
+        timestamp_ns = _to_ns(block.timestamp)
+        header = json.dumps(
+            {
+                "dtype": values.dtype.str,
+                "shape": list(values.shape),
+                "sample_rate": block.sample_rate,
+                "timestamp_ns": timestamp_ns,
+                "metadata": block.metadata,
+            },
+            separators=(",", ":"),
+        ).encode()
+        payload = values.tobytes()
+        crc = zlib.crc32(payload, zlib.crc32(header))
+
+        record_offset = self._offset
+        payload_offset = _align(record_offset + _RECORD_HEAD.size + len(header))
+        padding = payload_offset - (record_offset + _RECORD_HEAD.size + len(header))
+        self._pending += _RECORD_HEAD.pack(_RECORD_MAGIC, len(header), len(payload), crc)
+        self._pending += header
+        self._pending += bytes(padding)
+        self._pending += payload
+        self._offset = payload_offset + len(payload)
+        self._index.append((record_offset, timestamp_ns))
+        if len(self._pending) >= self._chunk_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending.clear()
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        index = np.array(self._index, dtype=_INDEX_ENTRY)
+        self._file.write(_INDEX_HEAD.pack(_INDEX_MAGIC, len(index)))
+        self._file.write(index.tobytes())
+        self._file.write(_TRAILER.pack(self._offset, _END_MAGIC))
+        self.flush()
+        self._file.close()
+
+
+class RecordingReader(Dataset):
+    """Replay a recording written by :class:`RecordingWriter`.
+
+    The file is memory-mapped and block values are read-only views into it.
+    Iteration starts at the block chosen by :meth:`seek` (the first block by
+    default). Blocks are expected in non-decreasing timestamp order. A file
+    shorter than the file magic, left by a writer that crashed while
+    opening, is an empty recording.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = os.fspath(path)
+        if os.path.getsize(self._path) < len(_FILE_MAGIC):
+            with open(self._path, "rb") as file:
+                head = file.read()
+            if not _FILE_MAGIC.startswith(head):
+                raise ValueError(f"{self._path} is not a recording")
+            self._map = np.zeros(0, dtype=np.uint8)
+        else:
+            self._map = np.memmap(self._path, dtype=np.uint8, mode="r")
+            if bytes(self._map[: len(_FILE_MAGIC)]) != _FILE_MAGIC:
+                raise ValueError(f"{self._path} is not a recording")
+        index = self._read_index()
+        self._offsets = [int(offset) for offset in index["offset"]]
+        self._timestamps_ns = [int(ts) for ts in index["timestamp_ns"]]
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[BaseTimeSeries]:
+        for index in range(self._position, len(self._offsets)):
+            yield self.block(index)
+
+    def seek(self, timestamp: datetime) -> int:
+        """Start iteration at the block covering ``timestamp``; return its index."""
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        self._position = max(bisect_right(self._timestamps_ns, _to_ns(timestamp)) - 1, 0)
+        return self._position
+
+    def block(self, index: int) -> BaseTimeSeries:
+        offset = self._offsets[index]
+        _, header_len, payload_len, _ = _RECORD_HEAD.unpack_from(self._map, offset)
+        header_start = offset + _RECORD_HEAD.size
+        header = json.loads(bytes(self._map[header_start : header_start + header_len]))
+        payload_offset = _align(header_start + header_len)
+        payload = self._map[payload_offset : payload_offset + payload_len]
+        return BaseTimeSeries(
+            values=payload.view(header["dtype"]).reshape(header["shape"]),
+            sample_rate=header["sample_rate"],
+            timestamp=_from_ns(header["timestamp_ns"]),
+            metadata=header["metadata"],
+        )
+
+    def _read_index(self) -> np.ndarray:
+        size = self._map.shape[0]
+        if size >= len(_FILE_MAGIC) + _INDEX_HEAD.size + _TRAILER.size:
+            index_offset, magic = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+            if magic == _END_MAGIC and index_offset + _INDEX_HEAD.size <= size:
+                index_magic, count = _INDEX_HEAD.unpack_from(self._map, index_offset)
+                start = index_offset + _INDEX_HEAD.size
+                end = start + count * _INDEX_ENTRY.itemsize
+                if index_magic == _INDEX_MAGIC and end == size - _TRAILER.size:
+                    return self._map[start:end].view(_INDEX_ENTRY)
+        return self._scan()
+
+    def _scan(self) -> np.ndarray:
+        """Rebuild the index from records, stopping at the first bad one."""
+        size = self._map.shape[0]
+        entries: list[tuple[int, int]] = []
+        offset = len(_FILE_MAGIC)
+        while offset + _RECORD_HEAD.size <= size:
+            magic, header_len, payload_len, crc = _RECORD_HEAD.unpack_from(self._map, offset)
+            header_start = offset + _RECORD_HEAD.size
+            payload_offset = _align(header_start + header_len)
+            end = payload_offset + payload_len
+            if magic != _RECORD_MAGIC or end > size:
+                break
+            header = self._map[header_start : header_start + header_len]
+            payload = self._map[payload_offset:end]
+            if zlib.crc32(payload, zlib.crc32(header)) != crc:
+                break
+            entries.append((offset, json.loads(bytes(header))["timestamp_ns"]))
+            offset = end
+        return np.array(entries, dtype=_INDEX_ENTRY)
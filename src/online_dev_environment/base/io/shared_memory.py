@@ -0,0 +1,198 @@
+"""Shared-memory transport for blocks crossing process boundaries."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Sequence
+
+import numpy as np
+
+from ..data.base_data import BaseTimeSeries
+
+_ALIGNMENT = 64
+
+
+@dataclass(frozen=True, slots=True)
+class BlockHeader:
+    """Everything about a block except its samples, which live in a segment."""
+
+    shape: tuple[int, ...]
+    dtype: str
+    offset: int
+    sample_rate: float
+    timestamp: datetime
+    metadata: dict[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class PackedBlocks:
+    """Picklable handle to blocks whose values were written to a segment."""
+
+    segment: str | None
+    headers: tuple[BlockHeader, ...]
+
+
+class _MappedSegment:
+    """Keep an attached segment mapped for as long as any array views it.
+
+    Arrays built on this object hold it as their base; the mapping is closed
+    once the last of them is released. The name is unlinked on attach, so the
+    segment is freed by the OS when the mapping goes away.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._shm = SharedMemory(name=name)
+        self._shm.unlink()
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return self._shm.buf
+
+    def __del__(self) -> None:
+        self._shm.close()
+
+
+class BlockRing:
+    """Fixed-size shared-memory slots for handing blocks to another process.
+
+    The creating process writes blocks into a slot with :meth:`write` and
+    passes the returned headers along; the other process attaches by
+    ``name`` and gets read-only views with :meth:`read`. Which slots are in
+    use is up to the caller: a slot must not be rewritten while views into
+    it are still needed.
+    """
+
+    def __init__(self, slots: int, slot_bytes: int, *, name: str | None = None) -> None:
+        if slots <= 0 or slot_bytes <= 0:
+            raise ValueError("slots and slot_bytes must be positive")
+        self.slots = slots
+        self.slot_bytes = -(-slot_bytes // _ALIGNMENT) * _ALIGNMENT
+        self._owner = name is None
+        if name is None:
+            self._shm = SharedMemory(create=True, size=slots * self.slot_bytes)
+        else:
+            self._shm = SharedMemory(name=name)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def holds(self, values: np.ndarray) -> bool:
+        """Whether ``values`` may point into this ring's segment."""
+        segment = np.frombuffer(self._shm.buf, dtype=np.uint8)
+        return bool(np.may_share_memory(values, segment))
+
+    def write(self, slot: int, blocks: Sequence[BaseTimeSeries]) -> tuple[BlockHeader, ...] | None:
+        """Copy block values into ``slot``; ``None`` if they do not fit."""
+        offsets = []
+        total = 0
+        for block in blocks:
+            offsets.append(total)
+            total += -(-block.values.nbytes // _ALIGNMENT) * _ALIGNMENT
+        if total > self.slot_bytes:
+            return None
+        base = slot * self.slot_bytes
+        for block, offset in zip(blocks, offsets):
+            target = np.ndarray(
+                block.values.shape,
+                dtype=block.values.dtype,
+                buffer=self._shm.buf,
+                offset=base + offset,
+            )
+            target[...] = block.values
+        return tuple(_header(block, offset) for block, offset in zip(blocks, offsets))
+
+    def read(self, slot: int, headers: Sequence[BlockHeader]) -> list[BaseTimeSeries]:
+        base = slot * self.slot_bytes
+        return [
+            BaseTimeSeries(
+                values=np.ndarray(
+                    header.shape,
+                    dtype=header.dtype,
+                    buffer=self._shm.buf,
+                    offset=base + header.offset,
+                ),
+                sample_rate=header.sample_rate,
+                timestamp=header.timestamp,
+                metadata=header.metadata,
+            )
+            for header in headers
+        ]
+
+    def close(self) -> None:
+        """Detach, and free the segment if this process created it."""
+        try:
+            self._shm.close()
+        except BufferError:  # pragma: no cover - views still alive; freed with them
+            pass
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
+
+
+def pack_blocks(blocks: Sequence[BaseTimeSeries]) -> PackedBlocks:
+    """Copy block values into one new shared-memory segment."""
+    offsets = []
+    total = 0
+    for block in blocks:
+        offsets.append(total)
+        total += -(-block.values.nbytes // _ALIGNMENT) * _ALIGNMENT
+    if total == 0:
+        return PackedBlocks(None, tuple(_header(b, 0) for b in blocks))
+
+    shm = SharedMemory(create=True, size=total)
+    try:
+        for block, offset in zip(blocks, offsets):
+            target = np.ndarray(
+                block.values.shape, dtype=block.values.dtype, buffer=shm.buf, offset=offset
+            )
+            target[...] = block.values
+            del target
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return PackedBlocks(shm.name, tuple(_header(b, o) for b, o in zip(blocks, offsets)))
+
+
+def unpack_blocks(packed: PackedBlocks) -> list[BaseTimeSeries]:
+    """Rebuild blocks whose values are views into the packed segment."""
+    segment = _MappedSegment(packed.segment) if packed.segment is not None else None
+    blocks = []
+    for header in packed.headers:
+        if segment is None:
+            values = np.empty(header.shape, dtype=header.dtype)
+        else:
+            values = np.ndarray(
+                header.shape, dtype=header.dtype, buffer=segment, offset=header.offset
+            )
+        blocks.append(
+            BaseTimeSeries(
+                values=values,
+                sample_rate=header.sample_rate,
+                timestamp=header.timestamp,
+                metadata=header.metadata,
+            )
+        )
+    return blocks
+
+
+def discard_packed(packed: PackedBlocks) -> None:
+    """Free a packed segment that will never be unpacked."""
+    if packed.segment is not None:
+        shm = SharedMemory(name=packed.segment)
+        shm.close()
+        shm.unlink()
+
+
+def _header(block: BaseTimeSeries, offset: int) -> BlockHeader:
+    return BlockHeader(
+        shape=tuple(block.values.shape),
+        dtype=block.values.dtype.str,
+        offset=offset,
+        sample_rate=block.sample_rate,
+        timestamp=block.timestamp,
+        metadata=block.metadata,
+    )
@@ -2,16 +2,44 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable
+import copy
+import math
+from datetime import timedelta
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable
 
 import numpy as np
+import numpy.typing as npt
+from numpy.lib.stride_tricks import as_strided
 
-from .data import BaseTimeSeries
+from .data import BaseTimeSeries, BlockBatch, ChannelIndex, RingBuffer
 
 
 class ProcessingNode:
-    def __init__(self, name: str | None = None) -> None:
+    """Base class for pipeline nodes.
+
+    ``dtype`` is the node's output dtype policy. ``None`` leaves the choice to
+    the node (and lets ``PipelineBuilder(dtype=...)`` fill it in); built-in
+    nodes never upcast float32 inputs on their own.
+
+    Nodes write their outputs into arrays from :meth:`buffer`. Those are
+    fresh arrays unless the orchestrator has called :meth:`release_buffers`,
+    which it only does for ``run(view=True)``.
+    """
+
+    #: Stateless nodes that implement :meth:`process_batch` set this so the
+    #: orchestrator can run them once over several stacked blocks.
+    batchable: bool = False
+    #: CPU-heavy nodes set this so ``PipelineOrchestrator.arun`` runs them on
+    #: an executor instead of the event loop.
+    offload: bool = False
+
+    def __init__(self, name: str | None = None, *, dtype: npt.DTypeLike | None = None) -> None:
         self.name = name or self.__class__.__name__
+        self.dtype: np.dtype | None = None if dtype is None else np.dtype(dtype)
+        self._buffers: Dict[str, np.ndarray] = {}
+        # Names handed out by buffer() since the last release_buffers().
+        self._lent: set[str] = set()
 
     def requires(self) -> Iterable[str]:
         return []
@@ -22,13 +50,104 @@ class ProcessingNode:
     def reset(self) -> None:
         return
 
+    def signature(self) -> Hashable | None:
+        """Configuration under which two nodes are interchangeable, or ``None``.
+
+        Key names are left out: nodes with equal signatures fed the same
+        inputs must produce the same outputs, in ``produces()`` order, so the
+        plan can run one of them and alias the other's output keys. A
+        subclass that does not define ``signature`` itself is never merged,
+        since the inherited one may not cover its extra configuration.
+        """
+        return None
+
+    def with_dtype(self, dtype: npt.DTypeLike) -> "ProcessingNode":
+        """Copy of this node with ``dtype`` as its policy, sharing no state with it."""
+        node = copy.deepcopy(self)
+        node.dtype = np.dtype(dtype)
+        return node
+
+    def buffer(self, name: str, shape: tuple[int, ...], dtype: npt.DTypeLike) -> np.ndarray:
+        """Uninitialised array of ``shape`` and ``dtype`` for this block.
+
+        The array last returned for ``name`` is handed back when its shape
+        and dtype match and :meth:`release_buffers` has been called since it
+        was returned. Otherwise a new array is allocated, so by default every
+        output is a fresh array a caller may keep.
+        """
+        buffers = self._buffers
+        buffer = buffers.get(name)
+        if (
+            buffer is not None
+            and name not in self._lent
+            and buffer.shape == shape
+            and buffer.dtype == dtype
+        ):
+            self._lent.add(name)
+            return buffer
+        buffer = buffers[name] = np.empty(shape, dtype)
+        self._lent.add(name)
+        return buffer
+
+    def release_buffers(self) -> None:
+        """Let :meth:`buffer` hand back the arrays it has returned so far.
+
+        Only call this when nothing reads those arrays any more.
+        """
+        self._lent.clear()
+
+    def state_nbytes(self) -> int:
+        """Bytes this node keeps between blocks.
+
+        The base class counts the arrays held by :meth:`buffer`; nodes that
+        carry samples or other arrays across blocks add those.
+        """
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
     def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
         raise NotImplementedError
 
+    def process_batch(self, inputs: Dict[str, BlockBatch]) -> Dict[str, BlockBatch]:
+        """Process stacked blocks at once; must match per-block :meth:`process`."""
+        raise NotImplementedError
+
+
+def _batch_axes(batch: BlockBatch) -> tuple[int, ...]:
+    return tuple(range(1, batch.values.ndim))
+
+
+def _float_dtype(policy: np.dtype | None, input_dtype: np.dtype) -> np.dtype:
+    """dtype for float results: the policy, else float32/float64 inputs as-is, else float64."""
+    if policy is not None:
+        return policy
+    if input_dtype == np.float32 or input_dtype == np.float64:
+        return input_dtype
+    return np.dtype(np.float64)
+
+
+def _as_dtype(values: np.ndarray, dtype: np.dtype | None) -> np.ndarray:
+    return values if dtype is None else values.astype(dtype, copy=False)
+
 
 class NormalizerNode(ProcessingNode):
-    def __init__(self, key_in: str, key_out: str | None = None, *, eps: float = 1e-9) -> None:
-        super().__init__()
+    """Scale blocks by their peak absolute value.
+
+    Packed blocks (``metadata["channels"]``) are scaled per sensor, so one
+    node normalizes every sensor at once; ``scale`` is then an array with
+    one entry per sensor.
+    """
+
+    batchable = True
+
+    def __init__(
+        self,
+        key_in: str,
+        key_out: str | None = None,
+        *,
+        eps: float = 1e-9,
+        dtype: npt.DTypeLike | None = None,
+    ) -> None:
+        super().__init__(dtype=dtype)
         self._key_in = key_in
         self._key_out = key_out or f"{key_in}_norm"
         self._eps = eps
@@ -39,25 +158,192 @@ class NormalizerNode(ProcessingNode):
     def produces(self) -> Iterable[str]:
         return [self._key_out]
 
+    def signature(self) -> Hashable | None:
+        return (type(self), self._eps, self.dtype)
+
     def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
         block = inputs[self._key_in]
-        peak = np.max(np.abs(block.values))
+        values = block.values
+        dtype = _float_dtype(self.dtype, values.dtype)
+        channels = block.metadata.get("channels")
+        if channels is not None:
+            divisor, scales = self._sensor_divisor(values, channels, axis=0)
+            scaled = self.buffer(self._key_out, values.shape, dtype)
+            np.divide(values, divisor, out=scaled, dtype=dtype)
+            metadata = {**block.metadata, "scale": scales}
+            return {self._key_out: block.copy_with(values=scaled, metadata=metadata)}
+        # Two reductions instead of max(abs(values)), which needs a temporary.
+        peak = max(abs(values.max()), abs(values.min()))
         if peak < self._eps:
-            return {self._key_out: block}
-        scaled = block.values / peak
+            if values.dtype == dtype:
+                return {self._key_out: block}
+            return {self._key_out: block.copy_with(values=values.astype(dtype))}
+        scaled = self.buffer(self._key_out, values.shape, dtype)
+        np.divide(values, peak, out=scaled, dtype=dtype)
         metadata = {**block.metadata, "scale": float(1.0 / peak)}
         return {self._key_out: block.copy_with(values=scaled, metadata=metadata)}
 
+    def process_batch(self, inputs: Dict[str, BlockBatch]) -> Dict[str, BlockBatch]:
+        batch = inputs[self._key_in]
+        channels = batch.metadata[0].get("channels")
+        if channels is not None:
+            divisor, scales = self._sensor_divisor(batch.values, channels, axis=1)
+            scaled = np.divide(
+                batch.values, divisor, dtype=_float_dtype(self.dtype, batch.values.dtype)
+            )
+            metadata = [{**meta, "scale": scale} for meta, scale in zip(batch.metadata, scales)]
+            return {self._key_out: batch.copy_with(values=scaled, metadata=metadata)}
+        axes = _batch_axes(batch)
+        peaks = np.max(np.abs(batch.values), axis=axes)
+        quiet = peaks < self._eps
+        divisor = np.where(quiet, 1, peaks).reshape(-1, *([1] * len(axes)))
+        metadata = [
+            meta if is_quiet else {**meta, "scale": float(1.0 / peak)}
+            for meta, is_quiet, peak in zip(batch.metadata, quiet, peaks)
+        ]
+        scaled = np.divide(batch.values, divisor, dtype=_float_dtype(self.dtype, batch.values.dtype))
+        return {self._key_out: batch.copy_with(values=scaled, metadata=metadata)}
+
+    def _sensor_divisor(
+        self, values: np.ndarray, channels: ChannelIndex, axis: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Per-column divisor over the sample ``axis`` and per-sensor scales."""
+        column_peaks = np.maximum(np.abs(values.max(axis=axis)), np.abs(values.min(axis=axis)))
+        peaks = np.maximum.reduceat(column_peaks, channels.offsets[:-1], axis=-1)
+        quiet = peaks < self._eps
+        divisors = np.where(quiet, 1, peaks)
+        columns = np.repeat(divisors, channels.widths, axis=-1)
+        return np.expand_dims(columns, axis), 1.0 / divisors
+
+
+def _frames(values: np.ndarray, length: int, hop: int, count: int) -> np.ndarray:
+    """Read-only ``(count, length, ...)`` view of frames starting every ``hop`` rows.
+
+    Same result as ``sliding_window_view(values, length, axis=0)[::hop]`` with
+    the frame axis moved to position 1, at a fraction of its call overhead.
+    """
+    if (count - 1) * hop + length > values.shape[0]:
+        raise ValueError("frames exceed the available samples")
+    if count == 1:
+        frame = values[np.newaxis, :length]
+        frame.flags.writeable = False
+        return frame
+    step = values.strides[0]
+    return as_strided(
+        values,
+        shape=(count, length, *values.shape[1:]),
+        strides=(hop * step, *values.strides),
+        writeable=False,
+    )
+
+
+def _trailing_mean(
+    values: np.ndarray,
+    window: int,
+    start: int,
+    dtype: np.dtype,
+    *,
+    out: np.ndarray | None = None,
+    scratch: np.ndarray | None = None,
+) -> np.ndarray:
+    """Mean of up to ``window`` trailing samples for every row from ``start``.
+
+    Sums accumulate in float64 (in ``scratch`` if given) so long blocks stay
+    accurate; only the returned means, written to ``out`` if given, have
+    ``dtype``.
+    """
+    count = values.shape[0]
+    csum = np.cumsum(values, axis=0, dtype=np.float64, out=scratch)
+    if out is None:
+        out = np.empty((count - start, *values.shape[1:]), dtype=dtype)
+    means = out
+    split = min(max(window - 1, start), count)
+    if split > start:
+        counts = np.arange(start + 1, split + 1, dtype=np.float64)
+        counts = counts.reshape(-1, *([1] * (values.ndim - 1)))
+        np.divide(csum[start:split], counts, out=means[: split - start])
+    if split < count:
+        full = means[split - start :]
+        first = max(split, window)
+        np.subtract(csum[first:], csum[first - window : count - window], out=full[first - split :])
+        full[: first - split] = csum[split:first]
+        full /= window
+    return means
+
+
+class _Carry:
+    """Samples carried between blocks, kept at the front of a reusable array."""
+
+    def __init__(self) -> None:
+        self._data: np.ndarray | None = None
+        self.held = 0
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self._data is None else self._data.nbytes
+
+    def clear(self) -> None:
+        self._data = None
+        self.held = 0
+
+    def extend(self, values: np.ndarray) -> np.ndarray:
+        """The carried samples followed by ``values``, as one array."""
+        held = self.held
+        if not held:
+            return values
+        data = self._data
+        assert data is not None
+        total = held + len(values)
+        if total > len(data) or data.dtype != values.dtype or data.shape[1:] != values.shape[1:]:
+            data = self._data = np.concatenate([data[:held], values], axis=0)
+            return data
+        data[held:total] = values
+        return data[:total]
+
+    def keep(self, extended: np.ndarray, start: int) -> None:
+        """Carry ``extended[start:]`` into the next block."""
+        count = len(extended) - start
+        data = self._data
+        if (
+            data is None
+            or count > len(data)
+            or data.dtype != extended.dtype
+            or data.shape[1:] != extended.shape[1:]
+        ):
+            self._data = extended[start:].copy()
+        else:
+            data[:count] = extended[start:]
+        self.held = count
+
 
 class MovingAverageNode(ProcessingNode):
-    def __init__(self, key_in: str, key_out: str | None = None, *, window: int = 5) -> None:
+    """Trailing moving average over ``window`` samples.
+
+    By default every block is smoothed on its own and the first
+    ``window - 1`` outputs repeat the first full average. With
+    ``streaming=True`` the node keeps the last ``window - 1`` input samples
+    between blocks so the output is continuous across block boundaries;
+    until a full window has been seen, outputs average the samples so far.
+    """
+
+    def __init__(
+        self,
+        key_in: str,
+        key_out: str | None = None,
+        *,
+        window: int = 5,
+        streaming: bool = False,
+        dtype: npt.DTypeLike | None = None,
+    ) -> None:
         if window <= 0:
             raise ValueError("window must be positive")
-        super().__init__()
+        super().__init__(dtype=dtype)
         self._key_in = key_in
         self._key_out = key_out or f"{key_in}_ma{window}"
         self._window = window
-        self._kernel = np.ones(window, dtype=np.float64) / window
+        self._streaming = streaming
+        self._history = _Carry()
+        self.batchable = not streaming
 
     def requires(self) -> Iterable[str]:
         return [self._key_in]
@@ -65,26 +351,82 @@ class MovingAverageNode(ProcessingNode):
     def produces(self) -> Iterable[str]:
         return [self._key_out]
 
+    def signature(self) -> Hashable | None:
+        return (type(self), self._window, self._streaming, self.dtype)
+
+    def reset(self) -> None:
+        self._history.clear()
+
+    def state_nbytes(self) -> int:
+        return super().state_nbytes() + self._history.nbytes
+
     def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
         block = inputs[self._key_in]
+        dtype = _float_dtype(self.dtype, block.values.dtype)
+        if self._streaming:
+            smoothed = self._process_streaming(block.values, dtype)
+            return {self._key_out: block.copy_with(values=smoothed)}
         if block.values.shape[0] < self._window:
-            return {self._key_out: block}
-        convolved = np.apply_along_axis(
-            lambda m: np.convolve(m, self._kernel, mode="valid"),
-            axis=0,
-            arr=block.values,
+            if block.values.dtype == dtype:
+                return {self._key_out: block}
+            return {self._key_out: block.copy_with(values=block.values.astype(dtype))}
+        smoothed = self._smooth(
+            block.values,
+            dtype,
+            out=self.buffer(self._key_out, block.values.shape, dtype),
+            scratch=self.buffer("csum", block.values.shape, np.float64),
         )
-        pad = block.values.shape[0] - convolved.shape[0]
-        if pad > 0:
-            prefix = np.repeat(convolved[0:1], pad, axis=0)
-            smoothed = np.vstack([prefix, convolved])
-        else:
-            smoothed = convolved
         return {self._key_out: block.copy_with(values=smoothed)}
 
+    def process_batch(self, inputs: Dict[str, BlockBatch]) -> Dict[str, BlockBatch]:
+        batch = inputs[self._key_in]
+        dtype = _float_dtype(self.dtype, batch.values.dtype)
+        if batch.values.shape[1] < self._window:
+            return {self._key_out: batch.copy_with(values=_as_dtype(batch.values, dtype))}
+        # Put samples first; the batch axis then behaves like extra channels.
+        smoothed = self._smooth(np.moveaxis(batch.values, 0, 1), dtype)
+        return {self._key_out: batch.copy_with(values=np.moveaxis(smoothed, 1, 0))}
+
+    def _smooth(
+        self,
+        values: np.ndarray,
+        dtype: np.dtype,
+        out: np.ndarray | None = None,
+        scratch: np.ndarray | None = None,
+    ) -> np.ndarray:
+        if out is None:
+            out = np.empty(values.shape, dtype=dtype)
+        pad = self._window - 1
+        _trailing_mean(values, self._window, pad, dtype, out=out[pad:], scratch=scratch)
+        out[:pad] = out[pad]
+        return out
+
+    def _process_streaming(self, values: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        start = self._history.held
+        extended = self._history.extend(values)
+        smoothed = _trailing_mean(
+            extended,
+            self._window,
+            start,
+            dtype,
+            out=self.buffer(self._key_out, values.shape, dtype),
+            scratch=self.buffer("csum", extended.shape, np.float64),
+        )
+        self._history.keep(extended, max(extended.shape[0] - (self._window - 1), 0))
+        return smoothed
+
 
 class SlidingWindowNode(ProcessingNode):
-    """Accumulate samples until a time window is full, then emit with hop."""
+    """Accumulate samples and emit every complete window, ``hop`` apart.
+
+    Each input block yields all windows it completes as one
+    ``(windows, window_samples, channels...)`` block: read-only strided
+    views into a :class:`RingBuffer` holding about ``window + hop`` samples,
+    so memory stays bounded however long the input blocks are. The output
+    keeps the input sample rate (of axis 1) and is stamped with the first
+    window's start; ``metadata["window_offsets"]`` is a ``range`` of each
+    window's start as a sample index since the last reset.
+    """
 
     def __init__(
         self,
@@ -93,18 +435,23 @@ class SlidingWindowNode(ProcessingNode):
         *,
         window_seconds: float,
         hop_seconds: float,
+        dtype: npt.DTypeLike | None = None,
     ) -> None:
-        super().__init__()
+        super().__init__(dtype=dtype)
         if window_seconds <= 0 or hop_seconds <= 0:
             raise ValueError("window_seconds and hop_seconds must be positive")
         self._key_in = key_in
         self._key_out = key_out
         self._window_seconds = window_seconds
         self._hop_seconds = hop_seconds
-        self._buffer: list[np.ndarray] = []
+        self._ring: RingBuffer | None = None
         self._sample_rate: float | None = None
         self._window_samples: int | None = None
         self._hop_samples: int | None = None
+        # Sample index of the oldest buffered sample.
+        self._position = 0
+        # Samples still to drop from upcoming blocks when hop > window.
+        self._skip = 0
 
     def requires(self) -> Iterable[str]:
         return [self._key_in]
@@ -112,11 +459,20 @@ class SlidingWindowNode(ProcessingNode):
     def produces(self) -> Iterable[str]:
         return [self._key_out]
 
+    def signature(self) -> Hashable | None:
+        return (type(self), self._window_seconds, self._hop_seconds, self.dtype)
+
     def reset(self) -> None:
-        self._buffer.clear()
+        self._ring = None
         self._sample_rate = None
         self._window_samples = None
         self._hop_samples = None
+        self._position = 0
+        self._skip = 0
+
+    def state_nbytes(self) -> int:
+        ring = 0 if self._ring is None else self._ring.nbytes
+        return super().state_nbytes() + ring
 
     def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
         block = inputs[self._key_in]
@@ -124,37 +480,205 @@ class SlidingWindowNode(ProcessingNode):
             self._sample_rate = block.sample_rate
             self._window_samples = max(int(round(self._window_seconds * self._sample_rate)), 1)
             self._hop_samples = max(int(round(self._hop_seconds * self._sample_rate)), 1)
-        elif not np.isclose(self._sample_rate, block.sample_rate):
+            self._ring = RingBuffer(self._window_samples + self._hop_samples, dtype=self.dtype)
+        elif not math.isclose(self._sample_rate, block.sample_rate, rel_tol=1e-5, abs_tol=1e-8):
             raise ValueError("Sample rate changed during SlidingWindowNode processing")
-
-        self._buffer.append(block.values)
-        concatenated = np.concatenate(self._buffer, axis=0)
-
-        if self._window_samples is None or concatenated.shape[0] < self._window_samples:
+        assert self._ring is not None
+        assert self._window_samples is not None and self._hop_samples is not None
+
+        values = block.values
+        skipped = min(self._skip, values.shape[0])
+        if skipped:
+            values = values[skipped:]
+            self._skip -= skipped
+            if values.shape[0] == 0:
+                return {}
+        self._ring.write(values)
+        buffered = len(self._ring)
+        if buffered < self._window_samples:
             return {}
 
-        window_vals = concatenated[: self._window_samples]
-        window_block = block.copy_with(
-            values=window_vals,
-            metadata={**block.metadata, "window_seconds": self._window_seconds},
+        window, hop = self._window_samples, self._hop_samples
+        count = (buffered - window) // hop + 1
+        windows = _frames(self._ring.peek(), window, hop, count)
+        # Samples between the first window's start and the block start.
+        lag = buffered - values.shape[0] - skipped
+        window_block = BaseTimeSeries(
+            values=windows,
+            sample_rate=block.sample_rate,
+            timestamp=block.timestamp - timedelta(seconds=lag / block.sample_rate),
+            metadata={
+                **block.metadata,
+                "window_seconds": self._window_seconds,
+                "window_offsets": range(self._position, self._position + count * hop, hop),
+            },
         )
+        # With hop > window the ring may hold less than the full stride;
+        # the rest is dropped from the next blocks before windowing.
+        consumed = min(count * hop, buffered)
+        self._ring.consume(consumed)
+        self._skip = count * hop - consumed
+        self._position += consumed + self._skip
+        return {self._key_out: window_block}
 
-        # Trim buffer by hop
-        trim = self._hop_samples or 0
-        if trim >= concatenated.shape[0]:
-            self._buffer.clear()
-        else:
-            remaining = concatenated[trim:]
-            self._buffer = [remaining]
 
-        return {self._key_out: window_block}
+_WINDOWS: Dict[str, Callable[[int], np.ndarray]] = {
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+    "bartlett": np.bartlett,
+    "rectangular": np.ones,
+}
+
+
+@lru_cache(maxsize=32)
+def _frame_window(
+    window: str | Callable[[int], np.ndarray],
+    length: int,
+    dtype: np.dtype = np.dtype(np.float64),
+    channels: int = 1,
+) -> np.ndarray:
+    """Periodic analysis window as a ``(length, channels)`` array.
+
+    Repeating the window over channels lets it broadcast over frames only,
+    which NumPy multiplies about twice as fast as a ``(length, 1)`` column.
+    """
+    if callable(window):
+        values = np.asarray(window(length), dtype=np.float64)
+    elif window in _WINDOWS:
+        values = _WINDOWS[window](length + 1)[:length]
+    else:
+        raise ValueError(f"Unknown window '{window}', expected one of {sorted(_WINDOWS)}")
+    if values.shape != (length,):
+        raise ValueError(f"window must have shape ({length},), got {values.shape}")
+    values = np.repeat(values.reshape(length, 1).astype(dtype), channels, axis=1)
+    values.flags.writeable = False
+    return values
+
+
+@lru_cache(maxsize=32)
+def _frequencies(length: int, sample_rate: float) -> np.ndarray:
+    values = np.fft.rfftfreq(length, d=1.0 / sample_rate)
+    values.flags.writeable = False
+    return values
+
+
+class SpectrogramNode(ProcessingNode):
+    """Short-time Fourier magnitudes over frames of ``frame_length`` samples.
+
+    Frames start every ``hop`` samples and may span input blocks: samples
+    not yet covered by a complete frame are carried to the next block. Each
+    block yields every frame completed by it as one
+    ``(frames, frame_length // 2 + 1, channels)`` block whose sample rate is
+    the frame rate and whose timestamp is the start of the first frame; the
+    bin frequencies are in ``metadata["frequencies_hz"]``. All frames of a
+    block go through a single ``rfft`` call over a strided frame view.
+    ``window`` names a NumPy window (periodic form) or is a function of the
+    frame length; windows and frequency vectors are cached per configuration.
+    """
+
+    def __init__(
+        self,
+        key_in: str,
+        key_out: str | None = None,
+        *,
+        frame_length: int,
+        hop: int,
+        window: str | Callable[[int], np.ndarray] = "hann",
+        dtype: npt.DTypeLike | None = None,
+    ) -> None:
+        if frame_length <= 0 or hop <= 0:
+            raise ValueError("frame_length and hop must be positive")
+        super().__init__(dtype=dtype)
+        self._key_in = key_in
+        self._key_out = key_out or f"{key_in}_spec"
+        self._frame_length = frame_length
+        self._hop = hop
+        self._window = window
+        _frame_window(window, frame_length)  # validate early
+        self._pending = _Carry()
+        # Samples of the next block to drop when hop exceeds frame_length.
+        self._skip = 0
+
+    def requires(self) -> Iterable[str]:
+        return [self._key_in]
+
+    def produces(self) -> Iterable[str]:
+        return [self._key_out]
+
+    def signature(self) -> Hashable | None:
+        return (type(self), self._frame_length, self._hop, self._window, self.dtype)
+
+    def reset(self) -> None:
+        self._pending.clear()
+        self._skip = 0
+
+    def state_nbytes(self) -> int:
+        return super().state_nbytes() + self._pending.nbytes
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        block = inputs[self._key_in]
+        values = block.values.reshape(block.block_size, -1)
+        # Offset in samples of values[0] from the block start.
+        offset = min(self._skip, values.shape[0])
+        values = values[offset:]
+        self._skip -= offset
+        if self._pending.held:
+            offset = -self._pending.held
+            values = self._pending.extend(values)
+
+        available = values.shape[0]
+        count = 0
+        if available >= self._frame_length:
+            count = (available - self._frame_length) // self._hop + 1
+        consumed = min(count * self._hop, available)
+        self._skip += count * self._hop - consumed
+        if count == 0:
+            self._pending.keep(values, consumed)
+            return {}
+
+        dtype = _float_dtype(self.dtype, values.dtype)
+        frames = _frames(values, self._frame_length, self._hop, count)
+        window = _frame_window(self._window, self._frame_length, dtype, frames.shape[2])
+        weighted = self.buffer("frames", frames.shape, dtype)
+        np.multiply(frames, window, out=weighted, dtype=dtype)
+        # rfft keeps float32 (complex64), so the magnitudes come out in ``dtype``.
+        shape = (count, self._frame_length // 2 + 1, frames.shape[2])
+        spectra = self.buffer("spectra", shape, np.result_type(dtype, np.complex64))
+        np.fft.rfft(weighted, axis=1, out=spectra)
+        # Carry after the frames are read: ``values`` may share the carry's array.
+        self._pending.keep(values, consumed)
+        magnitudes = self.buffer(self._key_out, shape, spectra.real.dtype)
+        spectrogram = BaseTimeSeries(
+            values=np.abs(spectra, out=magnitudes),
+            sample_rate=block.sample_rate / self._hop,
+            timestamp=block.timestamp + timedelta(seconds=offset / block.sample_rate),
+            metadata={
+                **block.metadata,
+                "frequencies_hz": _frequencies(self._frame_length, block.sample_rate),
+                "frame_length": self._frame_length,
+                "hop": self._hop,
+            },
+        )
+        return {self._key_out: spectrogram}
 
 
 class SplitSensorNode(ProcessingNode):
-    """Split a multi-sensor dict into individual keys."""
+    """Split a multi-sensor dict into individual keys.
 
-    def __init__(self, input_key: str, sensor_keys: Iterable[str]) -> None:
-        super().__init__()
+    Packed blocks (``metadata["channels"]``) split into column views of the
+    packed array without copying. With a ``dtype`` policy, sensor blocks of
+    another dtype are converted.
+    """
+
+    def __init__(
+        self,
+        input_key: str,
+        sensor_keys: Iterable[str],
+        *,
+        dtype: npt.DTypeLike | None = None,
+    ) -> None:
+        super().__init__(dtype=dtype)
         self._input_key = input_key
         self._sensor_keys = list(sensor_keys)
 
@@ -164,17 +688,28 @@ class SplitSensorNode(ProcessingNode):
     def produces(self) -> Iterable[str]:
         return [f"{sensor}_raw" for sensor in self._sensor_keys]
 
+    def signature(self) -> Hashable | None:
+        return (type(self), tuple(self._sensor_keys), self.dtype)
+
     def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
         block = inputs[self._input_key]
-        # metadata must include per-sensor blocks to split
-        sensors = block.metadata.get("sensors")
+        # metadata must include per-sensor blocks or a channel index to split
+        channels = block.metadata.get("channels")
+        if channels is not None:
+            sensors = channels.split(block, [s for s in self._sensor_keys if s in channels])
+        else:
+            sensors = block.metadata.get("sensors")
         if sensors is None:
-            raise ValueError("SplitSensorNode requires metadata['sensors'] with per-sensor blocks")
+            raise ValueError(
+                "SplitSensorNode requires metadata['sensors'] or metadata['channels']"
+            )
         outputs: Dict[str, BaseTimeSeries] = {}
         for sensor in self._sensor_keys:
             sensor_block = sensors.get(sensor)
             if sensor_block is None:
                 raise ValueError(f"Sensor '{sensor}' not found in metadata")
+            if self.dtype is not None and sensor_block.values.dtype != self.dtype:
+                sensor_block = sensor_block.copy_with(values=sensor_block.values.astype(self.dtype))
             outputs[f"{sensor}_raw"] = sensor_block
         return outputs
 
@@ -182,8 +717,16 @@ class SplitSensorNode(ProcessingNode):
 class DecisionNode(ProcessingNode):
     """Combine sensor features and emit a decision block."""
 
-    def __init__(self, required_keys: Iterable[str], output_key: str = "decision") -> None:
-        super().__init__()
+    batchable = True
+
+    def __init__(
+        self,
+        required_keys: Iterable[str],
+        output_key: str = "decision",
+        *,
+        dtype: npt.DTypeLike | None = None,
+    ) -> None:
+        super().__init__(dtype=dtype)
         self._required_keys = list(required_keys)
         self._output_key = output_key
 
@@ -193,11 +736,28 @@ class DecisionNode(ProcessingNode):
     def produces(self) -> Iterable[str]:
         return [self._output_key]
 
+    def signature(self) -> Hashable | None:
+        return (type(self), self.dtype)
+
     def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
         score = sum(np.mean(block.values) for block in inputs.values()) / len(inputs)
         first = next(iter(inputs.values()))
+        values = self.buffer(self._output_key, (1, 1), _float_dtype(self.dtype, first.values.dtype))
+        values[0, 0] = score
         decision_block = first.copy_with(
-            values=np.array([[score]], dtype=np.float64),
+            values=values,
             metadata={"decision_score": float(score)},
         )
         return {self._output_key: decision_block}
+
+    def process_batch(self, inputs: Dict[str, BlockBatch]) -> Dict[str, BlockBatch]:
+        scores = sum(
+            np.mean(batch.values, axis=_batch_axes(batch)) for batch in inputs.values()
+        ) / len(inputs)
+        first = next(iter(inputs.values()))
+        dtype = _float_dtype(self.dtype, first.values.dtype)
+        decision_batch = first.copy_with(
+            values=np.asarray(scores, dtype=dtype).reshape(-1, 1, 1),
+            metadata=[{"decision_score": float(score)} for score in scores],
+        )
+        return {self._output_key: decision_batch}
@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
-from collections import deque
-from time import perf_counter
-from typing import Dict, Iterable, Iterator, List, Sequence
+import asyncio
+import warnings
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from contextlib import suppress
+from itertools import islice
+from time import perf_counter, perf_counter_ns
+from typing import AsyncIterator, Dict, Iterator, List, Mapping, Sequence
 
-from .data import BaseTimeSeries, BlockBuffer
-from .io import StreamDataLoader
+import numpy as np
+import numpy.typing as npt
+
+from .data import BaseTimeSeries, BlockBatch
+from .io import AsyncDataset, StreamDataLoader
 from .monitoring import BlockSummary, ErrorPolicy, PipelineMonitor
 from .nodes import ProcessingNode
+from .plan import ExecutionPlan, PlanStep, compile_plan, resolve_levels, resolve_order
+
+Slots = List[BaseTimeSeries | None]
+
+_END = object()
 
 
 class PipelineExecutionError(RuntimeError):
@@ -21,15 +33,111 @@ class PipelineExecutionError(RuntimeError):
         self.__cause__ = error
 
 
+class ResultsView(Mapping[str, BaseTimeSeries]):
+    """Read-only mapping over the requested outputs of the current block.
+
+    It reads the orchestrator's slots directly, so its contents change when
+    the next block is processed, and nodes may write that block into the
+    same arrays; use ``value.copy_with(deep=True)`` to keep a result.
+    """
+
+    __slots__ = ("_slots", "_outputs")
+
+    def __init__(self, slots: Slots, output_slots: Sequence[tuple[str, int]]) -> None:
+        self._slots = slots
+        self._outputs = dict(output_slots)
+
+    def __getitem__(self, key: str) -> BaseTimeSeries:
+        value = self._slots[self._outputs[key]]
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        slot = self._outputs.get(key)  # type: ignore[call-overload]
+        return slot is not None and self._slots[slot] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        slots = self._slots
+        return (key for key, slot in self._outputs.items() if slots[slot] is not None)
+
+    def __len__(self) -> int:
+        slots = self._slots
+        return sum(slots[slot] is not None for slot in self._outputs.values())
+
+    def __repr__(self) -> str:
+        return f"ResultsView({dict(self)!r})"
+
+
+class _NodeFailure(Exception):
+    def __init__(self, node: ProcessingNode, error: Exception, offset: int = 0) -> None:
+        super().__init__(node.name)
+        self.node = node
+        self.error = error
+        # Position of the failing block within a micro-batch.
+        self.offset = offset
+
+
+class _BatchSlot:
+    """One key's values for a micro-batch, held per block or stacked.
+
+    Each form is derived from the other on first use and cached.
+    """
+
+    __slots__ = ("_blocks", "_batch", "_size")
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        blocks: List[BaseTimeSeries | None] | None = None,
+        batch: BlockBatch | None = None,
+    ) -> None:
+        self._size = size
+        self._blocks = blocks
+        self._batch: BlockBatch | None | bool = batch
+
+    def blocks(self) -> List[BaseTimeSeries | None]:
+        if self._blocks is None:
+            assert isinstance(self._batch, BlockBatch)
+            self._blocks = list(self._batch.unstack())
+        return self._blocks
+
+    def batch(self) -> BlockBatch | None:
+        if self._batch is None:
+            blocks = self.blocks()
+            try:
+                if any(block is None for block in blocks):
+                    raise ValueError("not every block has a value")
+                self._batch = BlockBatch.stack(blocks)  # type: ignore[arg-type]
+            except ValueError:
+                self._batch = False
+        return self._batch or None
+
+
 class PipelineBuilder:
+    """Collect nodes and compile them into a :class:`PipelineOrchestrator`.
+
+    ``dtype`` is a pipeline-wide output dtype policy for nodes without a
+    ``dtype`` of their own. Those nodes run as :meth:`~.nodes.ProcessingNode.with_dtype`
+    copies, so the node objects passed to :meth:`add_node` are left as they
+    are and can be built again under another policy. With
+    ``strict_outputs=True`` a node returning a key it does not declare in
+    ``produces()`` fails the block instead of triggering a warning.
+    """
+
     def __init__(
         self,
         *,
         input_key: str = "input",
         output_keys: Sequence[str] | None = None,
+        dtype: npt.DTypeLike | None = None,
+        strict_outputs: bool = False,
     ) -> None:
         self._input_key = input_key
         self._output_keys = tuple(output_keys) if output_keys else None
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        self._strict_outputs = strict_outputs
         self._nodes: List[ProcessingNode] = []
 
     def add_node(self, node: ProcessingNode) -> "PipelineBuilder":
@@ -38,121 +146,570 @@ class PipelineBuilder:
 
     def build(
         self,
-        dataloader: StreamDataLoader,
+        dataloader: StreamDataLoader | AsyncDataset,
         *,
         monitor: PipelineMonitor | None = None,
         on_error: ErrorPolicy = ErrorPolicy.STOP,
+        max_workers: int = 1,
+        batch_blocks: int = 1,
     ) -> "PipelineOrchestrator":
-        order = resolve_order(self._nodes, available={self._input_key})
+        nodes = [
+            node.with_dtype(self._dtype) if self._dtype is not None and node.dtype is None else node
+            for node in self._nodes
+        ]
+        plan = compile_plan(
+            nodes,
+            input_key=self._input_key,
+            output_keys=self._output_keys,
+            strict_outputs=self._strict_outputs,
+        )
         return PipelineOrchestrator(
             dataloader=dataloader,
-            nodes=order,
+            nodes=plan.nodes,
             input_key=self._input_key,
             output_keys=self._output_keys,
             monitor=monitor,
             error_policy=on_error,
+            max_workers=max_workers,
+            batch_blocks=batch_blocks,
+            plan=plan,
         )
 
 
-def resolve_order(
-    nodes: Sequence[ProcessingNode],
-    *,
-    available: Iterable[str],
-) -> List[ProcessingNode]:
-    available_keys = set(available)
-    pending = deque(nodes)
-    order: List[ProcessingNode] = []
-
-    while pending:
-        progressed = False
-        for _ in range(len(pending)):
-            node = pending.popleft()
-            if set(node.requires()).issubset(available_keys):
-                order.append(node)
-                available_keys.update(node.produces())
-                progressed = True
-            else:
-                pending.append(node)
-        if not progressed:
-            missing = sorted(
-                {
-                    dep
-                    for node in pending
-                    for dep in node.requires()
-                    if dep not in available_keys
-                }
-            )
-            raise ValueError(f"Unresolved dependencies: {missing}")
+def _run_step(step: PlanStep, slots: Slots) -> bool:
+    """Run one step if all of its input slots are filled; report whether it ran."""
+    inputs: Dict[str, BaseTimeSeries] = {}
+    for key, slot in step.inputs:
+        value = slots[slot]
+        if value is None:
+            return False
+        inputs[key] = value
+    try:
+        outputs = step.node.process(inputs)
+    except Exception as error:
+        raise _NodeFailure(step.node, error) from error
+    for key, value in outputs.items():
+        slot = step.outputs.get(key)
+        if slot is None:
+            _undeclared(step, key)
+            continue
+        slots[slot] = value
+    return True
+
+
+def _undeclared(step: PlanStep, key: str, offset: int = 0) -> None:
+    """Fail a strict step, otherwise warn that ``key`` has no slot and is dropped."""
+    if step.strict:
+        raise _NodeFailure(step.node, ValueError(f"Node produced undeclared key '{key}'"), offset)
+    warnings.warn(
+        f"Node '{step.label}' produced undeclared key '{key}', which is dropped; "
+        "declare it in produces() to keep it",
+        RuntimeWarning,
+        stacklevel=3,
+    )
+
+
+def _timed_step(step: PlanStep, slots: Slots) -> int:
+    """Like :func:`_run_step`, returning nanoseconds spent or -1 if skipped."""
+    start = perf_counter_ns()
+    if not _run_step(step, slots):
+        return -1
+    return perf_counter_ns() - start
 
-    return order
+
+def _live_bytes(slots: Slots) -> int:
+    """Bytes of values held in ``slots``; a block in two slots counts twice."""
+    return sum(value.values.nbytes for value in slots if value is not None)
+
+
+def _run_batch_step(step: PlanStep, slots: List[_BatchSlot | None], size: int) -> bool:
+    """Run one step over a micro-batch, stacked if the node allows it."""
+    node = step.node
+    if node.batchable:
+        batches: Dict[str, BlockBatch] = {}
+        for key, slot in step.inputs:
+            entry = slots[slot]
+            batch = entry.batch() if entry is not None else None
+            if batch is None:
+                break
+            batches[key] = batch
+        else:
+            try:
+                batch_outputs = node.process_batch(batches)
+            except Exception as error:
+                raise _NodeFailure(node, error) from error
+            for key, batch in batch_outputs.items():
+                slot = step.outputs.get(key)
+                if slot is None:
+                    _undeclared(step, key)
+                    continue
+                slots[slot] = _BatchSlot(size, batch=batch)
+            return True
+
+    columns = [
+        entry.blocks() if (entry := slots[slot]) is not None else None
+        for _, slot in step.inputs
+    ]
+    if any(column is None for column in columns):
+        return False
+    results: Dict[int, List[BaseTimeSeries | None]] = {}
+    for offset in range(size):
+        inputs: Dict[str, BaseTimeSeries] = {}
+        for (key, _), column in zip(step.inputs, columns):
+            value = column[offset]  # type: ignore[index]
+            if value is None:
+                break
+            inputs[key] = value
+        else:
+            try:
+                outputs = node.process(inputs)
+            except Exception as error:
+                raise _NodeFailure(node, error, offset) from error
+            for key, value in outputs.items():
+                slot = step.outputs.get(key)
+                if slot is None:
+                    _undeclared(step, key, offset)
+                    continue
+                results.setdefault(slot, [None] * size)[offset] = value
+    for slot, blocks in results.items():
+        slots[slot] = _BatchSlot(size, blocks=blocks)
+    return True
 
 
 class PipelineOrchestrator:
+    """Run nodes over every block from the dataloader.
+
+    Nodes run from a compiled :class:`~.plan.ExecutionPlan`: every key is a
+    slot index resolved once, so per-block dispatch only indexes a list.
+    Keys a node returns without declaring them in ``produces()`` have no
+    slot: they are dropped with a ``RuntimeWarning``, or fail the block when
+    the plan was compiled with ``strict_outputs=True``.
+
+    With ``max_workers > 1`` nodes are grouped by :func:`resolve_levels` and
+    the nodes of each level run concurrently on a thread pool, joining
+    before the next level starts. NumPy releases the GIL for most array
+    work, so independent branches (for example one per sensor) overlap.
+    Outputs are identical to serial execution; if several nodes of a level
+    fail, the error of the earliest node in serial order is reported.
+
+    With ``batch_blocks=N`` (meant for offline and backfill runs) blocks are
+    taken from the dataloader ``N`` at a time. Nodes marked ``batchable``
+    run once per batch through ``process_batch`` on the stacked values;
+    every other node still sees the blocks one by one and in order. Results
+    are yielded per block as usual. A node error skips or stops the whole
+    micro-batch.
+    """
+
     def __init__(
         self,
         *,
-        dataloader: StreamDataLoader,
+        dataloader: StreamDataLoader | AsyncDataset,
         nodes: Sequence[ProcessingNode],
         input_key: str,
         output_keys: Sequence[str] | None,
         monitor: PipelineMonitor | None,
         error_policy: ErrorPolicy,
+        max_workers: int = 1,
+        batch_blocks: int = 1,
+        plan: ExecutionPlan | None = None,
     ) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if batch_blocks <= 0:
+            raise ValueError("batch_blocks must be positive")
+        if max_workers > 1 and batch_blocks > 1:
+            raise ValueError("max_workers and batch_blocks cannot be combined")
         self._dataloader = dataloader
-        self._nodes = list(nodes)
+        self._plan = plan or compile_plan(nodes, input_key=input_key, output_keys=output_keys)
+        self._nodes = list(self._plan.nodes)
         self._input_key = input_key
         self._output_keys = tuple(output_keys) if output_keys else None
         self._monitor = monitor
         self._error_policy = error_policy
+        self._max_workers = max_workers
+        self._batch_blocks = batch_blocks
+
+    @property
+    def plan(self) -> ExecutionPlan:
+        return self._plan
+
+    def run(
+        self,
+        *,
+        changed_only: bool = False,
+        view: bool = False,
+    ) -> Iterator[Mapping[str, BaseTimeSeries]]:
+        """Yield the requested outputs of each block.
+
+        With ``changed_only`` blocks that produced none of the requested
+        outputs are not yielded. With ``view`` every result is the same
+        :class:`ResultsView`, updated in place, instead of a new dict per
+        block; it is only valid until the next block is requested. Nodes
+        then reuse their output arrays from block to block, so nodes that
+        keep an earlier block's input must copy it.
+        """
+        if isinstance(self._dataloader, AsyncDataset):
+            raise TypeError("an AsyncDataset pipeline must be run with arun()")
+        self._start_run()
+
+        executor = None
+        if self._max_workers > 1:
+            executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="pipeline",
+            )
+        try:
+            if self._batch_blocks > 1:
+                yield from self._run_batches(changed_only, view)
+            else:
+                yield from self._run_blocks(executor, changed_only, view)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    async def arun(
+        self,
+        *,
+        max_in_flight: int = 2,
+        executor: Executor | None = None,
+        changed_only: bool = False,
+        view: bool = False,
+    ) -> AsyncIterator[Mapping[str, BaseTimeSeries]]:
+        """Asynchronous :meth:`run` for use inside an event loop.
+
+        Blocks come from an :class:`~.io.AsyncDataset`, or from a synchronous
+        dataloader advanced on a worker thread. A reader task pulls at most
+        ``max_in_flight`` blocks ahead of the consumer, so a slow pipeline or
+        sink stops reading from the source. Nodes run one block at a time in
+        plan order; those with ``offload`` set run on ``executor`` (the
+        loop's default executor if ``None``) so the event loop stays
+        responsive. ``max_workers`` and ``batch_blocks`` do not apply.
+        """
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        if self._batch_blocks > 1:
+            raise ValueError("arun does not support batch_blocks")
+        self._start_run()
+
+        loop = asyncio.get_running_loop()
+        plan = self._plan
+        empty: tuple[None, ...] = (None,) * len(plan.keys)
+        slots: Slots = list(empty)
+        output_slots = plan.output_slots
+        results = ResultsView(slots, output_slots)
+        monitor = self._monitor
+        timed = monitor is not None and monitor.node_timing
+        measured = monitor is not None and monitor.live_bytes
+        run = _timed_step if timed else _run_step
+
+        queue: asyncio.Queue[object] = asyncio.Queue()
+        capacity = asyncio.Semaphore(max_in_flight)
+        reader = asyncio.create_task(self._read_blocks(queue, capacity))
+        index = -1
+        try:
+            while (block := await queue.get()) is not _END:
+                if isinstance(block, BaseException):
+                    raise block
+                assert isinstance(block, BaseTimeSeries)
+                index += 1
+                try:
+                    block_start = perf_counter()
+                    if monitor:
+                        monitor.on_block_start(index)
+                    if view:
+                        self._release_buffers()
+                    slots[:] = empty
+                    slots[plan.input_slot] = block
+                    peak = _live_bytes(slots) if measured else None
+                    try:
+                        for step in plan.steps:
+                            if timed:
+                                assert monitor is not None
+                                monitor.on_node_start(index, step.label)
+                            if step.node.offload:
+                                outcome = await loop.run_in_executor(executor, run, step, slots)
+                            else:
+                                outcome = run(step, slots)
+                            if timed and outcome >= 0:
+                                assert monitor is not None
+                                monitor.on_node_end(index, step.label, int(outcome))
+                            if peak is not None:
+                                peak = max(peak, _live_bytes(slots))
+                            for slot in step.releases:
+                                slots[slot] = None
+                    except _NodeFailure as failure:
+                        self._block_failed(index, failure, block_start)
+                        # CONTINUE: skip block
+                        continue
+
+                    if monitor:
+                        self._block_done(index, block_start, slots, peak)
+                    if changed_only and all(slots[slot] is None for _, slot in output_slots):
+                        continue
+                    yield results if view else {
+                        key: value
+                        for key, slot in output_slots
+                        if (value := slots[slot]) is not None
+                    }
+                finally:
+                    capacity.release()
+        finally:
+            reader.cancel()
+            with suppress(asyncio.CancelledError):
+                await reader
+
+    def _release_buffers(self) -> None:
+        for node in self._nodes:
+            node.release_buffers()
 
-    def run(self) -> Iterator[Dict[str, BaseTimeSeries]]:
-        buffer = BlockBuffer()
+    def _start_run(self) -> None:
         for node in self._nodes:
             node.reset()
+        if self._monitor:
+            self._monitor.on_run_start({step.label: step.node for step in self._plan.steps})
+
+    async def _read_blocks(self, queue: asyncio.Queue[object], capacity: asyncio.Semaphore) -> None:
+        """Feed ``queue`` from the dataloader, then ``_END`` or the error raised."""
+        source = self._dataloader
+        try:
+            if isinstance(source, AsyncDataset):
+                iterator = aiter(source)
+                while True:
+                    await capacity.acquire()
+                    try:
+                        block = await anext(iterator)
+                    except StopAsyncIteration:
+                        break
+                    queue.put_nowait(block)
+            else:
+                blocks = iter(source)
+                while True:
+                    await capacity.acquire()
+                    block = await asyncio.to_thread(next, blocks, _END)
+                    if block is _END:
+                        break
+                    queue.put_nowait(block)
+        except Exception as error:
+            queue.put_nowait(error)
+            return
+        queue.put_nowait(_END)
+
+    def _run_blocks(
+        self,
+        executor: ThreadPoolExecutor | None,
+        changed_only: bool,
+        view: bool,
+    ) -> Iterator[Mapping[str, BaseTimeSeries]]:
+        plan = self._plan
+        empty: tuple[None, ...] = (None,) * len(plan.keys)
+        slots: Slots = list(empty)
+        output_slots = plan.output_slots
+        results = ResultsView(slots, output_slots)
+        monitor = self._monitor
+        timed = monitor is not None and monitor.node_timing
+        measured = monitor is not None and monitor.live_bytes
 
         for index, block in enumerate(self._dataloader):
             block_start = perf_counter()
             if self._monitor:
                 self._monitor.on_block_start(index)
-            buffer.clear()
-            buffer.set(self._input_key, block)
-            produced: Dict[str, BaseTimeSeries] = {self._input_key: block}
+            if view:
+                self._release_buffers()
+            slots[:] = empty
+            slots[plan.input_slot] = block
 
+            peak = None
             try:
-                for node in self._nodes:
-                    inputs: Dict[str, BaseTimeSeries] = {}
-                    missing = []
-                    for key in node.requires():
-                        try:
-                            inputs[key] = buffer.get(key)
-                        except KeyError:
-                            missing.append(key)
-                    if missing:
-                        continue
-                    outputs = node.process(inputs)
-                    for key, value in outputs.items():
-                        buffer.set(key, value)
-                        produced[key] = value
-            except Exception as error:  # pragma: no cover - user node error
+                if executor is not None:
+                    peak = self._run_levels(executor, slots, index, timed, measured)
+                elif timed or measured:
+                    peak = self._run_monitored(slots, index, timed, measured)
+                else:
+                    for step in plan.steps:
+                        _run_step(step, slots)
+                        for slot in step.releases:
+                            slots[slot] = None
+            except _NodeFailure as failure:  # pragma: no cover - user node error
+                self._block_failed(index, failure, block_start)
+                # CONTINUE: skip block
+                continue
+
+            if self._monitor:
+                self._block_done(index, block_start, slots, peak)
+            if changed_only and all(slots[slot] is None for _, slot in output_slots):
+                continue
+            yield results if view else {
+                key: value
+                for key, slot in output_slots
+                if (value := slots[slot]) is not None
+            }
+
+    def _block_failed(self, index: int, failure: _NodeFailure, block_start: float) -> None:
+        """Report a failed block; raise unless the policy is to continue."""
+        node, error = failure.node, failure.error
+        wrapped = PipelineExecutionError(index, node.name, error)
+        if self._monitor:
+            self._monitor.on_error(index, node.name, error)
+            duration = perf_counter() - block_start
+            self._monitor.on_block_end(
+                BlockSummary(index, duration, outputs=None)
+            )
+        if self._error_policy is ErrorPolicy.STOP:
+            raise wrapped
+
+    def _block_done(
+        self,
+        index: int,
+        block_start: float,
+        slots: Slots,
+        peak_live_bytes: int | None = None,
+    ) -> None:
+        assert self._monitor is not None
+        duration = perf_counter() - block_start
+        produced = {
+            key: value
+            for key, value in zip(self._plan.keys, slots)
+            if value is not None
+        }
+        self._monitor.on_block_end(
+            BlockSummary(index, duration, produced, peak_live_bytes)
+        )
+
+    def _run_monitored(
+        self,
+        slots: Slots,
+        index: int,
+        timed: bool,
+        measured: bool,
+    ) -> int | None:
+        """Run the plan serially, reporting node times and/or peak live bytes."""
+        monitor = self._monitor
+        assert monitor is not None
+        peak = _live_bytes(slots) if measured else None
+        for step in self._plan.steps:
+            if timed:
+                monitor.on_node_start(index, step.label)
+                elapsed = _timed_step(step, slots)
+                if elapsed >= 0:
+                    monitor.on_node_end(index, step.label, elapsed)
+            else:
+                _run_step(step, slots)
+            if peak is not None:
+                peak = max(peak, _live_bytes(slots))
+            for slot in step.releases:
+                slots[slot] = None
+        return peak
+
+    def _run_levels(
+        self,
+        executor: ThreadPoolExecutor,
+        slots: Slots,
+        index: int,
+        timed: bool,
+        measured: bool = False,
+    ) -> int | None:
+        run = _timed_step if timed else _run_step
+        peak = _live_bytes(slots) if measured else None
+        for level, releases in zip(self._plan.levels, self._plan.level_releases):
+            if timed:
+                assert self._monitor is not None
+                for step in level:
+                    self._monitor.on_node_start(index, step.label)
+            futures: List[Future[int | bool]] = [
+                executor.submit(run, step, slots) for step in level[1:]
+            ]
+            # Run the first step on this thread while the pool handles the rest.
+            # Steps of one level write disjoint slots, so they share the list.
+            try:
+                first = run(level[0], slots)
+            finally:
+                wait(futures)
+            results = [first, *(future.result() for future in futures)]
+            if timed:
+                # Report from this thread so monitors need no locking.
+                assert self._monitor is not None
+                for step, elapsed in zip(level, results):
+                    if elapsed >= 0:
+                        self._monitor.on_node_end(index, step.label, int(elapsed))
+            if peak is not None:
+                peak = max(peak, _live_bytes(slots))
+            for slot in releases:
+                slots[slot] = None
+        return peak
+
+    def _run_batches(
+        self,
+        changed_only: bool,
+        view: bool,
+    ) -> Iterator[Mapping[str, BaseTimeSeries]]:
+        plan = self._plan
+        output_slots = plan.output_slots
+        # Per-block outputs of the current micro-batch, read through ``results``.
+        block_slots: Slots = [None] * len(plan.keys)
+        results = ResultsView(block_slots, output_slots)
+        iterator = iter(self._dataloader)
+        first_index = 0
+
+        while True:
+            blocks: List[BaseTimeSeries | None] = list(islice(iterator, self._batch_blocks))
+            if not blocks:
+                return
+            size = len(blocks)
+            indices = range(first_index, first_index + size)
+            first_index += size
+            batch_start = perf_counter()
+            if self._monitor:
+                for index in indices:
+                    self._monitor.on_block_start(index)
+            if view:
+                # Blocks of one micro-batch stay alive together, so release per batch.
+                self._release_buffers()
+            slots: List[_BatchSlot | None] = [None] * len(plan.keys)
+            slots[plan.input_slot] = _BatchSlot(size, blocks=blocks)
+
+            try:
+                for step in plan.steps:
+                    if self._monitor and self._monitor.node_timing:
+                        self._monitor.on_node_start(indices[0], step.label)
+                    step_start = perf_counter_ns()
+                    ran = _run_batch_step(step, slots, size)
+                    if ran and self._monitor and self._monitor.node_timing:
+                        # One call covers the micro-batch; attribute an equal share per block.
+                        share = (perf_counter_ns() - step_start) // size
+                        for index in indices:
+                            self._monitor.on_node_end(index, step.label, share)
+                    for slot in step.releases:
+                        slots[slot] = None
+            except _NodeFailure as failure:  # pragma: no cover - user node error
+                index = indices[failure.offset]
+                node, error = failure.node, failure.error
                 wrapped = PipelineExecutionError(index, node.name, error)
                 if self._monitor:
                     self._monitor.on_error(index, node.name, error)
-                    duration = perf_counter() - block_start
-                    self._monitor.on_block_end(
-                        BlockSummary(index, duration, outputs=None)
-                    )
+                    duration = (perf_counter() - batch_start) / size
+                    for skipped in indices:
+                        self._monitor.on_block_end(BlockSummary(skipped, duration, outputs=None))
                 if self._error_policy is ErrorPolicy.STOP:
                     raise wrapped
-                # CONTINUE: skip block
+                # CONTINUE: skip the micro-batch
                 continue
 
-            duration = perf_counter() - block_start
-            if self._monitor:
-                self._monitor.on_block_end(
-                    BlockSummary(index, duration, produced)
-                )
-
-            if self._output_keys is None:
-                yield dict(produced)
-            else:
-                yield {key: produced[key] for key in self._output_keys if key in produced}
+            duration = (perf_counter() - batch_start) / size
+            for offset, index in enumerate(indices):
+                if self._monitor:
+                    produced = {
+                        key: value
+                        for key, entry in zip(plan.keys, slots)
+                        if entry is not None and (value := entry.blocks()[offset]) is not None
+                    }
+                    self._monitor.on_block_end(BlockSummary(index, duration, produced))
+                for _, slot in output_slots:
+                    entry = slots[slot]
+                    block_slots[slot] = None if entry is None else entry.blocks()[offset]
+                if changed_only and all(block_slots[slot] is None for _, slot in output_slots):
+                    continue
+                yield results if view else {
+                    key: value
+                    for key, slot in output_slots
+                    if (value := block_slots[slot]) is not None
+                }
@@ -0,0 +1,320 @@
+"""Compiled execution plans for src_4th."""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, TypeVar
+
+from .nodes import ProcessingNode
+
+_Entry = TypeVar("_Entry")
+
+
+@dataclass(frozen=True, slots=True)
+class PlanStep:
+    """One node with its input and output keys resolved to slot indices.
+
+    ``label`` is the node name, suffixed with its first output key when
+    several nodes in the plan share that name. ``releases`` lists the slots
+    no later step reads or writes and that are not yielded, so they can be
+    cleared as soon as this step has run. With ``strict`` an output key the
+    node did not declare is an error rather than a warning.
+    """
+
+    node: ProcessingNode
+    inputs: tuple[tuple[str, int], ...]
+    outputs: Dict[str, int]
+    label: str
+    releases: tuple[int, ...] = ()
+    strict: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class BuildReport:
+    """What :func:`compile_plan` changed relative to the nodes it was given.
+
+    ``pruned`` holds the labels of nodes dropped because none of their
+    outputs can reach a requested output key. ``merged`` holds
+    ``(label, kept_label)`` pairs for nodes dropped as duplicates of a node
+    with the same :meth:`~.nodes.ProcessingNode.signature` on the same
+    inputs; their output keys alias the kept node's slots.
+    """
+
+    pruned: tuple[str, ...] = ()
+    merged: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutionPlan:
+    """Fixed node schedule over a flat list of per-block slots.
+
+    ``keys[i]`` names slot ``i``; keys aliased by a merge share the slot of
+    the key they alias. ``levels`` groups ``steps`` as
+    :func:`resolve_levels` does, and ``output_slots`` lists the slots that
+    ``PipelineOrchestrator.run`` yields. ``level_releases[i]`` holds the
+    slots that can be cleared once level ``i`` has finished: a step's
+    ``releases`` are only safe when steps run one at a time in order.
+    """
+
+    keys: tuple[str, ...]
+    input_slot: int
+    steps: tuple[PlanStep, ...]
+    levels: tuple[tuple[PlanStep, ...], ...]
+    output_slots: tuple[tuple[str, int], ...]
+    report: BuildReport = BuildReport()
+    level_releases: tuple[tuple[int, ...], ...] = ()
+
+    @property
+    def nodes(self) -> tuple[ProcessingNode, ...]:
+        return tuple(step.node for step in self.steps)
+
+
+def compile_plan(
+    nodes: Sequence[ProcessingNode],
+    *,
+    input_key: str,
+    output_keys: Sequence[str] | None = None,
+    extra_inputs: Sequence[str] = (),
+    strict_outputs: bool = False,
+) -> ExecutionPlan:
+    """Resolve node order once and map every key to an integer slot.
+
+    ``extra_inputs`` are keys the caller fills besides ``input_key``; they
+    get slots ``1..len(extra_inputs)``. ``strict_outputs`` sets
+    :attr:`PlanStep.strict` on every step.
+
+    With ``output_keys``, nodes that cannot contribute to any of them are
+    left out of the plan (and are never reset or run); stateful nodes get
+    no exception. Nodes whose signature and input slots match an earlier
+    node are merged into it. ``plan.report`` lists both. Every slot not in
+    ``output_keys`` is released after its last reader or writer.
+    """
+    order = resolve_order(nodes, available={input_key, *extra_inputs})
+    name_counts = Counter(node.name for node in order)
+    labels = {id(node): _label(node, name_counts) for node in order}
+    live = order if output_keys is None else live_nodes(order, output_keys)
+    live_ids = {id(node) for node in live}
+
+    keys: List[str] = list(dict.fromkeys([input_key, *extra_inputs]))
+    slots: Dict[str, int] = {key: slot for slot, key in enumerate(keys)}
+    given = range(len(keys))
+    steps: List[PlanStep] = []
+    seen: Dict[Hashable, PlanStep] = {}
+    merged: List[tuple[str, str]] = []
+    for node in live:
+        inputs = tuple((key, slots[key]) for key in node.requires())
+        signature = _signature(node)
+        if signature is not None:
+            identity = (signature, tuple(slot for _, slot in inputs))
+            kept = seen.get(identity)
+            if kept is not None and _alias(slots, list(node.produces()), kept):
+                merged.append((labels[id(node)], kept.label))
+                continue
+        outputs: Dict[str, int] = {}
+        for key in node.produces():
+            if key not in slots:
+                slots[key] = len(keys)
+                keys.append(key)
+            outputs[key] = slots[key]
+        step = PlanStep(node, inputs, outputs, labels[id(node)], strict=strict_outputs)
+        steps.append(step)
+        if signature is not None:
+            seen.setdefault(identity, step)
+
+    requested = slots if output_keys is None else [key for key in output_keys if key in slots]
+    output_slots = tuple((key, slots[key]) for key in requested)
+    kept_slots = {slot for _, slot in output_slots}
+    steps = [
+        replace(step, releases=releases)
+        for step, releases in zip(
+            steps, _last_uses([_used_slots(step) for step in steps], keep=kept_slots)
+        )
+    ]
+    levels = tuple(
+        tuple(level)
+        for level in _group_levels(
+            steps,
+            # Slot indices rather than keys, so aliased keys count as one.
+            reads=lambda step: [slot for _, slot in step.inputs],
+            writes=lambda step: step.outputs.values(),
+            available=given,
+        )
+    )
+    return ExecutionPlan(
+        keys=tuple(keys),
+        input_slot=slots[input_key],
+        steps=tuple(steps),
+        levels=levels,
+        output_slots=output_slots,
+        report=BuildReport(
+            pruned=tuple(labels[id(node)] for node in order if id(node) not in live_ids),
+            merged=tuple(merged),
+        ),
+        level_releases=_last_uses(
+            [[slot for step in level for slot in _used_slots(step)] for level in levels],
+            keep=kept_slots,
+        ),
+    )
+
+
+def _signature(node: ProcessingNode) -> Hashable | None:
+    """``node.signature()``, or ``None`` if its class only inherits it.
+
+    A subclass may add configuration its parent's signature does not cover,
+    so it is only merged once it defines ``signature`` itself.
+    """
+    if "signature" not in vars(type(node)):
+        return None
+    return node.signature()
+
+
+def _used_slots(step: PlanStep) -> List[int]:
+    return [*(slot for _, slot in step.inputs), *step.outputs.values()]
+
+
+def _last_uses(
+    groups: Sequence[Iterable[int]],
+    *,
+    keep: Iterable[int],
+) -> tuple[tuple[int, ...], ...]:
+    """For each group of used slots, those outside ``keep`` no later group uses."""
+    last: Dict[int, int] = {}
+    for position, group in enumerate(groups):
+        for slot in group:
+            last[slot] = position
+    releases: List[List[int]] = [[] for _ in groups]
+    kept = set(keep)
+    for slot, position in last.items():
+        if slot not in kept:
+            releases[position].append(slot)
+    return tuple(tuple(sorted(group)) for group in releases)
+
+
+def _alias(slots: Dict[str, int], produced: List[str], kept: PlanStep) -> bool:
+    """Point ``produced`` keys at ``kept``'s slots unless one already has its own."""
+    targets = list(kept.outputs.values())
+    if len(produced) != len(targets):
+        return False
+    if any(slots.get(key, target) != target for key, target in zip(produced, targets)):
+        return False
+    slots.update(zip(produced, targets))
+    return True
+
+
+def live_nodes(
+    order: Sequence[ProcessingNode],
+    output_keys: Iterable[str],
+) -> List[ProcessingNode]:
+    """Keep the nodes of a resolved ``order`` that feed any of ``output_keys``.
+
+    Walks the order backwards, so a node is kept when one of its outputs is
+    requested or required by a node kept after it.
+    """
+    needed = set(output_keys)
+    kept: List[ProcessingNode] = []
+    for node in reversed(order):
+        if needed.isdisjoint(node.produces()):
+            continue
+        kept.append(node)
+        needed.update(node.requires())
+    kept.reverse()
+    return kept
+
+
+def _label(node: ProcessingNode, name_counts: Counter[str]) -> str:
+    produced = list(node.produces())
+    if name_counts[node.name] > 1 and produced:
+        return f"{node.name}[{produced[0]}]"
+    return node.name
+
+
+def resolve_order(
+    nodes: Sequence[ProcessingNode],
+    *,
+    available: Iterable[str],
+) -> List[ProcessingNode]:
+    available_keys = set(available)
+    pending = deque(nodes)
+    order: List[ProcessingNode] = []
+
+    while pending:
+        progressed = False
+        for _ in range(len(pending)):
+            node = pending.popleft()
+            if set(node.requires()).issubset(available_keys):
+                order.append(node)
+                available_keys.update(node.produces())
+                progressed = True
+            else:
+                pending.append(node)
+        if not progressed:
+            missing = sorted(
+                {
+                    dep
+                    for node in pending
+                    for dep in node.requires()
+                    if dep not in available_keys
+                }
+            )
+            raise ValueError(f"Unresolved dependencies: {missing}")
+
+    return order
+
+
+def resolve_levels(
+    nodes: Sequence[ProcessingNode],
+    *,
+    available: Iterable[str],
+) -> List[List[ProcessingNode]]:
+    """Group nodes into levels whose members do not depend on each other.
+
+    Every node in a level only needs keys produced by earlier levels (or
+    ``available``), so the nodes of one level may run concurrently. Within a
+    level, nodes keep their ``resolve_order`` order.
+    """
+    available_keys = list(available)
+    return _group_levels(
+        resolve_order(nodes, available=available_keys),
+        reads=lambda node: node.requires(),
+        writes=lambda node: node.produces(),
+        available=available_keys,
+    )
+
+
+def _group_levels(
+    entries: Iterable[_Entry],
+    *,
+    reads: Callable[[_Entry], Iterable[Hashable]],
+    writes: Callable[[_Entry], Iterable[Hashable]],
+    available: Iterable[Hashable],
+) -> List[List[_Entry]]:
+    """Level grouping behind :func:`resolve_levels` and ``ExecutionPlan.levels``.
+
+    ``entries`` come in a valid serial order and read and write keys or
+    slots. An entry lands one level after the last write of anything it
+    reads or writes, and one level after the last read of anything it
+    writes, so no level overwrites a key another of its entries reads.
+    """
+    written: Dict[Hashable, int] = {key: -1 for key in available}
+    read: Dict[Hashable, int] = {}
+    levels: List[List[_Entry]] = []
+    for entry in entries:
+        consumed = list(reads(entry))
+        level = max((written.get(key, -1) for key in consumed), default=-1) + 1
+        produced = list(writes(entry))
+        for key in produced:
+            # A key written twice keeps its serial write order, and its
+            # earlier readers finish before it is overwritten.
+            if key in written:
+                level = max(level, written[key] + 1)
+            if key in read:
+                level = max(level, read[key] + 1)
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(entry)
+        for key in consumed:
+            read[key] = max(read.get(key, -1), level)
+        for key in produced:
+            written[key] = level
+    return levels
@@ -0,0 +1,423 @@
+"""Multi-process sharded execution for src_4th."""
+
+from __future__ import annotations
+
+import multiprocessing
+import pickle
+from collections import deque
+from datetime import datetime
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Callable, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from .data import BaseTimeSeries
+from .io import StreamDataLoader
+from .io.shared_memory import (
+    BlockHeader,
+    BlockRing,
+    PackedBlocks,
+    discard_packed,
+    pack_blocks,
+    unpack_blocks,
+)
+from .nodes import ProcessingNode
+from .pipeline import PipelineExecutionError, Slots, _NodeFailure, _run_step
+from .plan import ExecutionPlan, compile_plan
+
+ShardNodes = Callable[[List[str]], Sequence[ProcessingNode]]
+
+
+class ShardedPipeline:
+    """Run per-sensor subgraphs in worker processes and fan their outputs in.
+
+    Sensors are dealt round-robin to ``num_workers`` spawned processes. Each
+    worker builds its subgraph with ``shard_nodes(sensors)``, a picklable
+    module-level function that typically returns a
+    :class:`~.nodes.SplitSensorNode` over those sensors followed by
+    per-sensor nodes, and runs it on blocks whose ``metadata["sensors"]``
+    only holds its sensors; packed input blocks (``metadata["channels"]``)
+    are split into their sensor columns first. Sensor values reach the
+    workers through a per-worker :class:`~.io.shared_memory.BlockRing` of
+    ``slots`` slots, so at most ``slots`` blocks are in flight per worker; a
+    block too large for a slot goes through a one-off segment instead.
+
+    Worker outputs come back the same way, through a ring each worker owns
+    with ``2 * slots`` slots; a slot is handed back to its worker once the
+    block is merged, and results that find no free slot fall back to a
+    one-off segment. Blocks are merged in input order and the ``fan_in``
+    nodes (for example :class:`~.nodes.DecisionNode`) then run in this
+    process. Only outputs needed by ``fan_in`` or listed in ``output_keys``
+    are sent back, and yielded values that still point into a ring are
+    copied. Slots are reused, so shard and ``fan_in`` nodes must not keep
+    references to their input arrays across blocks; the built-in nodes copy
+    whatever state they keep. A node error stops the run with
+    :class:`~.pipeline.PipelineExecutionError`.
+    """
+
+    def __init__(
+        self,
+        dataloader: StreamDataLoader,
+        *,
+        sensors: Sequence[str],
+        shard_nodes: ShardNodes,
+        fan_in: Sequence[ProcessingNode] = (),
+        input_key: str = "input",
+        output_keys: Sequence[str] | None = None,
+        num_workers: int = 2,
+        slots: int = 4,
+        slot_bytes: int | None = None,
+    ) -> None:
+        if num_workers <= 0:
+            raise ValueError("num_workers must be positive")
+        if slots <= 0:
+            raise ValueError("slots must be positive")
+        self._dataloader = dataloader
+        self._shard_nodes = shard_nodes
+        self._input_key = input_key
+        self._slots = slots
+        self._slot_bytes = slot_bytes
+        self._shards = [list(sensors[i::num_workers]) for i in range(num_workers)]
+        self._shards = [shard for shard in self._shards if shard]
+        if not self._shards:
+            raise ValueError("sensors must not be empty")
+
+        # Build each subgraph once here only to learn which keys it produces.
+        shard_keys = [
+            [key for node in shard_nodes(shard) for key in node.produces()]
+            for shard in self._shards
+        ]
+        self._plan = compile_plan(
+            fan_in,
+            input_key=input_key,
+            output_keys=output_keys,
+            extra_inputs=[key for keys in shard_keys for key in keys],
+        )
+        wanted = {key for step in self._plan.steps for key, _ in step.inputs}
+        wanted.update(key for key, _ in self._plan.output_slots)
+        self._shard_outputs = [[key for key in keys if key in wanted] for keys in shard_keys]
+        # Plan slot of each shard output, in the order workers send them.
+        slot_of = {key: slot for slot, key in enumerate(self._plan.keys)}
+        self._shard_slots = [[slot_of[key] for key in keys] for keys in self._shard_outputs]
+
+    @property
+    def plan(self) -> ExecutionPlan:
+        """Plan of the ``fan_in`` nodes; shard outputs fill its extra input slots."""
+        return self._plan
+
+    def run(self) -> Iterator[Dict[str, BaseTimeSeries]]:
+        for node in self._plan.nodes:
+            node.reset()
+        context = multiprocessing.get_context("spawn")
+        workers: List[_Worker] = []
+        try:
+            for sensors, outputs, targets in zip(
+                self._shards, self._shard_outputs, self._shard_slots
+            ):
+                workers.append(
+                    _Worker(
+                        context,
+                        self._shard_nodes,
+                        sensors,
+                        self._input_key,
+                        outputs,
+                        targets,
+                        self._slots,
+                    )
+                )
+            yield from self._run(workers)
+        finally:
+            for worker in workers:
+                worker.stop()
+
+    def _run(self, workers: List["_Worker"]) -> Iterator[Dict[str, BaseTimeSeries]]:
+        pending: deque[tuple[int, BaseTimeSeries]] = deque()
+        for index, block in enumerate(self._dataloader):
+            channels = block.metadata.get("channels")
+            if channels is not None:
+                sensors = channels.split(block)
+            else:
+                sensors = block.metadata.get("sensors")
+            if sensors is None:
+                raise ValueError(
+                    "ShardedPipeline requires metadata['sensors'] or metadata['channels']"
+                )
+            for worker in workers:
+                missing = [sensor for sensor in worker.sensors if sensor not in sensors]
+                if missing:
+                    raise ValueError(f"Sensors {missing} not found in metadata")
+                worker.submit(
+                    index,
+                    block.timestamp,
+                    [sensors[sensor] for sensor in worker.sensors],
+                    self._slots,
+                    self._slot_bytes,
+                )
+            pending.append((index, block))
+            while pending and all(worker.ready(block=False) for worker in workers):
+                yield self._merge(*pending.popleft(), workers)
+        while pending:
+            for worker in workers:
+                worker.ready(block=True)
+            yield self._merge(*pending.popleft(), workers)
+
+    def _merge(
+        self,
+        index: int,
+        block: BaseTimeSeries,
+        workers: List["_Worker"],
+    ) -> Dict[str, BaseTimeSeries]:
+        plan = self._plan
+        slots: Slots = [None] * len(plan.keys)
+        slots[plan.input_slot] = block
+        taken = []
+        for worker in workers:
+            produced, values, out_slot = worker.results.popleft()
+            taken.append((worker, out_slot))
+            for position, value in zip(produced, values):
+                slots[worker.targets[position]] = value
+        try:
+            for step in plan.steps:
+                _run_step(step, slots)
+                for slot in step.releases:
+                    slots[slot] = None
+            outputs = {}
+            for key, slot in plan.output_slots:
+                value = slots[slot]
+                if value is None:
+                    continue
+                if any(worker.holds(value.values) for worker in workers):
+                    value = value.copy_with(deep=True)
+                outputs[key] = value
+        except _NodeFailure as failure:
+            raise PipelineExecutionError(index, failure.node.name, failure.error) from failure.error
+        finally:
+            for worker, out_slot in taken:
+                worker.release(out_slot)
+        return outputs
+
+
+class _Worker:
+    """Main-process side of one shard: its process, pipe, rings and queues."""
+
+    def __init__(
+        self,
+        context: multiprocessing.context.SpawnContext,
+        shard_nodes: ShardNodes,
+        sensors: List[str],
+        input_key: str,
+        outputs: List[str],
+        targets: List[int],
+        slots: int,
+    ) -> None:
+        self.sensors = sensors
+        self.targets = targets
+        self.results: deque[tuple[tuple[int, ...], List[BaseTimeSeries], int]] = deque()
+        self._conn, child = context.Pipe()
+        self._process: BaseProcess = context.Process(
+            target=_shard_worker,
+            args=(shard_nodes, sensors, input_key, outputs, 2 * slots, child),
+            daemon=True,
+        )
+        self._process.start()
+        child.close()
+        self._ring: BlockRing | None = None
+        self._out_ring: BlockRing | None = None
+        self._free: deque[int] = deque()
+        self._in_flight: deque[int] = deque()
+        # Output slots merged since the last submit; returned with the next block.
+        self._released: List[int] = []
+
+    def submit(
+        self,
+        index: int,
+        timestamp: datetime,
+        blocks: List[BaseTimeSeries],
+        slots: int,
+        slot_bytes: int | None,
+    ) -> None:
+        if self._ring is None:
+            needed = sum(block.values.nbytes + 64 for block in blocks)
+            self._ring = BlockRing(slots, slot_bytes or max(2 * needed, 1 << 16))
+            self._free.extend(range(slots))
+            self._conn.send(("ring", self._ring.name, slots, self._ring.slot_bytes))
+        while len(self._in_flight) >= self._ring.slots:
+            self._collect()
+
+        slot = self._free.popleft()
+        payload: tuple[BlockHeader, ...] | PackedBlocks | None = self._ring.write(slot, blocks)
+        if payload is None:
+            self._free.appendleft(slot)
+            slot = -1
+            payload = pack_blocks(blocks)
+        self._in_flight.append(slot)
+        released = tuple(self._released)
+        self._released.clear()
+        self._conn.send(("block", index, timestamp, slot, payload, released))
+
+    def ready(self, *, block: bool) -> bool:
+        """Whether the oldest submitted block's outputs have arrived."""
+        while self._in_flight and (block and not self.results or self._conn.poll()):
+            self._collect()
+        return bool(self.results)
+
+    def holds(self, values: np.ndarray) -> bool:
+        """Whether ``values`` may point into this worker's output ring."""
+        return self._out_ring is not None and self._out_ring.holds(values)
+
+    def release(self, out_slot: int) -> None:
+        """Hand a merged block's output slot back to the worker."""
+        if out_slot >= 0:
+            self._released.append(out_slot)
+
+    def _collect(self) -> None:
+        try:
+            message = self._conn.recv()
+            if message[0] == "ring":
+                _, name, slots, slot_bytes = message
+                self._out_ring = BlockRing(slots, slot_bytes, name=name)
+                message = self._conn.recv()
+        except EOFError:
+            raise RuntimeError(f"shard worker for {self.sensors} exited unexpectedly") from None
+        _, index, produced, out_slot, payload, failure = message
+        slot = self._in_flight.popleft()
+        if slot >= 0:
+            self._free.append(slot)
+        if failure is not None:
+            node_name, error = failure
+            raise PipelineExecutionError(index, node_name, error)
+        if out_slot >= 0:
+            assert self._out_ring is not None
+            values = self._out_ring.read(out_slot, payload)
+        else:
+            values = unpack_blocks(payload)
+        self.results.append((produced, values, out_slot))
+
+    def stop(self) -> None:
+        try:
+            self._conn.send(None)
+        except OSError:  # pragma: no cover - worker already gone
+            pass
+        # Keep reading so a worker blocked on a full pipe can reach the stop message.
+        while self._process.is_alive():
+            if self._conn.poll(0.05):
+                try:
+                    reply = self._conn.recv()
+                except EOFError:
+                    break
+                if reply[0] == "result" and reply[3] < 0 and reply[4] is not None:
+                    discard_packed(reply[4])
+        self._process.join()
+        self._conn.close()
+        self.results.clear()
+        for ring in (self._ring, self._out_ring):
+            if ring is not None:
+                ring.close()
+
+
+def _shard_worker(
+    shard_nodes: ShardNodes,
+    sensors: List[str],
+    input_key: str,
+    outputs: List[str],
+    out_slots: int,
+    conn: Connection,
+) -> None:
+    ring: BlockRing | None = None
+    out_ring: BlockRing | None = None
+    free: deque[int] = deque()
+    plan: ExecutionPlan | None = None
+    startup_error: Exception | None = None
+    try:
+        plan = compile_plan(shard_nodes(sensors), input_key=input_key, output_keys=outputs)
+        for node in plan.nodes:
+            node.reset()
+    except Exception as error:  # reported with the first block
+        startup_error = error
+    positions = {key: position for position, key in enumerate(outputs)}
+
+    try:
+        while (message := conn.recv()) is not None:
+            if message[0] == "ring":
+                _, name, slots, slot_bytes = message
+                ring = BlockRing(slots, slot_bytes, name=name)
+                continue
+            _, index, timestamp, slot, payload, released = message
+            free.extend(released)
+            if slot >= 0:
+                assert ring is not None
+                blocks = ring.read(slot, payload)
+            else:
+                blocks = unpack_blocks(payload)
+            try:
+                produced = _process_shard(plan, startup_error, timestamp, sensors, blocks)
+            except _ShardFailure as failure:
+                conn.send(("result", index, (), -1, None, failure.args))
+                continue
+            finally:
+                # The input slot may be rewritten as soon as the reply is read.
+                del blocks
+            values = [value for _, value in produced]
+            if out_ring is None and values:
+                needed = sum(value.values.nbytes + 64 for value in values)
+                out_ring = BlockRing(out_slots, max(2 * needed, 1 << 16))
+                free.extend(range(out_slots))
+                conn.send(("ring", out_ring.name, out_slots, out_ring.slot_bytes))
+            out_slot = -1
+            headers: tuple[BlockHeader, ...] | PackedBlocks | None = None
+            if out_ring is not None and free:
+                out_slot = free.popleft()
+                headers = out_ring.write(out_slot, values)
+                if headers is None:
+                    free.appendleft(out_slot)
+                    out_slot = -1
+            if headers is None:
+                headers = pack_blocks(values)
+            keys = tuple(positions[key] for key, _ in produced)
+            conn.send(("result", index, keys, out_slot, headers, None))
+    finally:
+        for owned in (ring, out_ring):
+            if owned is not None:
+                owned.close()
+        conn.close()
+
+
+class _ShardFailure(Exception):
+    """A shard node failed; ``args`` is ``(node_name, error)``."""
+
+
+def _process_shard(
+    plan: ExecutionPlan | None,
+    startup_error: Exception | None,
+    timestamp: datetime,
+    sensors: List[str],
+    blocks: List[BaseTimeSeries],
+) -> List[tuple[str, BaseTimeSeries]]:
+    if plan is None:
+        assert startup_error is not None
+        raise _ShardFailure("shard_nodes", _picklable(startup_error))
+    first = blocks[0]
+    slots: Slots = [None] * len(plan.keys)
+    slots[plan.input_slot] = BaseTimeSeries(
+        values=first.values,
+        sample_rate=first.sample_rate,
+        timestamp=timestamp,
+        metadata={"sensors": dict(zip(sensors, blocks))},
+    )
+    try:
+        for step in plan.steps:
+            _run_step(step, slots)
+            for slot in step.releases:
+                slots[slot] = None
+    except _NodeFailure as failure:
+        raise _ShardFailure(failure.node.name, _picklable(failure.error)) from None
+    return [(key, value) for key, slot in plan.output_slots if (value := slots[slot]) is not None]
+
+
+def _picklable(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return RuntimeError(repr(error))
+    return error
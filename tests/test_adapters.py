@@ -0,0 +1,61 @@
+"""Pytest suite for AdapterDataset."""
+
+from __future__ import annotations
+
+import struct
+from datetime import datetime, timezone
+
+import numpy as np
+
+from online_dev_environment.base import AdapterDataset, BaseTimeSeries
+
+
+def _decode(packet: object) -> BaseTimeSeries:
+    assert isinstance(packet, bytes)
+    index, *samples = struct.unpack(f"<i{(len(packet) - 4) // 4}f", packet)
+    return BaseTimeSeries(
+        values=np.asarray(samples, dtype=np.float32).reshape(-1, 2),
+        sample_rate=100.0,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        metadata={"index": index},
+    )
+
+
+def _packets(count: int) -> list[bytes]:
+    return [struct.pack("<i8f", index, *([float(index)] * 8)) for index in range(count)]
+
+
+def test_process_pool_decoding_matches_inline() -> None:
+    inline = list(AdapterDataset(_packets(23), collate_fn=_decode))
+    pooled = list(AdapterDataset(_packets(23), collate_fn=_decode, num_processes=2, chunk_size=4))
+
+    assert [b.metadata["index"] for b in pooled] == list(range(23))
+    for expected, actual in zip(inline, pooled):
+        np.testing.assert_array_equal(actual.values, expected.values)
+        assert actual.values.dtype == np.float32
+        assert not actual.values.flags.writeable
+
+
+def test_process_pool_is_kept_across_iterations() -> None:
+    dataset = AdapterDataset(_packets(10), collate_fn=_decode, num_processes=2, chunk_size=4)
+
+    first = [block.metadata["index"] for block in dataset]
+    pool = dataset._pool
+    second = [block.metadata["index"] for block in dataset]
+
+    assert first == second == list(range(10))
+    assert pool is not None and dataset._pool is pool
+    dataset.close()
+    assert dataset._pool is None
+
+
+def test_process_pool_stops_early_without_leaking() -> None:
+    dataset = AdapterDataset(lambda: iter(_packets(1_000)), collate_fn=_decode, num_processes=2)
+    iterator = iter(dataset)
+
+    first = next(iterator)
+    iterator.close()
+    dataset.close()
+
+    assert first.metadata["index"] == 0
+    np.testing.assert_array_equal(first.values, np.zeros((4, 2), dtype=np.float32))
@@ -0,0 +1,138 @@
+"""Pytest suite for AsyncDataset and PipelineOrchestrator.arun."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict
+
+import numpy as np
+
+from online_dev_environment.base import (
+    AsyncIterableDataset,
+    BaseTimeSeries,
+    IterableDataset,
+    MovingAverageNode,
+    NormalizerNode,
+    PipelineBuilder,
+    StreamDataLoader,
+)
+
+_HEADER = struct.Struct("<II")
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _packets(count: int) -> list[bytes]:
+    rng = np.random.default_rng(4)
+    packets = []
+    for index in range(count):
+        values = rng.standard_normal((32, 2)).astype(np.float32)
+        packets.append(_HEADER.pack(index, values.nbytes) + values.tobytes())
+    return packets
+
+
+def _decode(packet: object) -> BaseTimeSeries:
+    assert isinstance(packet, tuple)
+    index, payload = packet
+    return BaseTimeSeries(
+        values=np.frombuffer(payload, dtype=np.float32).reshape(-1, 2),
+        sample_rate=32.0,
+        timestamp=_START + timedelta(seconds=index),
+        metadata={"index": index},
+    )
+
+
+def _split(packet: bytes) -> tuple[int, bytes]:
+    index, _ = _HEADER.unpack_from(packet)
+    return index, packet[_HEADER.size :]
+
+
+class _OffloadedNormalizer(NormalizerNode):
+    offload = True
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        outputs = super().process(inputs)
+        self.threads.add(threading.current_thread() is threading.main_thread())
+        return outputs
+
+    def reset(self) -> None:
+        self.threads: set[bool] = set()
+
+
+def _builder(normalizer: NormalizerNode | None = None) -> PipelineBuilder:
+    builder = PipelineBuilder(input_key="raw", output_keys=["smooth"])
+    builder.add_node(normalizer or _OffloadedNormalizer("raw", "norm"))
+    builder.add_node(MovingAverageNode("norm", "smooth", window=4, streaming=True))
+    return builder
+
+
+async def _serve(packets: list[bytes]) -> tuple[asyncio.Server, int]:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        for packet in packets:
+            writer.write(packet)
+            await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_arun_over_socket_matches_run() -> None:
+    packets = _packets(20)
+    expected = [
+        out["smooth"].values.copy()
+        for out in _builder()
+        .build(StreamDataLoader(IterableDataset([_decode(_split(p)) for p in packets])))
+        .run()
+    ]
+
+    async def main() -> tuple[list[np.ndarray], list[int], set[bool]]:
+        server, port = await _serve(packets)
+        read = []
+
+        async def receive() -> AsyncIterator[object]:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            try:
+                while header := await reader.read(_HEADER.size):
+                    index, size = _HEADER.unpack(header)
+                    read.append(index)
+                    yield index, await reader.readexactly(size)
+            finally:
+                writer.close()
+
+        normalizer = _OffloadedNormalizer("raw", "norm")
+        pipeline = _builder(normalizer).build(AsyncIterableDataset(receive, collate_fn=_decode))
+        outputs = []
+        lag = []
+        async with server:
+            async for out in pipeline.arun(max_in_flight=2):
+                outputs.append(out["smooth"].values.copy())
+                lag.append(len(read) - len(outputs))
+                await asyncio.sleep(0.001)
+        return outputs, lag, normalizer.threads
+
+    outputs, lag, threads = asyncio.run(main())
+
+    assert len(outputs) == len(expected) == 20
+    for left, right in zip(outputs, expected):
+        np.testing.assert_allclose(left, right)
+    assert max(lag) <= 1
+    assert threads == {False}
+
+
+def test_arun_accepts_sync_dataloader_and_stops_early() -> None:
+    blocks = [_decode(_split(packet)) for packet in _packets(50)]
+    pipeline = _builder().build(StreamDataLoader(IterableDataset(blocks)))
+
+    async def main() -> list[int]:
+        seen = []
+        async for out in pipeline.arun(changed_only=True, view=True):
+            seen.append(out["smooth"].block_size)
+            if len(seen) == 3:
+                break
+        return seen
+
+    assert asyncio.run(main()) == [32, 32, 32]
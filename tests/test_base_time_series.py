@@ -77,3 +77,39 @@ def test_invalid_values_raise() -> None:
             timestamp=now,
             metadata={},
         )
+
+
+def test_values_are_read_only_without_freezing_caller_array() -> None:
+    source = np.zeros((4, 1))
+    block = BaseTimeSeries(
+        values=source,
+        sample_rate=10.0,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+    assert not block.values.flags.writeable
+    assert source.flags.writeable
+    assert np.shares_memory(block.values, source)
+    with pytest.raises(ValueError):
+        block.values[0, 0] = 1.0
+
+
+def test_copy_with_metadata_only_shares_values() -> None:
+    block = _make_block()
+
+    derived = block.copy_with(metadata={"sensor": "accelerometer", "gain": 2.0})
+
+    assert derived.values is block.values
+    assert derived.metadata["gain"] == 2.0
+    assert "gain" not in block.metadata
+
+
+def test_copy_with_deep_copies_values() -> None:
+    block = _make_block()
+
+    copied = block.copy_with(deep=True)
+
+    np.testing.assert_array_equal(copied.values, block.values)
+    assert not np.shares_memory(copied.values, block.values)
+    assert copied.metadata == block.metadata
+    assert copied.metadata is not block.metadata
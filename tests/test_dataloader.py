@@ -0,0 +1,85 @@
+"""Pytest suite for StreamDataLoader."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from online_dev_environment.base import AdapterDataset, BaseTimeSeries, StreamDataLoader
+
+
+def _collate(index: object) -> BaseTimeSeries:
+    assert isinstance(index, int)
+    # Later samples finish first so ordering is actually exercised.
+    time.sleep(0.001 * (5 - index % 5))
+    return BaseTimeSeries(
+        values=np.full((4, 1), float(index)),
+        sample_rate=10.0,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        metadata={"index": index},
+    )
+
+
+def _loader_threads() -> list[threading.Thread]:
+    return [thread for thread in threading.enumerate() if thread.name.startswith("StreamDataLoader")]
+
+
+@pytest.mark.parametrize("num_workers", [1, 4])
+def test_prefetch_keeps_order_and_max_blocks(num_workers: int) -> None:
+    dataset = AdapterDataset(lambda: range(20), collate_fn=_collate)
+    loader = StreamDataLoader(dataset, prefetch=3, num_workers=num_workers, max_blocks=12)
+
+    indices = [block.metadata["index"] for block in loader]
+
+    assert indices == list(range(12))
+
+
+def test_prefetch_propagates_worker_errors() -> None:
+    def collate(sample: object) -> BaseTimeSeries:
+        if sample == 3:
+            raise RuntimeError("bad sample")
+        return _collate(sample)
+
+    loader = StreamDataLoader(AdapterDataset(range(10), collate_fn=collate), prefetch=2, num_workers=2)
+
+    seen = []
+    with pytest.raises(RuntimeError, match="bad sample"):
+        for block in loader:
+            seen.append(block.metadata["index"])
+    assert seen == [0, 1, 2]
+    assert not _loader_threads()
+
+
+def test_prefetch_stops_workers_when_consumer_breaks() -> None:
+    dataset = AdapterDataset(lambda: iter(range(10_000)), collate_fn=_collate)
+    iterator = iter(StreamDataLoader(dataset, prefetch=4, num_workers=2))
+
+    assert next(iterator).metadata["index"] == 0
+    iterator.close()
+
+    assert not _loader_threads()
+
+
+def test_prefetch_close_does_not_wait_for_a_stalled_dataset() -> None:
+    release = threading.Event()
+
+    def samples():
+        yield 0
+        release.wait(10.0)
+        yield 1
+
+    iterator = iter(StreamDataLoader(AdapterDataset(samples, collate_fn=_collate), prefetch=2))
+    assert next(iterator).metadata["index"] == 0
+
+    start = time.perf_counter()
+    iterator.close()
+    elapsed = time.perf_counter() - start
+    release.set()
+    for thread in _loader_threads():
+        thread.join()
+
+    assert elapsed < 2.0
@@ -0,0 +1,124 @@
+"""Pytest suite for the dataset implementations."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from online_dev_environment.base import BaseTimeSeries, MemmapDataset, MultiSensorDataset
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _stream(sample_rate: float, block_size: int, count: int, offset: float = 0.0) -> list[BaseTimeSeries]:
+    return [
+        BaseTimeSeries(
+            values=np.full((block_size, 1), index, dtype=float),
+            sample_rate=sample_rate,
+            timestamp=_START + timedelta(seconds=offset + index * block_size / sample_rate),
+        )
+        for index in range(count)
+    ]
+
+
+def test_memmap_npy_blocks_view_the_file(tmp_path: Path) -> None:
+    recording = np.arange(50, dtype=np.float32).reshape(25, 2)
+    path = tmp_path / "recording.npy"
+    np.save(path, recording)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    dataset = MemmapDataset(path, sample_rate=10.0, block_size=10, start_time=start)
+    blocks = list(dataset)
+
+    assert len(dataset) == 3
+    assert [block.block_size for block in blocks] == [10, 10, 5]
+    np.testing.assert_array_equal(np.concatenate([b.values for b in blocks]), recording)
+    assert isinstance(blocks[1].values.base, np.memmap)
+    assert blocks[2].timestamp == start + timedelta(seconds=2.0)
+    assert blocks[2].metadata["sample_offset"] == 20
+
+
+def test_memmap_raw_interleaved_binary(tmp_path: Path) -> None:
+    recording = np.arange(36, dtype="<i2").reshape(12, 3)
+    path = tmp_path / "recording.bin"
+    path.write_bytes(b"HDR!" + recording.tobytes())
+
+    dataset = MemmapDataset(
+        path,
+        sample_rate=100.0,
+        block_size=5,
+        dtype="<i2",
+        channels=3,
+        header_bytes=4,
+        drop_last=True,
+    )
+
+    assert len(dataset) == 2
+    blocks = list(dataset)
+    np.testing.assert_array_equal(blocks[1].values, recording[5:10])
+    assert not blocks[1].values.flags.writeable
+
+
+def test_multisensor_groups_by_timestamp_within_tolerance() -> None:
+    sensors = {"a": _stream(10.0, 10, 4), "b": _stream(10.0, 10, 4, offset=0.02)}
+
+    blocks = list(MultiSensorDataset(sensors, tolerance=0.05))
+
+    assert len(blocks) == 4
+    assert [block.timestamp for block in blocks] == [b.timestamp for b in sensors["a"]]
+    for index, block in enumerate(blocks):
+        assert block.metadata["sensors"]["b"] is sensors["b"][index]
+
+
+def test_multisensor_skips_groups_missing_a_sensor() -> None:
+    sensors = {"a": _stream(10.0, 10, 3), "b": _stream(10.0, 10, 3, offset=0.5)}
+
+    strict = list(MultiSensorDataset(sensors, tolerance=0.1))
+    partial = list(MultiSensorDataset(sensors, tolerance=0.1, partial=True))
+
+    assert strict == []
+    assert len(partial) == 6
+    assert [list(block.metadata["sensors"]) for block in partial[:2]] == [["a"], ["b"]]
+
+
+def test_multisensor_window_concatenates_faster_sensors() -> None:
+    sensors = {"slow": _stream(10.0, 10, 3), "fast": _stream(40.0, 10, 12)}
+
+    blocks = list(MultiSensorDataset(sensors, window=1.0))
+
+    assert len(blocks) == 3
+    fast = blocks[1].metadata["sensors"]["fast"]
+    assert fast.block_size == 40
+    assert fast.metadata["merged_blocks"] == 4
+    np.testing.assert_array_equal(fast.values[::10, 0], [4, 5, 6, 7])
+    assert blocks[1].metadata["sensors"]["slow"] is sensors["slow"][1]
+
+
+def test_multisensor_packed_blocks_hold_sensors_side_by_side() -> None:
+    wide = [
+        block.copy_with(values=-np.repeat(block.values, 3, axis=1)) for block in _stream(10.0, 10, 3)
+    ]
+    sensors = {"a": _stream(10.0, 10, 3), "b": wide}
+
+    blocks = list(MultiSensorDataset(sensors, packed=True))
+
+    assert len(blocks) == 3
+    index = blocks[0].metadata["channels"]
+    assert index.sensors == ("a", "b")
+    assert index.columns("b") == slice(1, 4)
+    assert all(block.metadata["channels"] is index for block in blocks)
+    for block, a, b in zip(blocks, sensors["a"], wide):
+        assert block.values.shape == (10, 4)
+        assert list(block.metadata) == ["channels"]
+        np.testing.assert_array_equal(block.values[:, index.columns("a")], a.values)
+        np.testing.assert_array_equal(block.values[:, index.columns("b")], b.values)
+
+
+def test_multisensor_packed_requires_equal_sample_counts() -> None:
+    sensors = {"slow": _stream(10.0, 10, 3), "fast": _stream(20.0, 10, 6)}
+
+    with pytest.raises(ValueError, match="fast"):
+        list(MultiSensorDataset(sensors, window=1.0, packed=True))
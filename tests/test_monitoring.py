@@ -0,0 +1,174 @@
+"""Pytest suite for pipeline monitors."""
+
+from __future__ import annotations
+
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+
+import numpy as np
+import pytest
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    IterableDataset,
+    MemoryMonitor,
+    NormalizerNode,
+    PipelineBuilder,
+    ProfilingMonitor,
+    SlidingWindowNode,
+    StreamDataLoader,
+)
+from online_dev_environment.base.monitoring import LatencyHistogram
+from online_dev_environment.base.nodes import ProcessingNode
+
+
+def test_histogram_percentiles_within_bucket_error() -> None:
+    histogram = LatencyHistogram()
+    durations = np.arange(1, 100_001) * 1_000
+    for duration in durations:
+        histogram.record(int(duration))
+
+    stats = histogram.stats()
+
+    assert stats.count == durations.size
+    assert stats.p50_seconds == pytest.approx(np.percentile(durations, 50) / 1e9, rel=0.07)
+    assert stats.p99_seconds == pytest.approx(np.percentile(durations, 99) / 1e9, rel=0.07)
+    assert stats.max_seconds == pytest.approx(durations[-1] / 1e9)
+
+
+def test_histogram_memory_is_constant() -> None:
+    histogram = LatencyHistogram()
+    buckets = len(histogram._counts)
+    for duration in (0, 1, 10**3, 10**9, 10**15):
+        histogram.record(duration)
+
+    assert len(histogram._counts) == buckets
+    assert histogram.stats().max_seconds == pytest.approx(1e6)
+
+
+def test_profiling_monitor_reports_each_node() -> None:
+    block = BaseTimeSeries(
+        values=np.ones((8, 1)),
+        sample_rate=8.0,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    builder = PipelineBuilder()
+    builder.add_node(NormalizerNode("input", "a"))
+    builder.add_node(NormalizerNode("a", "b"))
+    monitor = ProfilingMonitor(live_bytes=True)
+    pipeline = builder.build(StreamDataLoader(IterableDataset([block] * 5)), monitor=monitor)
+
+    list(pipeline.run())
+
+    stats = monitor.node_stats()
+    assert set(stats) == {"NormalizerNode[a]", "NormalizerNode[b]"}
+    assert all(node.count == 5 for node in stats.values())
+    assert monitor.block_stats().count == 5
+    assert monitor.blocks_per_second > 0
+    assert "NormalizerNode[a]" in monitor.format_report()
+    # Without output_keys nothing is released: the input, "a" and "b".
+    assert monitor.peak_live_bytes == 3 * block.values.nbytes
+    assert "peak live MB/block" in monitor.format_report()
+
+
+class _HoardingNode(ProcessingNode):
+    """Keeps a copy of every input, like a buffer that is never trimmed."""
+
+    def requires(self) -> Iterable[str]:
+        return ["input"]
+
+    def produces(self) -> Iterable[str]:
+        return ["hoard"]
+
+    def reset(self) -> None:
+        self.kept: list[np.ndarray] = []
+
+    def state_nbytes(self) -> int:
+        return super().state_nbytes() + sum(values.nbytes for values in self.kept)
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        self.kept.append(inputs["input"].values.copy())
+        return {"hoard": inputs["input"]}
+
+
+def test_memory_monitor_samples_allocations_and_state() -> None:
+    block = BaseTimeSeries(
+        values=np.ones((1024, 2)),
+        sample_rate=100.0,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    builder = PipelineBuilder()
+    builder.add_node(NormalizerNode("input", "norm"))
+    builder.add_node(SlidingWindowNode("norm", "window", window_seconds=1.0, hop_seconds=0.5))
+    builder.add_node(_HoardingNode(name="hoard"))
+    monitor = MemoryMonitor(every=3)
+    pipeline = builder.build(StreamDataLoader(IterableDataset([block] * 7)), monitor=monitor)
+
+    for _ in pipeline.run():
+        pass
+
+    stats = monitor.node_stats()
+    assert set(stats) == {"NormalizerNode", "SlidingWindowNode", "hoard"}
+    # Blocks 0, 3 and 6 are sampled.
+    assert all(node.samples == 3 for node in stats.values())
+    assert stats["hoard"].last_retained_bytes >= block.values.nbytes
+    assert stats["hoard"].state_bytes == 7 * block.values.nbytes
+    assert stats["NormalizerNode"].state_bytes == block.values.nbytes
+    assert stats["SlidingWindowNode"].state_bytes > 0
+    assert not tracemalloc.is_tracing()
+    assert "hoard" in monitor.format_report()
+
+
+def test_memory_monitor_samples_micro_batches() -> None:
+    block = BaseTimeSeries(
+        values=np.ones((1024, 2)),
+        sample_rate=100.0,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    builder = PipelineBuilder()
+    builder.add_node(NormalizerNode("input", "norm"))
+    builder.add_node(_HoardingNode(name="hoard"))
+    monitor = MemoryMonitor(every=4)
+    pipeline = builder.build(
+        StreamDataLoader(IterableDataset([block] * 8)), monitor=monitor, batch_blocks=4
+    )
+
+    for _ in pipeline.run():
+        pass
+
+    stats = monitor.node_stats()
+    # Both micro-batches start on a sampled block.
+    assert all(node.samples == 2 for node in stats.values())
+    assert stats["NormalizerNode"].allocated_bytes >= 2 * 4 * block.values.nbytes
+    assert stats["hoard"].retained_bytes >= 2 * 4 * block.values.nbytes
+    assert stats["hoard"].state_bytes == 8 * block.values.nbytes
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_monitor_samples_every_node_of_a_level() -> None:
+    block = BaseTimeSeries(
+        values=np.ones((1024, 2)),
+        sample_rate=100.0,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    builder = PipelineBuilder()
+    builder.add_node(NormalizerNode("input", "norm"))
+    builder.add_node(_HoardingNode(name="hoard"))
+    builder.add_node(SlidingWindowNode("norm", "window", window_seconds=1.0, hop_seconds=0.5))
+    monitor = MemoryMonitor()
+    pipeline = builder.build(
+        StreamDataLoader(IterableDataset([block] * 4)), monitor=monitor, max_workers=2
+    )
+
+    for _ in pipeline.run():
+        pass
+
+    stats = monitor.node_stats()
+    assert {label: node.samples for label, node in stats.items()} == {
+        "NormalizerNode": 4,
+        "hoard": 4,
+        "SlidingWindowNode": 4,
+    }
+    assert stats["hoard"].retained_bytes >= 4 * block.values.nbytes
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,254 @@
+"""Pytest suite for the built-in processing nodes."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+import pytest
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    DecisionNode,
+    MovingAverageNode,
+    NormalizerNode,
+    SlidingWindowNode,
+    SpectrogramNode,
+)
+from online_dev_environment.base.nodes import ProcessingNode
+
+
+def _block(values: np.ndarray, sample_rate: float = 10.0) -> BaseTimeSeries:
+    return BaseTimeSeries(
+        values=values,
+        sample_rate=sample_rate,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        metadata={"sensor": "accelerometer"},
+    )
+
+
+def test_sliding_window_emits_hopped_windows() -> None:
+    node = SlidingWindowNode("x", "w", window_seconds=0.5, hop_seconds=0.2)
+    signal = np.arange(30.0).reshape(-1, 1)
+
+    windows = []
+    for start in range(0, 30, 2):
+        out = node.process({"x": _block(signal[start : start + 2])})
+        if "w" in out:
+            assert out["w"].values.shape == (1, 5, 1)
+            windows.append(out["w"].values[0, :, 0].copy())
+
+    assert len(windows) == 13
+    for index, window in enumerate(windows):
+        np.testing.assert_array_equal(window, np.arange(2 * index, 2 * index + 5))
+
+
+def test_sliding_window_reset_clears_state() -> None:
+    node = SlidingWindowNode("x", "w", window_seconds=0.2, hop_seconds=0.1)
+    node.process({"x": _block(np.ones((1, 1)))})
+    node.reset()
+
+    assert node.process({"x": _block(np.zeros((1, 1)))}) == {}
+    out = node.process({"x": _block(np.zeros((1, 1)))})
+    np.testing.assert_array_equal(out["w"].values, np.zeros((1, 2, 1)))
+    np.testing.assert_array_equal(out["w"].metadata["window_offsets"], [0])
+
+
+def test_sliding_window_emits_all_ready_windows_per_block() -> None:
+    node = SlidingWindowNode("x", "w", window_seconds=0.8, hop_seconds=0.2)
+    signal = np.arange(200.0).reshape(-1, 2)
+    blocks = _stream(signal, [3, 40, 1, 56], sample_rate=10.0)
+
+    outputs = [node.process({"x": block}).get("w") for block in blocks]
+
+    assert outputs[0] is None
+    emitted = [out for out in outputs if out is not None]
+    assert [out.values.shape for out in emitted] == [(18, 8, 2), (1, 8, 2), (28, 8, 2)]
+    offsets = np.concatenate([out.metadata["window_offsets"] for out in emitted])
+    np.testing.assert_array_equal(offsets, np.arange(0, 93, 2))
+    stacked = np.concatenate([out.values for out in emitted])
+    for offset, window in zip(offsets, stacked):
+        np.testing.assert_array_equal(window, signal[offset : offset + 8])
+    for out in emitted:
+        first = out.metadata["window_offsets"][0]
+        assert out.timestamp == blocks[0].timestamp + timedelta(seconds=first / 10.0)
+    assert len(node._ring) < 8 + 2
+
+
+@pytest.mark.parametrize("sizes", [[2] * 20, [1, 6, 3, 2, 9, 1, 18]])
+def test_sliding_window_hop_longer_than_window_and_blocks(sizes: list[int]) -> None:
+    node = SlidingWindowNode("x", "w", window_seconds=0.2, hop_seconds=0.5)
+    signal = np.arange(40.0).reshape(-1, 1)
+    blocks = _stream(signal, sizes, sample_rate=10.0)
+
+    emitted = [out["w"] for block in blocks if (out := node.process({"x": block}))]
+
+    offsets = np.concatenate([out.metadata["window_offsets"] for out in emitted])
+    np.testing.assert_array_equal(offsets, np.arange(0, 39, 5))
+    stacked = np.concatenate([out.values for out in emitted])
+    for offset, window in zip(offsets, stacked):
+        np.testing.assert_array_equal(window, signal[offset : offset + 2])
+    for out in emitted:
+        first = out.metadata["window_offsets"][0]
+        assert out.timestamp == blocks[0].timestamp + timedelta(seconds=first / 10.0)
+
+
+def test_sliding_window_kept_windows_survive_later_blocks() -> None:
+    node = SlidingWindowNode("x", "w", window_seconds=0.4, hop_seconds=0.3)
+    signal = np.arange(60.0).reshape(-1, 1)
+
+    kept = []
+    for start in range(0, 60, 3):
+        out = node.process({"x": _block(signal[start : start + 3])})
+        if "w" in out:
+            kept.extend(out["w"].values)
+
+    assert len(kept) == 19
+    for index, window in enumerate(kept):
+        np.testing.assert_array_equal(window[:, 0], np.arange(3 * index, 3 * index + 4))
+
+
+def test_moving_average_streaming_is_seamless_across_blocks() -> None:
+    rng = np.random.default_rng(0)
+    signal = rng.standard_normal((40, 3))
+    node = MovingAverageNode("x", "y", window=5, streaming=True)
+
+    chunks = [
+        node.process({"x": _block(signal[start : start + size])})["y"].values
+        for start, size in [(0, 2), (2, 13), (15, 1), (16, 24)]
+    ]
+    streamed = np.concatenate(chunks, axis=0)
+
+    expected = np.array(
+        [signal[max(i - 4, 0) : i + 1].mean(axis=0) for i in range(signal.shape[0])]
+    )
+    np.testing.assert_allclose(streamed, expected)
+
+
+def test_moving_average_block_mode_matches_convolution() -> None:
+    signal = np.arange(20.0).reshape(10, 2)
+    node = MovingAverageNode("x", "y", window=3)
+
+    smoothed = node.process({"x": _block(signal)})["y"].values
+
+    valid = np.stack(
+        [np.convolve(signal[:, c], np.ones(3) / 3, mode="valid") for c in range(2)], axis=1
+    )
+    np.testing.assert_allclose(smoothed[2:], valid)
+    np.testing.assert_allclose(smoothed[:2], np.repeat(valid[:1], 2, axis=0))
+
+
+def _stream(signal: np.ndarray, sizes: list[int], sample_rate: float) -> list[BaseTimeSeries]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    bounds = np.cumsum([0, *sizes])
+    return [
+        BaseTimeSeries(
+            values=signal[lo:hi],
+            sample_rate=sample_rate,
+            timestamp=start + timedelta(seconds=lo / sample_rate),
+        )
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+@pytest.mark.parametrize("frame_length, hop", [(16, 4), (8, 12)])
+def test_spectrogram_frames_span_blocks(frame_length: int, hop: int) -> None:
+    rng = np.random.default_rng(1)
+    signal = rng.standard_normal((200, 2))
+    node = SpectrogramNode("x", "s", frame_length=frame_length, hop=hop)
+
+    outputs = []
+    for block in _stream(signal, [7, 30, 3, 64, 1, 50, 45], sample_rate=100.0):
+        out = node.process({"x": block})
+        if "s" in out:
+            outputs.append(out["s"])
+
+    starts = range(0, signal.shape[0] - frame_length + 1, hop)
+    window = np.hanning(frame_length + 1)[:frame_length, None]
+    expected = np.stack(
+        [np.abs(np.fft.rfft(signal[i : i + frame_length] * window, axis=0)) for i in starts]
+    )
+    actual = np.concatenate([spec.values for spec in outputs])
+    assert actual.shape == (len(starts), frame_length // 2 + 1, 2)
+    np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+    first_frames = np.cumsum([0] + [spec.block_size for spec in outputs[:-1]]) * hop
+    for spec, frame in zip(outputs, first_frames):
+        assert spec.timestamp == outputs[0].timestamp + timedelta(seconds=frame / 100.0)
+        assert spec.sample_rate == 100.0 / hop
+    assert outputs[0].timestamp == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert outputs[0].metadata["frequencies_hz"] is outputs[-1].metadata["frequencies_hz"]
+    np.testing.assert_allclose(
+        outputs[0].metadata["frequencies_hz"], np.fft.rfftfreq(frame_length, d=0.01)
+    )
+
+
+def test_buffer_is_reused_only_after_release() -> None:
+    node = ProcessingNode()
+    first = node.buffer("y", (4, 2), np.float32)
+    second = node.buffer("y", (4, 2), np.float32)
+    assert not np.shares_memory(first, second)
+
+    node.release_buffers()
+    assert node.buffer("y", (4, 2), np.float32) is second
+    assert node.buffer("y", (4, 2), np.float32) is not second
+
+    node.release_buffers()
+    assert node.buffer("y", (4, 3), np.float32).shape == (4, 3)
+
+
+def test_streaming_nodes_match_when_buffers_are_released() -> None:
+    rng = np.random.default_rng(2)
+    blocks = _stream(rng.standard_normal((300, 2)), [7, 30, 3, 64, 1, 50, 45, 50, 50], 100.0)
+
+    def run(keep: bool) -> list[np.ndarray]:
+        nodes = [
+            MovingAverageNode("x", "y", window=6, streaming=True),
+            SpectrogramNode("y", "s", frame_length=16, hop=4),
+        ]
+        results = []
+        for block in blocks:
+            outputs = {"x": block}
+            for node in nodes:
+                if not keep:
+                    node.release_buffers()
+                outputs.update(node.process(outputs))
+            for key in ("y", "s"):
+                if key in outputs:
+                    results.append(outputs[key].values if keep else outputs[key].values.copy())
+        return results
+
+    for kept, copied in zip(run(keep=True), run(keep=False), strict=True):
+        np.testing.assert_array_equal(kept, copied)
+
+
+def _float32_nodes() -> list:
+    return [
+        NormalizerNode("x", "y"),
+        MovingAverageNode("x", "y", window=4),
+        MovingAverageNode("x", "y", window=4, streaming=True),
+        SlidingWindowNode("x", "y", window_seconds=0.8, hop_seconds=0.4),
+        SpectrogramNode("x", "y", frame_length=8, hop=4),
+        DecisionNode(["x"], "y"),
+    ]
+
+
+@pytest.mark.parametrize("node", _float32_nodes(), ids=lambda node: node.name)
+def test_nodes_keep_float32_inputs(node) -> None:
+    block = _block(np.random.default_rng(2).standard_normal((16, 3)).astype(np.float32))
+
+    out = node.process({"x": block})["y"]
+
+    assert out.values.dtype == np.float32
+
+
+@pytest.mark.parametrize("node", _float32_nodes(), ids=lambda node: node.name)
+def test_node_dtype_policy_converts_outputs(node) -> None:
+    converting = node.with_dtype(np.float32)
+    block = _block(np.arange(48, dtype=np.int16).reshape(16, 3))
+
+    out = converting.process({"x": block})["y"]
+
+    assert out.values.dtype == np.float32
+    assert node.dtype is None
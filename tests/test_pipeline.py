@@ -0,0 +1,515 @@
+"""Pytest suite for pipeline building and orchestration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+
+import numpy as np
+import pytest
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    DecisionNode,
+    IterableDataset,
+    MovingAverageNode,
+    MultiSensorDataset,
+    NormalizerNode,
+    PipelineBuilder,
+    PipelineExecutionError,
+    ResultsView,
+    SlidingWindowNode,
+    SpectrogramNode,
+    SplitSensorNode,
+    StreamDataLoader,
+)
+from online_dev_environment.base.monitoring import BlockSummary, PipelineMonitor
+from online_dev_environment.base.nodes import ProcessingNode
+from online_dev_environment.base.pipeline import resolve_levels
+from online_dev_environment.base.plan import compile_plan
+
+SENSORS = ["sensor_a", "sensor_b", "sensor_c"]
+
+
+def _sensor_blocks(num_blocks: int = 12, block_size: int = 32) -> dict[str, list[BaseTimeSeries]]:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rng = np.random.default_rng(0)
+    return {
+        sensor: [
+            BaseTimeSeries(
+                values=rng.standard_normal((block_size, 2)),
+                sample_rate=32.0,
+                timestamp=now,
+                metadata={"sensor": sensor, "block_index": idx},
+            )
+            for idx in range(num_blocks)
+        ]
+        for sensor in SENSORS
+    }
+
+
+def _builder(output_keys: list[str] | None = None, dtype: type | None = None) -> PipelineBuilder:
+    builder = PipelineBuilder(input_key="multi", output_keys=output_keys, dtype=dtype)
+    builder.add_node(SplitSensorNode("multi", SENSORS))
+    for sensor in SENSORS:
+        builder.add_node(NormalizerNode(f"{sensor}_raw", f"{sensor}_norm"))
+        builder.add_node(
+            SlidingWindowNode(
+                f"{sensor}_norm",
+                f"{sensor}_window",
+                window_seconds=3.0,
+                hop_seconds=1.0,
+            )
+        )
+    builder.add_node(DecisionNode([f"{sensor}_window" for sensor in SENSORS]))
+    return builder
+
+
+def _snapshot(outputs: Dict[str, BaseTimeSeries]) -> list[tuple[str, np.ndarray]]:
+    return [(key, block.values.copy()) for key, block in outputs.items()]
+
+
+def test_resolve_levels_groups_independent_branches() -> None:
+    nodes = _builder()._nodes
+    levels = resolve_levels(nodes, available={"multi"})
+    plan = compile_plan(nodes, input_key="multi")
+
+    assert [len(level) for level in levels] == [1, 3, 3, 1]
+    assert isinstance(levels[-1][0], DecisionNode)
+    assert [[step.node for step in level] for level in plan.levels] == levels
+
+
+def test_parallel_run_matches_serial() -> None:
+    sensors = _sensor_blocks()
+    serial = _builder().build(StreamDataLoader(MultiSensorDataset(sensors)))
+    parallel = _builder().build(StreamDataLoader(MultiSensorDataset(sensors)), max_workers=4)
+
+    serial_results = [_snapshot(outputs) for outputs in serial.run()]
+    parallel_results = [_snapshot(outputs) for outputs in parallel.run()]
+
+    assert len(serial_results) == len(parallel_results) == 12
+    for expected, actual in zip(serial_results, parallel_results):
+        assert [key for key, _ in expected] == [key for key, _ in actual]
+        for (_, want), (_, got) in zip(expected, actual):
+            np.testing.assert_array_equal(want, got)
+
+
+def test_levels_overwrite_a_key_only_after_its_readers() -> None:
+    def nodes() -> list[ProcessingNode]:
+        return [
+            NormalizerNode("input", "k"),
+            MovingAverageNode("k", "a", window=2),
+            MovingAverageNode("input", "k", window=3),
+        ]
+
+    levels = resolve_levels(nodes(), available={"input"})
+    assert [len(level) for level in levels] == [1, 1, 1]
+
+    blocks = _sensor_blocks()["sensor_a"]
+    results = []
+    for max_workers in (1, 2):
+        builder = PipelineBuilder(output_keys=["a", "k"])
+        for node in nodes():
+            builder.add_node(node)
+        pipeline = builder.build(StreamDataLoader(IterableDataset(blocks)), max_workers=max_workers)
+        results.append([_snapshot(outputs) for outputs in pipeline.run()])
+    for expected, actual in zip(*results, strict=True):
+        for (_, want), (_, got) in zip(expected, actual, strict=True):
+            np.testing.assert_array_equal(want, got)
+
+
+class _FailingNode(ProcessingNode):
+    def requires(self) -> Iterable[str]:
+        return ["input"]
+
+    def produces(self) -> Iterable[str]:
+        return ["boom"]
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        raise RuntimeError("boom")
+
+
+def test_parallel_run_reports_failing_node() -> None:
+    block = _sensor_blocks(num_blocks=1)["sensor_a"][0]
+    builder = PipelineBuilder()
+    builder.add_node(NormalizerNode("input"))
+    builder.add_node(_FailingNode(name="failing"))
+    pipeline = builder.build(StreamDataLoader(IterableDataset([block])), max_workers=2)
+
+    with pytest.raises(PipelineExecutionError) as excinfo:
+        list(pipeline.run())
+    assert excinfo.value.node_name == "failing"
+
+
+def test_compiled_plan_resolves_slots_once() -> None:
+    plan = _builder().build(StreamDataLoader(IterableDataset([]))).plan
+
+    assert plan.keys[plan.input_slot] == "multi"
+    for step in plan.steps:
+        for key, slot in step.inputs:
+            assert plan.keys[slot] == key
+        for key, slot in step.outputs.items():
+            assert plan.keys[slot] == key
+
+
+def test_build_prunes_nodes_not_feeding_outputs() -> None:
+    full = _builder().build(StreamDataLoader(MultiSensorDataset(_sensor_blocks())))
+    pruned = _builder(["sensor_a_window"]).build(StreamDataLoader(MultiSensorDataset(_sensor_blocks())))
+
+    kept = [step.label for step in pruned.plan.steps]
+    assert len(kept) == 3
+    assert all("sensor_b" not in label and "sensor_c" not in label for label in kept[1:])
+    assert len(pruned.plan.report.pruned) == len(full.plan.steps) - 3
+    assert "DecisionNode" in pruned.plan.report.pruned
+    assert full.plan.report.pruned == ()
+
+    expected = [out["sensor_a_window"].values for out in full.run() if "sensor_a_window" in out]
+    actual = [out["sensor_a_window"].values for out in pruned.run() if out]
+    assert len(actual) == len(expected) > 0
+    for left, right in zip(actual, expected):
+        np.testing.assert_array_equal(left, right)
+
+
+class _SummaryMonitor(PipelineMonitor):
+    live_bytes = True
+
+    def __init__(self) -> None:
+        self.summaries: list[BlockSummary] = []
+
+    def on_block_start(self, block_index: int) -> None:
+        return
+
+    def on_block_end(self, summary: BlockSummary) -> None:
+        self.summaries.append(summary)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_intermediates_are_released_after_last_consumer(max_workers: int) -> None:
+    blocks = _sensor_blocks(num_blocks=3, block_size=64)["sensor_a"]
+
+    def build(output_keys: list[str] | None, monitor: PipelineMonitor):
+        builder = PipelineBuilder(input_key="raw", output_keys=output_keys)
+        key = "raw"
+        for depth in range(6):
+            builder.add_node(MovingAverageNode(key, f"ma{depth}", window=3))
+            key = f"ma{depth}"
+        # ma0 stays alive until the decision reads it.
+        builder.add_node(DecisionNode(["ma0", key]))
+        return builder.build(
+            StreamDataLoader(IterableDataset(blocks)),
+            monitor=monitor,
+            max_workers=max_workers,
+        )
+
+    full_monitor, pruned_monitor = _SummaryMonitor(), _SummaryMonitor()
+    full = list(build(None, full_monitor).run())
+    pipeline = build(["decision"], pruned_monitor)
+    pruned = list(pipeline.run())
+
+    plan = pipeline.plan
+    released = {plan.keys[slot]: step.label for step in plan.steps for slot in step.releases}
+    assert released == {
+        "raw": "MovingAverageNode[ma0]",
+        "ma0": "DecisionNode",
+        **{f"ma{depth}": f"MovingAverageNode[ma{depth + 1}]" for depth in range(1, 5)},
+        "ma5": "DecisionNode",
+    }
+    for left, right in zip(pruned, full, strict=True):
+        np.testing.assert_array_equal(left["decision"].values, right["decision"].values)
+
+    block_bytes = blocks[0].values.nbytes
+    decision_bytes = full[0]["decision"].values.nbytes
+    for summary in pruned_monitor.summaries:
+        assert summary.outputs is not None and set(summary.outputs) == {"decision"}
+        # ma0, the previous average and the one being computed.
+        assert summary.peak_live_bytes == 3 * block_bytes
+    for summary in full_monitor.summaries:
+        assert summary.peak_live_bytes == 7 * block_bytes + decision_bytes
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_build_merges_duplicate_nodes(max_workers: int) -> None:
+    builder = PipelineBuilder(input_key="multi", output_keys=["a_ma", "b_ma", "c_ma", "decision"])
+    builder.add_node(SplitSensorNode("multi", SENSORS))
+    builder.add_node(NormalizerNode("sensor_a_raw", "a_norm"))
+    builder.add_node(NormalizerNode("sensor_a_raw", "b_norm"))
+    builder.add_node(MovingAverageNode("a_norm", "a_ma", window=4))
+    builder.add_node(MovingAverageNode("b_norm", "b_ma", window=4))
+    builder.add_node(MovingAverageNode("b_norm", "c_ma", window=8))
+    builder.add_node(DecisionNode(["a_ma", "c_ma"]))
+    pipeline = builder.build(
+        StreamDataLoader(MultiSensorDataset(_sensor_blocks())),
+        max_workers=max_workers,
+    )
+
+    assert pipeline.plan.report.merged == (
+        ("NormalizerNode[b_norm]", "NormalizerNode[a_norm]"),
+        ("MovingAverageNode[b_ma]", "MovingAverageNode[a_ma]"),
+    )
+    assert len(pipeline.plan.steps) == 5
+    outputs = list(pipeline.run())
+    assert len(outputs) == 12
+    for out in outputs:
+        assert out["b_ma"] is out["a_ma"]
+        assert out["c_ma"] is not out["a_ma"]
+
+
+class _GainNode(NormalizerNode):
+    def __init__(self, key_in: str, key_out: str, gain: float) -> None:
+        super().__init__(key_in, key_out)
+        self.gain = gain
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        block = inputs[self._key_in]
+        return {self._key_out: block.copy_with(values=block.values * self.gain)}
+
+
+def test_build_does_not_merge_subclasses_without_their_own_signature() -> None:
+    block = _sensor_blocks(num_blocks=1)["sensor_a"][0]
+    builder = PipelineBuilder(output_keys=["x2", "x10"])
+    builder.add_node(_GainNode("input", "x2", gain=2.0))
+    builder.add_node(_GainNode("input", "x10", gain=10.0))
+    pipeline = builder.build(StreamDataLoader(IterableDataset([block])))
+
+    assert pipeline.plan.report.merged == ()
+    (out,) = pipeline.run()
+    np.testing.assert_allclose(out["x10"].values, block.values * 10.0)
+
+
+@pytest.mark.parametrize("batch_blocks", [1, 4])
+def test_run_changed_only_and_view(batch_blocks: int) -> None:
+    def build():
+        return _builder(["decision"]).build(
+            StreamDataLoader(MultiSensorDataset(_sensor_blocks())),
+            batch_blocks=batch_blocks,
+        )
+
+    expected = [dict(out) for out in build().run() if out]
+    changed = list(build().run(changed_only=True))
+    views = []
+    for out in build().run(changed_only=True, view=True):
+        assert isinstance(out, ResultsView)
+        assert "decision" in out and "sensor_a_window" not in out
+        with pytest.raises(TypeError):
+            out["decision"] = out["decision"]  # type: ignore[index]
+        views.append(out)
+        snapshot = dict(out)
+        assert snapshot.keys() == expected[len(views) - 1].keys()
+
+    assert 0 < len(changed) == len(expected) == len(views)
+    assert len({id(view) for view in views}) == 1
+    for left, right in zip(changed, expected):
+        np.testing.assert_array_equal(left["decision"].values, right["decision"].values)
+
+
+def _reuse_builder() -> PipelineBuilder:
+    builder = PipelineBuilder(input_key="raw", output_keys=["smooth", "spec", "decision"])
+    builder.add_node(NormalizerNode("raw", "norm"))
+    builder.add_node(MovingAverageNode("norm", "smooth", window=4, streaming=True))
+    builder.add_node(SpectrogramNode("smooth", "spec", frame_length=16, hop=8))
+    builder.add_node(DecisionNode(["smooth", "spec"]))
+    return builder
+
+
+def test_view_run_reuses_output_buffers() -> None:
+    blocks = _sensor_blocks()["sensor_a"]
+    kept = list(_reuse_builder().build(StreamDataLoader(IterableDataset(blocks))).run())
+    pipeline = _reuse_builder().build(StreamDataLoader(IterableDataset(blocks)))
+
+    addresses = []
+    for out, expected in zip(pipeline.run(view=True), kept, strict=True):
+        addresses.append({key: out[key].values.ctypes.data for key in out})
+        for key in out:
+            np.testing.assert_array_equal(out[key].values, expected[key].values)
+
+    # Block 0 has fewer spectrogram frames; from block 1 on every buffer is reused.
+    assert all(address == addresses[1] for address in addresses[2:])
+    for previous, current in zip(kept, kept[1:]):
+        for key in ("smooth", "spec", "decision"):
+            assert not np.shares_memory(previous[key].values, current[key].values)
+
+
+class _DeltaNode(ProcessingNode):
+    """Emits ``smooth`` minus the previous block's ``smooth``, kept as is."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._previous: BaseTimeSeries | None = None
+
+    def requires(self) -> Iterable[str]:
+        return ["smooth"]
+
+    def produces(self) -> Iterable[str]:
+        return ["delta"]
+
+    def reset(self) -> None:
+        self._previous = None
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        block, previous = inputs["smooth"], self._previous
+        self._previous = block
+        if previous is None:
+            return {}
+        return {"delta": block.copy_with(values=block.values - previous.values)}
+
+
+@pytest.mark.parametrize("batch_blocks", [1, 4])
+def test_nodes_may_keep_earlier_blocks_by_default(batch_blocks: int) -> None:
+    blocks = _sensor_blocks()["sensor_a"]
+    builder = PipelineBuilder(input_key="raw", output_keys=["delta"])
+    builder.add_node(MovingAverageNode("raw", "smooth", window=2))
+    builder.add_node(_DeltaNode())
+    pipeline = builder.build(StreamDataLoader(IterableDataset(blocks)), batch_blocks=batch_blocks)
+
+    smoothing = PipelineBuilder(input_key="raw", output_keys=["smooth"])
+    smoothing.add_node(MovingAverageNode("raw", "smooth", window=2))
+    smooth = [
+        out["smooth"].values.copy()
+        for out in smoothing.build(StreamDataLoader(IterableDataset(blocks))).run()
+    ]
+
+    deltas = [out["delta"].values for out in pipeline.run(changed_only=True)]
+    assert len(deltas) == len(blocks) - 1
+    for delta, previous, current in zip(deltas, smooth[:-1], smooth[1:], strict=True):
+        np.testing.assert_array_equal(delta, current - previous)
+
+
+@pytest.mark.parametrize("batch_blocks", [1, 4])
+def test_builder_dtype_policy_applies_to_every_node(batch_blocks: int) -> None:
+    builder = _builder(dtype=np.float32)
+    builder.add_node(NormalizerNode("sensor_a_raw", "sensor_a_wide", dtype=np.float64))
+    pipeline = builder.build(
+        StreamDataLoader(MultiSensorDataset(_sensor_blocks())),
+        batch_blocks=batch_blocks,
+    )
+
+    seen = set()
+    for outputs in pipeline.run():
+        for key, block in outputs.items():
+            if key == "multi":
+                continue
+            expected = np.float64 if key == "sensor_a_wide" else np.float32
+            assert block.values.dtype == expected, key
+            seen.add(key)
+    assert {"decision", "sensor_a_wide", "sensor_b_window"} <= seen
+
+
+def test_builder_dtype_policy_leaves_caller_nodes_unchanged() -> None:
+    sensors = _sensor_blocks(num_blocks=3)
+    nodes = _builder()._nodes
+    dtypes = []
+    for policy in (np.float32, np.float64):
+        builder = PipelineBuilder(input_key="multi", output_keys=["decision"], dtype=policy)
+        for node in nodes:
+            builder.add_node(node)
+        outputs = list(builder.build(StreamDataLoader(MultiSensorDataset(sensors))).run())
+        dtypes.append(outputs[-1]["decision"].values.dtype)
+
+    assert dtypes == [np.float32, np.float64]
+    assert all(node.dtype is None for node in nodes)
+
+
+class _UndeclaredOutputNode(_FailingNode):
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        return {"boom": inputs["input"], "surprise": inputs["input"]}
+
+
+@pytest.mark.parametrize("batch_blocks", [1, 2])
+def test_undeclared_output_key_warns_and_is_dropped(batch_blocks: int) -> None:
+    blocks = _sensor_blocks(num_blocks=2)["sensor_a"]
+    builder = PipelineBuilder().add_node(_UndeclaredOutputNode(name="sloppy"))
+    pipeline = builder.build(StreamDataLoader(IterableDataset(blocks)), batch_blocks=batch_blocks)
+
+    with pytest.warns(RuntimeWarning, match="'sloppy' produced undeclared key 'surprise'"):
+        outputs = list(pipeline.run())
+
+    assert [sorted(out) for out in outputs] == [["boom", "input"], ["boom", "input"]]
+
+
+def test_undeclared_output_key_fails_strict_pipelines() -> None:
+    block = _sensor_blocks(num_blocks=1)["sensor_a"][0]
+    builder = PipelineBuilder(strict_outputs=True).add_node(_UndeclaredOutputNode(name="sloppy"))
+    pipeline = builder.build(StreamDataLoader(IterableDataset([block])))
+
+    with pytest.raises(PipelineExecutionError, match="undeclared key 'surprise'"):
+        list(pipeline.run())
+
+
+def _batch_builder() -> PipelineBuilder:
+    builder = PipelineBuilder(input_key="multi", output_keys=["sensor_a_ma", "decision"])
+    builder.add_node(SplitSensorNode("multi", SENSORS))
+    builder.add_node(NormalizerNode("sensor_a_raw", "sensor_a_norm"))
+    builder.add_node(MovingAverageNode("sensor_a_norm", "sensor_a_ma", window=4))
+    builder.add_node(
+        SlidingWindowNode("sensor_a_ma", "sensor_a_window", window_seconds=3.0, hop_seconds=1.0)
+    )
+    builder.add_node(DecisionNode(["sensor_a_window", "sensor_a_ma"]))
+    return builder
+
+
+def test_batched_run_matches_serial() -> None:
+    sensors = _sensor_blocks(num_blocks=11)
+    serial = _batch_builder().build(StreamDataLoader(MultiSensorDataset(sensors)))
+    batched = _batch_builder().build(
+        StreamDataLoader(MultiSensorDataset(sensors)),
+        batch_blocks=4,
+    )
+
+    serial_results = list(serial.run())
+    batched_results = [
+        {key: (block.values.copy(), block.metadata) for key, block in outputs.items()}
+        for outputs in batched.run()
+    ]
+
+    assert len(batched_results) == len(serial_results) == 11
+    for expected, actual in zip(serial_results, batched_results):
+        assert list(expected) == list(actual)
+        for key, block in expected.items():
+            values, metadata = actual[key]
+            np.testing.assert_allclose(values, block.values)
+            assert metadata == pytest.approx(block.metadata)
+
+
+def test_split_sensor_node_views_packed_columns() -> None:
+    sensors = _sensor_blocks(num_blocks=2)
+    block = next(iter(MultiSensorDataset(sensors, packed=True)))
+
+    outputs = SplitSensorNode("multi", SENSORS).process({"multi": block})
+
+    for sensor in SENSORS:
+        split = outputs[f"{sensor}_raw"]
+        assert np.shares_memory(split.values, block.values)
+        np.testing.assert_array_equal(split.values, sensors[sensor][0].values)
+        assert split.metadata == {"sensor": sensor}
+
+
+@pytest.mark.parametrize("batch_blocks", [1, 4])
+def test_packed_nodes_match_per_sensor_nodes(batch_blocks: int) -> None:
+    sensors = _sensor_blocks(num_blocks=11)
+    quiet = [block.copy_with(values=np.zeros((32, 2))) for block in sensors["sensor_c"]]
+    sensors["sensor_c"] = quiet
+    per_sensor = PipelineBuilder(input_key="multi", output_keys=[f"{s}_ma" for s in SENSORS])
+    per_sensor.add_node(SplitSensorNode("multi", SENSORS))
+    for sensor in SENSORS:
+        per_sensor.add_node(NormalizerNode(f"{sensor}_raw", f"{sensor}_norm"))
+        per_sensor.add_node(MovingAverageNode(f"{sensor}_norm", f"{sensor}_ma", window=4))
+    packed = PipelineBuilder(input_key="multi", output_keys=["ma"])
+    packed.add_node(NormalizerNode("multi", "norm"))
+    packed.add_node(MovingAverageNode("norm", "ma", window=4))
+
+    expected = list(per_sensor.build(StreamDataLoader(MultiSensorDataset(sensors))).run())
+    actual = list(
+        packed.build(
+            StreamDataLoader(MultiSensorDataset(sensors, packed=True)), batch_blocks=batch_blocks
+        ).run()
+    )
+
+    assert len(actual) == len(expected) == 11
+    for outputs, block in zip(expected, actual):
+        index = block["ma"].metadata["channels"]
+        scales = block["ma"].metadata["scale"]
+        for position, sensor in enumerate(SENSORS):
+            reference = outputs[f"{sensor}_ma"]
+            columns = block["ma"].values[:, index.columns(sensor)]
+            np.testing.assert_allclose(columns, reference.values)
+            assert scales[position] == pytest.approx(reference.metadata.get("scale", 1.0))
@@ -0,0 +1,77 @@
+"""Pytest suite for the chunked recording writer and reader."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from online_dev_environment.base import BaseTimeSeries, RecordingReader, RecordingWriter
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _blocks(count: int) -> list[BaseTimeSeries]:
+    return [
+        BaseTimeSeries(
+            values=np.full((16, 2), index, dtype=np.float32),
+            sample_rate=16.0,
+            timestamp=START + timedelta(seconds=index),
+            metadata={"sensor": "accelerometer", "block_index": index},
+        )
+        for index in range(count)
+    ]
+
+
+def test_round_trip_and_seek(tmp_path: Path) -> None:
+    path = tmp_path / "stream.rec"
+    with RecordingWriter(path, chunk_bytes=256) as writer:
+        for block in _blocks(10):
+            writer.append(block)
+
+    reader = RecordingReader(path)
+    replayed = list(reader)
+
+    assert len(reader) == 10
+    for original, block in zip(_blocks(10), replayed):
+        np.testing.assert_array_equal(block.values, original.values)
+        assert block.values.dtype == np.float32
+        assert not block.values.flags.writeable
+        assert block.timestamp == original.timestamp
+        assert block.metadata == original.metadata
+
+    assert reader.seek(START + timedelta(seconds=6.5)) == 6
+    assert [b.metadata["block_index"] for b in reader] == [6, 7, 8, 9]
+    assert reader.seek(START - timedelta(seconds=5)) == 0
+
+
+def test_unclosed_recording_recovers_flushed_chunks(tmp_path: Path) -> None:
+    path = tmp_path / "crashed.rec"
+    writer = RecordingWriter(path, chunk_bytes=1 << 30)
+    for block in _blocks(4):
+        writer.append(block)
+    writer.flush()
+    writer.append(_blocks(5)[4])
+    writer._file.write(writer._pending[:100])  # simulate a torn final chunk
+    writer._file.close()
+
+    reader = RecordingReader(path)
+
+    assert [b.metadata["block_index"] for b in reader] == [0, 1, 2, 3]
+
+
+def test_recording_cut_before_the_first_chunk_is_empty(tmp_path: Path) -> None:
+    path = tmp_path / "opened.rec"
+    writer = RecordingWriter(path, chunk_bytes=1 << 30)
+    writer.append(_blocks(1)[0])
+
+    # The file magic is on disk as soon as the writer exists.
+    assert path.read_bytes() == b"ODEREC01"
+    assert len(RecordingReader(path)) == 0
+    writer._file.close()
+
+    for head in (b"", b"ODER"):
+        torn = tmp_path / f"torn{len(head)}.rec"
+        torn.write_bytes(head)
+        assert list(RecordingReader(torn)) == []
@@ -0,0 +1,49 @@
+"""Pytest suite for the RingBuffer sample store."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from online_dev_environment.base.data import RingBuffer
+
+
+def test_write_peek_consume_round_trip() -> None:
+    ring = RingBuffer(8)
+    ring.write(np.arange(6.0)[:, None])
+    ring.consume(4)
+    ring.write(np.arange(6.0, 12.0)[:, None])
+
+    assert len(ring) == 8
+    np.testing.assert_array_equal(ring.peek()[:, 0], np.arange(4.0, 12.0))
+
+
+def test_peek_views_survive_later_writes() -> None:
+    ring = RingBuffer(4)
+    views = []
+    for start in range(0, 40, 2):
+        ring.write(np.arange(start, start + 2.0))
+        if len(ring) >= 4:
+            views.append((start - 2, ring.peek(4)))
+            ring.consume(2)
+
+    for first, window in views:
+        np.testing.assert_array_equal(window, np.arange(first, first + 4.0))
+        assert not window.flags.writeable
+        assert not window.flags.owndata
+
+
+def test_grows_when_capacity_exceeded() -> None:
+    ring = RingBuffer(2)
+    ring.write(np.arange(5.0))
+
+    assert ring.capacity >= 5
+    np.testing.assert_array_equal(ring.peek(), np.arange(5.0))
+
+
+def test_sample_shape_change_raises() -> None:
+    ring = RingBuffer(4)
+    ring.write(np.zeros((2, 2)))
+
+    with pytest.raises(ValueError):
+        ring.write(np.zeros((2, 3)))
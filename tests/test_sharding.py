@@ -0,0 +1,119 @@
+"""Pytest suite for the multi-process ShardedPipeline."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pytest
+
+from online_dev_environment.base import (
+    BaseTimeSeries,
+    DecisionNode,
+    MultiSensorDataset,
+    NormalizerNode,
+    PipelineBuilder,
+    PipelineExecutionError,
+    ShardedPipeline,
+    SlidingWindowNode,
+    SplitSensorNode,
+    StreamDataLoader,
+)
+from online_dev_environment.base.nodes import ProcessingNode
+
+SENSORS = [f"s{index}" for index in range(5)]
+
+
+def _sensor_blocks(num_blocks: int = 10, block_size: int = 16) -> dict[str, list[BaseTimeSeries]]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rng = np.random.default_rng(3)
+    return {
+        sensor: [
+            BaseTimeSeries(
+                values=rng.standard_normal((block_size, 2)),
+                sample_rate=16.0,
+                timestamp=start + timedelta(seconds=index),
+                metadata={"sensor": sensor},
+            )
+            for index in range(num_blocks)
+        ]
+        for sensor in SENSORS
+    }
+
+
+def _shard(sensors: List[str]) -> Sequence[ProcessingNode]:
+    nodes: List[ProcessingNode] = [SplitSensorNode("multi", sensors)]
+    for sensor in sensors:
+        nodes.append(NormalizerNode(f"{sensor}_raw", f"{sensor}_norm"))
+        nodes.append(
+            SlidingWindowNode(f"{sensor}_norm", f"{sensor}_window", window_seconds=2.0, hop_seconds=1.0)
+        )
+    return nodes
+
+
+class _ExplodingNode(ProcessingNode):
+    def __init__(self, key_in: str) -> None:
+        super().__init__(name="exploding")
+        self._key_in = key_in
+
+    def requires(self) -> Iterable[str]:
+        return [self._key_in]
+
+    def produces(self) -> Iterable[str]:
+        return ["boom"]
+
+    def process(self, inputs: Dict[str, BaseTimeSeries]) -> Dict[str, BaseTimeSeries]:
+        raise ValueError("boom")
+
+
+def _exploding_shard(sensors: List[str]) -> Sequence[ProcessingNode]:
+    return [SplitSensorNode("multi", sensors), _ExplodingNode(f"{sensors[0]}_raw")]
+
+
+def _decision() -> DecisionNode:
+    return DecisionNode([f"{sensor}_window" for sensor in SENSORS])
+
+
+@pytest.mark.parametrize(("slot_bytes", "packed"), [(None, False), (64, False), (None, True)])
+def test_sharded_run_matches_single_process(slot_bytes: int | None, packed: bool) -> None:
+    builder = PipelineBuilder(input_key="multi", output_keys=["s0_window", "decision"])
+    for node in [*_shard(SENSORS), _decision()]:
+        builder.add_node(node)
+    expected = list(builder.build(StreamDataLoader(MultiSensorDataset(_sensor_blocks()))).run())
+
+    sharded = ShardedPipeline(
+        StreamDataLoader(MultiSensorDataset(_sensor_blocks(), packed=packed)),
+        sensors=SENSORS,
+        shard_nodes=_shard,
+        fan_in=[_decision()],
+        input_key="multi",
+        output_keys=["s0_window", "decision"],
+        num_workers=2,
+        slots=2,
+        slot_bytes=slot_bytes,
+    )
+    actual = list(sharded.run())
+
+    assert len(actual) == len(expected) == 10
+    for left, right in zip(actual, expected):
+        assert left.keys() == right.keys()
+        for key in left:
+            np.testing.assert_allclose(left[key].values, right[key].values)
+            assert left[key].timestamp == right[key].timestamp
+
+
+def test_sharded_worker_errors_are_reported() -> None:
+    sharded = ShardedPipeline(
+        StreamDataLoader(MultiSensorDataset(_sensor_blocks(num_blocks=3))),
+        sensors=SENSORS,
+        shard_nodes=_exploding_shard,
+        input_key="multi",
+        output_keys=["boom"],
+        num_workers=2,
+    )
+
+    with pytest.raises(PipelineExecutionError) as excinfo:
+        list(sharded.run())
+    assert excinfo.value.node_name == "exploding"
+    assert excinfo.value.block_index == 0